@@ -1,17 +1,198 @@
 # backend/analytics/api/analytics_routes.py
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
+import asyncio
+import os
+import threading
+import networkx as nx
+import pandas as pd
 from ..components.route_optimizer import RouteOptimizer
+from ..components.connection_scanner import ConnectionScanner
 from ..components.map_visualizer import MapVisualizer
 from ..components.ml_models import MLModels
+from ..components.model_registry import DEFAULT_REGISTRY_PATH, ModelRegistry
+from ..components.dashboard_aggregates import DashboardAggregateStore
 from ..components.dashboard_generator import DashboardGenerator
+from ..components.anomaly_stream import StreamingAnomalyDetector
+from ..utils.airport_index import get_airport_index
+from ..utils.json_encoding import JSON_MEDIA_TYPE, dumps
+from ..utils.spatial_index import get_spatial_index
+from .response_cache import ResponseCache
+from .executors import AnalyticsExecutor, call_worker_method
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 ml_models = MLModels()
+model_registry = ModelRegistry(os.environ.get('MODEL_REGISTRY_PATH', DEFAULT_REGISTRY_PATH))
+active_model_manifest: Optional[Dict] = None
 dashboard_generator = DashboardGenerator()
-route_optimizer = RouteOptimizer()
+anomaly_detector = StreamingAnomalyDetector(
+    method=os.environ.get('ANOMALY_METHOD', 'robust_zscore'),
+    refresh_interval=float(os.environ.get('ANOMALY_REFRESH_SECONDS', 3600))
+)
+route_optimizer = RouteOptimizer(engine='csr', cache_hubs=256)
+connection_scanner = ConnectionScanner()
+response_cache = ResponseCache()
+executor = AnalyticsExecutor(
+    thread_workers=4,
+    process_workers=2,
+    max_pending=64,
+    default_timeout=30,
+    endpoint_limits={
+        'route-optimization': 8,
+        'route-alternatives': 4,
+        'route-pareto': 4,
+        'connections': 8,
+        'schedule': 1,
+        'predictions': 4,
+        'dashboard': 8,
+        'anomalies': 8
+    }
+)
+
+# Response cache TTLs (seconds) and invalidation tags
+DASHBOARD_TTL = 30
+PREDICTION_TTL = 300
+ROUTE_TTL = 300
+
+# Anomaly feed polling and keep-alive intervals (seconds)
+ANOMALY_POLL_INTERVAL = 0.5
+ANOMALY_KEEPALIVE_INTERVAL = 15
+
+def load_route_network(routes_data: pd.DataFrame, airports_data: pd.DataFrame):
+    """
+    (Re)build the route network served by the route endpoints
+
+    Cached route responses are invalidated and the new optimizer is
+    installed in the process-pool workers used for graph searches.
+    """
+    route_optimizer.build_route_network(routes_data, airports_data)
+    response_cache.invalidate('routes')
+    executor.set_process_state('route_optimizer', route_optimizer)
+
+def load_flight_schedule(flights_data: pd.DataFrame) -> Dict:
+    """
+    (Re)load the flight schedule behind the route and connection endpoints
+
+    Flights are the backend's Flight records (flightNumber, from, to,
+    departureTime, arrivalTime and price columns). They become the
+    timetable of /connections/earliest-arrival and, one route per airport
+    pair priced at its cheapest flight, the route network. Airports
+    missing from the airport index are left out of the route network.
+    """
+    global connection_scanner
+    scanner = ConnectionScanner()
+    scanner.build_timetable(flights_data)
+
+    routes_data = (
+        flights_data.groupby(['from', 'to'], observed=True, sort=False)['price'].min()
+        .reset_index()
+        .rename(columns={'from': 'origin', 'to': 'destination', 'price': 'base_cost'})
+    )
+    index = get_airport_index()
+    codes = pd.unique(pd.concat([routes_data['origin'], routes_data['destination']]))
+    codes = [code for code in codes.tolist() if code in index]
+    routes_data = routes_data[routes_data['origin'].isin(codes) & routes_data['destination'].isin(codes)]
+    airports_data = pd.DataFrame({
+        'code': codes,
+        'coordinates': [index.get_coordinates(code) for code in codes]
+    })
+
+    load_route_network(routes_data, airports_data)
+    connection_scanner = scanner
+    return {"flights": len(scanner.flight_numbers), "airports": len(codes), "routes": len(routes_data)}
+
+def load_model_version(version: Optional[str] = None) -> Optional[Dict]:
+    """
+    Serve a registry version (MODEL_VERSION or LATEST by default)
+
+    Only the feature pipelines are read here; models load on first use.
+    Cached prediction responses are invalidated.
+    """
+    global active_model_manifest
+    active_model_manifest = model_registry.load(
+        ml_models, version or os.environ.get('MODEL_VERSION'), lazy=True
+    )
+    response_cache.invalidate('predictions')
+    return active_model_manifest
+
+@router.on_event("startup")
+async def load_flight_schedule_on_startup():
+    """
+    Load the flight schedule from FLIGHT_SCHEDULE_PATH, if set
+
+    The file is a CSV export of Flight records. Without it, the route and
+    connection endpoints answer 404 until a schedule is posted to
+    /schedule.
+    """
+    path = os.environ.get('FLIGHT_SCHEDULE_PATH')
+    if path:
+        await asyncio.to_thread(lambda: load_flight_schedule(pd.read_csv(path)))
+
+def load_booking_history(path: str) -> int:
+    """
+    Seed the dashboard aggregates from a booking history CSV
+
+    The aggregates are built in a new store and swapped in whole, so the
+    dashboards never show a partly loaded history. Returns the number of
+    bookings loaded.
+    """
+    store = DashboardAggregateStore.from_csv(path)
+    dashboard_generator.aggregates = store
+    response_cache.invalidate('dashboard')
+    return store.bookings
+
+@router.on_event("startup")
+async def load_booking_history_on_startup():
+    """
+    Load the booking history from BOOKING_HISTORY_PATH, if set
+
+    The dashboard aggregates are otherwise only fed by
+    /dashboard/bookings, so after a restart (and in every worker process)
+    the dashboards would start empty.
+    """
+    path = os.environ.get('BOOKING_HISTORY_PATH')
+    if path:
+        await asyncio.to_thread(load_booking_history, path)
+
+@router.on_event("startup")
+async def load_models_on_startup():
+    """
+    Attach the registry's models without blocking startup
+
+    Models listed in MODEL_WARMUP (comma separated, e.g.
+    passenger_predictor,revenue_predictor) are loaded in a background
+    thread once the server is accepting requests.
+    """
+    if load_model_version() is None:
+        return
+    warm_up = [name.strip() for name in os.environ.get('MODEL_WARMUP', '').split(',') if name.strip()]
+    if warm_up:
+        threading.Thread(target=ml_models.warm_up, args=(warm_up,), name='model-warm-up', daemon=True).start()
+
+@router.on_event("startup")
+async def start_anomaly_detector():
+    """
+    Start the background model refreshes of the streaming anomaly detector
+
+    With ANOMALY_METHOD=isolation_forest the served anomaly model scores
+    bookings until the first refresh replaces it.
+    """
+    if anomaly_detector.method == 'isolation_forest' and anomaly_detector.model is None and active_model_manifest:
+        anomaly_detector.model = await executor.run_in_thread('models', ml_models.get_model, 'anomaly_detector')
+    anomaly_detector.start()
+
+@router.on_event("shutdown")
+async def stop_anomaly_detector():
+    anomaly_detector.stop()
+
+async def _route_search(endpoint: str, method: str, *args):
+    """Run a route_optimizer search in the process pool when workers hold the network"""
+    if executor.has_process_state('route_optimizer'):
+        return await executor.run_in_process(endpoint, call_worker_method, 'route_optimizer', method, *args)
+    return await executor.run_in_thread(endpoint, getattr(route_optimizer, method), *args)
 
 @router.get("/route-optimization/{origin}/{destination}")
 async def get_optimal_route(
@@ -20,62 +201,294 @@ async def get_optimal_route(
     criteria: Optional[str] = "distance"
 ):
     """Get optimal route between two airports"""
-    route = route_optimizer.find_optimal_route(origin, destination, criteria)
+    try:
+        route = await executor.run_in_thread(
+            'route-optimization', route_optimizer.find_optimal_route, origin, destination, criteria
+        )
+    except nx.NodeNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not route:
         raise HTTPException(status_code=404, detail="No route found")
     return route
 
+@router.get("/route-pareto/{origin}/{destination}")
+async def get_pareto_routes(
+    request: Request,
+    origin: str,
+    destination: str,
+    max_stops: int = 2,
+    max_cost: Optional[float] = None
+):
+    """Get all Pareto-optimal routes over distance, cost and stops"""
+    async def compute():
+        try:
+            routes = await _route_search(
+                'route-pareto', 'find_pareto_routes', origin, destination, max_stops, max_cost
+            )
+        except nx.NodeNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not routes:
+            raise HTTPException(status_code=404, detail="No route found")
+        return routes
+
+    return await response_cache.respond(request, compute, ROUTE_TTL, ('routes',))
+
+@router.get("/connections/earliest-arrival/{origin}/{destination}")
+async def get_earliest_arrival(
+    origin: str,
+    destination: str,
+    departure_after: Optional[datetime] = None,
+    min_connection_minutes: Optional[int] = None
+):
+    """Get the scheduled journey arriving earliest at the destination"""
+    journey = await executor.run_in_thread(
+        'connections',
+        connection_scanner.earliest_arrival,
+        origin,
+        destination,
+        departure_after or datetime.utcnow(),
+        min_connection_minutes
+    )
+    if not journey:
+        raise HTTPException(status_code=404, detail="No connection found")
+    return journey
+
+@router.post("/schedule")
+async def replace_flight_schedule(flights: List[Dict]):
+    """Replace the flight schedule served by the route and connection endpoints"""
+    try:
+        return await executor.run_in_thread('schedule', load_flight_schedule, pd.DataFrame(flights))
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Flights are missing column {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/airports/nearby")
+async def get_nearby_airports(
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    city: Optional[str] = None,
+    k: int = 5,
+    radius_km: Optional[float] = None
+):
+    """Get airports near a coordinate or a city"""
+    spatial_index = get_spatial_index()
+    if city:
+        return spatial_index.near_city(city, radius_km or 100)[:k]
+    if lat is None or lon is None:
+        raise HTTPException(status_code=400, detail="Provide lat and lon, or city")
+    if radius_km is not None:
+        return spatial_index.within_radius(lat, lon, radius_km)[:k]
+    return spatial_index.nearest(lat, lon, k)
+
+@router.get("/airports/{code}/alternates")
+async def get_alternate_airports(code: str, radius_km: float = 150, k: int = 5):
+    """Get alternate airports near an airport"""
+    return get_spatial_index().alternate_airports(code, radius_km, k)
+
+@router.get("/route-optimization/cache-stats")
+async def get_route_cache_stats():
+    """Get memory and hit-rate statistics of the route cache"""
+    return route_optimizer.route_cache_stats()
+
 @router.get("/route-alternatives/{origin}/{destination}")
 async def get_alternative_routes(
+    request: Request,
     origin: str, 
     destination: str, 
-    max_routes: int = 3
+    max_routes: int = 3,
+    criteria: Optional[str] = "distance",
+    max_stops: Optional[int] = None,
+    max_detour: Optional[float] = None
 ):
     """Get alternative routes between airports"""
-    routes = route_optimizer.find_alternative_routes(origin, destination, max_routes)
-    return routes
+    async def compute():
+        try:
+            return await _route_search(
+                'route-alternatives', 'find_alternative_routes',
+                origin, destination, max_routes, criteria, max_stops, max_detour
+            )
+        except nx.NodeNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await response_cache.respond(request, compute, ROUTE_TTL, ('routes',))
 
 @router.get("/predictions/passengers")
-async def predict_passengers(days_ahead: int = 30):
+async def predict_passengers(request: Request, days_ahead: int = Query(30, ge=1, le=366)):
     """Get passenger predictions"""
-    predictions = ml_models.predict_passengers(days_ahead)
-    return {
-        "predictions": predictions.tolist(),
-        "dates": [(datetime.now() + timedelta(days=i)).isoformat() 
-                 for i in range(days_ahead)]
-    }
+    async def compute():
+        return await _forecast('passenger_predictor', days_ahead)
+
+    return await response_cache.respond(request, compute, PREDICTION_TTL, ('predictions',))
 
 @router.get("/predictions/revenue")
-async def predict_revenue(days_ahead: int = 30):
+async def predict_revenue(request: Request, days_ahead: int = Query(30, ge=1, le=366)):
     """Get revenue predictions"""
-    predictions = ml_models.predict_revenue(days_ahead)
+    async def compute():
+        return await _forecast('revenue_predictor', days_ahead)
+
+    return await response_cache.respond(request, compute, PREDICTION_TTL, ('predictions',))
+
+async def _forecast(name: str, days_ahead: int) -> Dict:
+    """Forecast payload of the passenger or revenue model for the next days"""
+    try:
+        dates, predictions = await executor.run_in_thread('predictions', ml_models.forecast, name, days_ahead)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     return {
         "predictions": predictions.tolist(),
-        "dates": [(datetime.now() + timedelta(days=i)).isoformat() 
-                 for i in range(days_ahead)]
+        "dates": [date.isoformat() for date in dates]
     }
 
+async def _chart_response(request: Request, generate, output: str) -> Response:
+    """Serve a dashboard chart payload through the response cache"""
+    async def compute():
+        try:
+            return await executor.run_in_thread('dashboard', generate, output=output)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return await response_cache.respond(request, compute, DASHBOARD_TTL, ('dashboard',))
+
+@router.post("/dashboard/bookings")
+async def append_dashboard_bookings(bookings: List[Dict]):
+    """
+    Merge new bookings into the materialized dashboard aggregates
+
+    Bookings carrying the anomaly detector's columns are also scored and
+    anomalies are published on /anomalies/stream.
+    """
+    frame = pd.DataFrame(bookings)
+    version = dashboard_generator.append_bookings(frame)
+    response_cache.invalidate('dashboard')
+    anomalies = None
+    if len(frame) and not anomaly_detector.missing_columns(frame):
+        scores = await executor.run_in_thread('anomalies', anomaly_detector.observe, frame)
+        anomalies = int(scores['is_anomaly'].sum())
+    return {"bookings": len(bookings), "version": version, "anomalies": anomalies}
+
+@router.post("/anomalies/score")
+async def score_bookings(bookings: List[Dict]):
+    """Score new bookings as they arrive and publish anomalies on the feed"""
+    try:
+        scores = await executor.run_in_thread('anomalies', anomaly_detector.observe, pd.DataFrame(bookings))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Unscored bookings have a NaN score, encoded as null
+    return Response(content=dumps({
+        "scores": scores['score'].to_numpy(),
+        "is_anomaly": scores['is_anomaly'].to_numpy(),
+        "last_alert_id": anomaly_detector.last_alert_id
+    }), media_type=JSON_MEDIA_TYPE)
+
+@router.get("/anomalies")
+async def get_anomalies(after: int = 0, limit: int = 100):
+    """Get anomaly alerts newer than an alert id"""
+    return Response(content=dumps(anomaly_detector.alerts(after, limit)), media_type=JSON_MEDIA_TYPE)
+
+@router.get("/anomalies/stream")
+async def stream_anomalies(
+    request: Request,
+    after: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-sent event feed of anomaly alerts
+
+    Only new alerts are sent, unless after (or the Last-Event-ID header
+    of a reconnecting client) names the last alert already seen.
+    """
+    if after is None:
+        after = int(last_event_id) if last_event_id and last_event_id.isdigit() else anomaly_detector.last_alert_id
+
+    async def events():
+        last_id = after
+        idle = 0.0
+        while not await request.is_disconnected():
+            alerts = anomaly_detector.alerts(last_id)
+            for alert in alerts:
+                last_id = alert['id']
+                yield b'id: %d\nevent: anomaly\ndata: %s\n\n' % (last_id, dumps(alert))
+            idle = 0.0 if alerts else idle + ANOMALY_POLL_INTERVAL
+            if idle >= ANOMALY_KEEPALIVE_INTERVAL:
+                idle = 0.0
+                yield b': keep-alive\n\n'
+            await asyncio.sleep(ANOMALY_POLL_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@router.get("/anomalies/stats")
+async def get_anomaly_stats():
+    """Get counters and model refresh status of the streaming anomaly detector"""
+    return anomaly_detector.stats()
+
 @router.get("/dashboard/booking-trends")
-async def get_booking_trends():
+async def get_booking_trends(request: Request, output: str = "compact"):
     """Get booking trends visualization data"""
-    return dashboard_generator.generate_booking_trends()
+    return await _chart_response(request, dashboard_generator.generate_booking_trends, output)
 
 @router.get("/dashboard/revenue-analysis")
-async def get_revenue_analysis():
+async def get_revenue_analysis(request: Request, output: str = "compact"):
     """Get revenue analysis visualization data"""
-    return dashboard_generator.generate_revenue_analysis()
+    return await _chart_response(request, dashboard_generator.generate_revenue_analysis, output)
 
 @router.get("/dashboard/route-performance")
-async def get_route_performance():
+async def get_route_performance(request: Request, output: str = "compact"):
     """Get route performance visualization data"""
-    return dashboard_generator.generate_route_performance()
+    return await _chart_response(request, dashboard_generator.generate_route_performance, output)
 
 @router.get("/dashboard/payment-distribution")
-async def get_payment_distribution():
+async def get_payment_distribution(request: Request, output: str = "compact"):
     """Get payment method distribution data"""
-    return dashboard_generator.generate_payment_distribution()
+    return await _chart_response(request, dashboard_generator.generate_payment_distribution, output)
 
 @router.get("/dashboard/hotel-preferences")
-async def get_hotel_preferences():
+async def get_hotel_preferences(request: Request, output: str = "compact"):
     """Get hotel booking preferences data"""
-    return dashboard_generator.generate_hotel_preferences()
\ No newline at end of file
+    return await _chart_response(request, dashboard_generator.generate_hotel_preferences, output)
+
+@router.get("/cache/stats")
+async def get_response_cache_stats():
+    """Get hit-rate statistics of the response cache"""
+    return response_cache.stats()
+
+@router.post("/cache/invalidate")
+async def invalidate_response_cache(tag: Optional[List[str]] = Query(None)):
+    """Drop cached responses, e.g. after reloading data or models"""
+    return {"invalidated": response_cache.invalidate(*(tag or []))}
+
+@router.get("/executor/stats")
+async def get_executor_stats():
+    """Get pool occupancy and rejection statistics of the executor layer"""
+    return executor.stats()
+
+@router.get("/models")
+async def get_model_versions():
+    """Get published model versions and the manifest being served"""
+    return {
+        "versions": model_registry.versions(),
+        "latest": model_registry.latest_version(),
+        "active": active_model_manifest
+    }
+
+@router.post("/models/{version}/activate")
+async def activate_model_version(version: str):
+    """Serve a different published model version"""
+    if version not in model_registry.versions():
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version}")
+    try:
+        return await executor.run_in_thread('models', load_model_version, version)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,207 @@
+# backend/analytics/api/executors.py
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+# Objects installed in process-pool workers by install_worker_state
+_WORKER_STATE: Dict[str, Any] = {}
+
+def install_worker_state(name: str, value: Any):
+    """Process-pool initializer: keep value in the worker under name"""
+    _WORKER_STATE[name] = value
+
+def call_worker_method(name: str, method: str, *args, **kwargs):
+    """Call a method of an object installed in the worker process"""
+    return getattr(_WORKER_STATE[name], method)(*args, **kwargs)
+
+class ExecutorSaturated(HTTPException):
+    """Raised (as a 503) when work cannot be queued or finish in time"""
+
+    def __init__(self, detail: str, retry_after: int = 1):
+        super().__init__(status_code=503, detail=detail, headers={'Retry-After': str(retry_after)})
+
+class AnalyticsExecutor:
+    """
+    Runs CPU-bound endpoint work off the event loop.
+
+    The thread pool serves NumPy/scikit-learn/SciPy work, which releases the
+    GIL. The process pool serves pure-Python work, such as graph searches,
+    that would otherwise serialize on the GIL; long-lived objects (the route
+    optimizer) are installed in its workers once through set_process_state
+    rather than pickled per call.
+
+    Each pool has a bounded number of pending tasks and each endpoint an
+    optional concurrency limit. Work that cannot be admitted, or that does
+    not finish within its timeout, fails fast with a 503 instead of piling
+    up. A timed-out task keeps its pool slot until it actually finishes, so
+    the bounds reflect real load.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int = 4,
+        process_workers: int = 2,
+        max_pending: int = 64,
+        default_timeout: float = 30,
+        endpoint_limits: Optional[Dict[str, int]] = None
+    ):
+        """
+        Args:
+            thread_workers: Size of the thread pool
+            process_workers: Size of the process pool (0 disables it)
+            max_pending: Maximum queued plus running tasks per pool
+            default_timeout: Seconds before a request gets a 503
+            endpoint_limits: Maximum concurrent tasks per endpoint name
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self.endpoint_limits = dict(endpoint_limits or {})
+
+        self._thread_pool = ThreadPoolExecutor(thread_workers, thread_name_prefix='analytics')
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_state: Dict[str, Any] = {}
+        self._pending = {'thread': 0, 'process': 0}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def run_in_thread(
+        self,
+        endpoint: str,
+        func: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """Run func(*args, **kwargs) in the thread pool"""
+        return await self._run('thread', endpoint, functools.partial(func, *args, **kwargs), timeout)
+
+    async def run_in_process(
+        self,
+        endpoint: str,
+        func: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """Run a picklable module-level func(*args, **kwargs) in the process pool"""
+        if self.process_workers <= 0:
+            return await self.run_in_thread(endpoint, func, *args, timeout=timeout, **kwargs)
+        return await self._run('process', endpoint, functools.partial(func, *args, **kwargs), timeout)
+
+    def set_process_state(self, name: str, value: Any):
+        """
+        Install an object in every process-pool worker under name
+
+        The pool is restarted so workers pick up the new object; tasks
+        already running on the old pool finish normally.
+        """
+        with self._lock:
+            self._process_state[name] = value
+            pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def has_process_state(self, name: str) -> bool:
+        return self.process_workers > 0 and name in self._process_state
+
+    def stats(self) -> Dict:
+        """Pool sizes, pending tasks and rejection counters"""
+        return {
+            'thread_workers': self.thread_workers,
+            'process_workers': self.process_workers,
+            'pending': dict(self._pending),
+            'max_pending': self.max_pending,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out
+        }
+
+    def shutdown(self):
+        self._thread_pool.shutdown(wait=False)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+
+    async def _run(self, kind: str, endpoint: str, call: Callable, timeout: Optional[float]) -> Any:
+        timeout = self.default_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        semaphore = self._semaphore(endpoint)
+        if semaphore is not None:
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise ExecutorSaturated(f'{endpoint} is at its concurrency limit')
+
+        with self._lock:
+            if self._pending[kind] >= self.max_pending:
+                self.rejected += 1
+                admitted = False
+            else:
+                self._pending[kind] += 1
+                admitted = True
+        if not admitted:
+            if semaphore is not None:
+                semaphore.release()
+            raise ExecutorSaturated(f'Analytics {kind} pool is saturated')
+
+        try:
+            future = loop.run_in_executor(self._pool(kind), call)
+        except BaseException:
+            self._finished(kind, semaphore)
+            raise
+        future.add_done_callback(lambda _: self._finished(kind, semaphore))
+
+        try:
+            # shield: on timeout the task keeps running and keeps its slot
+            return await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            future.add_done_callback(self._discard_result)
+            raise ExecutorSaturated(f'{endpoint} timed out after {timeout:g}s')
+
+    def _finished(self, kind: str, semaphore: Optional[asyncio.Semaphore]):
+        with self._lock:
+            self._pending[kind] -= 1
+        if semaphore is not None:
+            semaphore.release()
+
+    @staticmethod
+    def _discard_result(future: asyncio.Future):
+        # Retrieve the outcome of abandoned work so errors are not logged as unhandled
+        if not future.cancelled():
+            future.exception()
+
+    def _semaphore(self, endpoint: str) -> Optional[asyncio.Semaphore]:
+        limit = self.endpoint_limits.get(endpoint)
+        if not limit:
+            return None
+        semaphore = self._semaphores.get(endpoint)
+        if semaphore is None:
+            semaphore = self._semaphores[endpoint] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def _pool(self, kind: str):
+        if kind == 'thread':
+            return self._thread_pool
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    self.process_workers,
+                    initializer=_install_all_worker_state,
+                    initargs=(dict(self._process_state),)
+                )
+            return self._process_pool
+
+def _install_all_worker_state(state: Dict[str, Any]):
+    for name, value in state.items():
+        install_worker_state(name, value)
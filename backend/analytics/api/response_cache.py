@@ -0,0 +1,198 @@
+# backend/analytics/api/response_cache.py
+
+import asyncio
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from ..utils.json_encoding import JSON_MEDIA_TYPE, dumps
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+    tags: Tuple[str, ...]
+
+class ResponseCache:
+    """
+    In-process cache of encoded JSON responses for the analytics routes.
+
+    Entries are keyed on path and query parameters and expire after a
+    per-route TTL. Every response carries a strong ETag, so clients that
+    send If-None-Match get a bodyless 304 while the entry is fresh.
+    Concurrent requests for the same key while it is being computed await
+    a single computation instead of repeating it. Entries are tagged so
+    data reloads can invalidate whole groups of routes.
+    """
+
+    def __init__(self, default_ttl: float = 30, max_entries: int = 1024):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, CachedResponse]' = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    async def respond(
+        self,
+        request: Request,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = ()
+    ) -> Response:
+        """
+        Serve a request from the cache, computing its payload on a miss
+
+        Args:
+            request: Incoming request; its path and query form the key
+            compute: Returns the JSON payload (or an awaitable of it).
+                Exceptions, such as HTTPException, propagate and are not
+                cached.
+            ttl: Seconds the response stays fresh (default_ttl if None)
+            tags: Invalidation groups of this response
+
+        Returns:
+            200 response with ETag and Cache-Control headers, or 304 when
+            If-None-Match matches the cached ETag
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+        entry = self._get(key)
+        if entry is None:
+            entry = await self._compute_once(key, compute, ttl, tuple(tags))
+        else:
+            self.hits += 1
+
+        headers = {
+            'ETag': entry.etag,
+            'Cache-Control': f'private, max-age={max(int(entry.expires_at - time.monotonic()), 0)}'
+        }
+        if self._etag_matches(request.headers.get('if-none-match'), entry.etag):
+            self.revalidations += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+    def invalidate(self, *tags: str) -> int:
+        """
+        Drop cached responses carrying any of the tags (all when no tags)
+
+        Computations already in flight finish but are not stored, so a data
+        reload is never masked by a response computed from the old data.
+        Safe to call from any thread.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            self._generation += 1
+            if not tags:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            stale = [key for key, entry in self._entries.items() if set(entry.tags) & set(tags)]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> Dict:
+        """Entry count and hit/miss/304 counters"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'inflight': len(self._inflight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def _get(self, key: Tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: Tuple, entry: CachedResponse, generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _compute_once(
+        self,
+        key: Tuple,
+        compute: Callable[[], Any],
+        ttl: float,
+        tags: Tuple[str, ...]
+    ) -> CachedResponse:
+        """
+        Single-flight computation
+
+        The first request for a key starts the computation as a detached
+        task and every request for the key, the first included, awaits it
+        through a shield. A client disconnecting cancels only its own wait:
+        the computation finishes, is cached, and still answers the others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._compute(key, compute, ttl, tags))
+            # Retrieve the outcome so an error nobody awaited is not logged
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self,
+        key: Tuple,
+        compute: Callable[[], Any],
+        ttl: float,
+        tags: Tuple[str, ...]
+    ) -> CachedResponse:
+        generation = self._generation
+        try:
+            payload = compute()
+            if inspect.isawaitable(payload):
+                payload = await payload
+            body = dumps(payload)
+            entry = CachedResponse(
+                body=body,
+                etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+                expires_at=time.monotonic() + ttl,
+                tags=tags
+            )
+        finally:
+            del self._inflight[key]
+
+        self._put(key, entry, generation)
+        return entry
+
+    @staticmethod
+    def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return etag in candidates or f'W/{etag}' in candidates
@@ -0,0 +1,85 @@
+# backend/analytics/benchmarks/alternative_routes_benchmark.py
+#
+# Compare find_alternative_routes on the networkx engine (nx.shortest_simple_paths)
+# with the bounded Yen's search of the CSR engine on a synthetic hub-and-spoke
+# network. Run from the backend directory:
+#
+#     python -m analytics.benchmarks.alternative_routes_benchmark --airports 5000
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..components.route_optimizer import RouteOptimizer
+
+
+def make_hub_and_spoke(airports: int, hubs: int, seed: int = 42):
+    """Generate airports and routes for a hub-and-spoke network"""
+    rng = np.random.default_rng(seed)
+    codes = [f"A{i:04d}" for i in range(airports)]
+    coordinates = list(zip(rng.uniform(-60, 70, airports), rng.uniform(-180, 180, airports)))
+
+    routes = []
+    # Dense hub core
+    for i in range(hubs):
+        for j in range(i + 1, hubs):
+            if rng.random() < 0.6:
+                routes.append((codes[i], codes[j]))
+    # Each spoke connects to one to three hubs, plus the odd regional hop
+    for spoke in range(hubs, airports):
+        for hub in rng.choice(hubs, size=rng.integers(1, 4), replace=False):
+            routes.append((codes[spoke], codes[hub]))
+        if rng.random() < 0.2:
+            routes.append((codes[spoke], codes[rng.integers(hubs, airports)]))
+
+    routes_data = pd.DataFrame(routes, columns=['origin', 'destination'])
+    routes_data['base_cost'] = rng.uniform(50, 1500, len(routes_data))
+    airports_data = pd.DataFrame({'code': codes, 'coordinates': coordinates})
+    return routes_data, airports_data
+
+
+def time_queries(optimizer: RouteOptimizer, pairs, **kwargs) -> float:
+    start = time.perf_counter()
+    for origin, destination in pairs:
+        optimizer.find_alternative_routes(origin, destination, **kwargs)
+    return (time.perf_counter() - start) / len(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Alternative routes benchmark')
+    parser.add_argument('--airports', type=int, default=5000)
+    parser.add_argument('--hubs', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--alternatives', type=int, default=5)
+    args = parser.parse_args()
+
+    routes_data, airports_data = make_hub_and_spoke(args.airports, args.hubs)
+    optimizers = {}
+    for engine in ('networkx', 'csr'):
+        start = time.perf_counter()
+        optimizers[engine] = RouteOptimizer(engine=engine)
+        optimizers[engine].build_route_network(routes_data, airports_data)
+        print(f"built {engine} engine in {time.perf_counter() - start:.2f}s")
+    print(f"{args.airports} airports, {len(routes_data)} routes")
+
+    rng = np.random.default_rng(7)
+    spokes = airports_data['code'].iloc[args.hubs:].to_numpy()
+    pairs = [tuple(rng.choice(spokes, 2, replace=False)) for _ in range(args.queries)]
+
+    scenarios = {
+        'unbounded': {},
+        'max_stops=3': {'max_stops': 3},
+        'max_detour=1.5': {'max_detour': 1.5},
+    }
+    print(f"{'scenario':>16} {'networkx (ms)':>14} {'csr (ms)':>10} {'speed-up':>10}")
+    for name, bounds in scenarios.items():
+        kwargs = dict(max_alternatives=args.alternatives, optimization_criterion='distance', **bounds)
+        nx_time = time_queries(optimizers['networkx'], pairs, **kwargs)
+        csr_time = time_queries(optimizers['csr'], pairs, **kwargs)
+        print(f"{name:>16} {nx_time * 1000:>14.1f} {csr_time * 1000:>10.1f} {nx_time / csr_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend/analytics/benchmarks/graph_build_benchmark.py
+#
+# Compare the legacy iterrows() graph construction with the bulk path used by
+# FlightAnalyticsSystem.load_data. Run from the backend directory:
+#
+#     python -m analytics.benchmarks.graph_build_benchmark --sizes 100000 1000000 10000000
+
+import argparse
+import time
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from ..flight_analytics import FlightAnalyticsSystem
+
+
+def make_flight_data(rows: int, airports: int = 3500, seed: int = 42) -> pd.DataFrame:
+    """Generate a synthetic flight schedule export"""
+    rng = np.random.default_rng(seed)
+    codes = np.array([f"A{i:04d}" for i in range(airports)], dtype=object)
+
+    return pd.DataFrame({
+        'origin_airport': codes[rng.integers(0, airports, rows)],
+        'destination_airport': codes[rng.integers(0, airports, rows)],
+        'distance': rng.uniform(200, 12000, rows),
+        'base_cost': rng.uniform(50, 1500, rows)
+    })
+
+
+def legacy_build(flight_data: pd.DataFrame) -> nx.Graph:
+    """Per-row construction as load_data used to do it"""
+    graph = nx.Graph()
+    for _, flight in flight_data.iterrows():
+        graph.add_edge(
+            flight['origin_airport'],
+            flight['destination_airport'],
+            weight=flight['distance'],
+            cost=flight['base_cost']
+        )
+    return graph
+
+
+def bulk_build(flight_data: pd.DataFrame) -> nx.Graph:
+    system = FlightAnalyticsSystem()
+    return system.build_route_graph(flight_data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Route graph construction benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--airports', type=int, default=3500)
+    parser.add_argument(
+        '--legacy-max-rows',
+        type=int,
+        default=None,
+        help='Skip the legacy loop above this many rows'
+    )
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'legacy (s)':>12} {'bulk (s)':>10} {'speed-up':>10} {'edges':>10}")
+    for rows in args.sizes:
+        flight_data = make_flight_data(rows, args.airports)
+
+        start = time.perf_counter()
+        graph = bulk_build(flight_data)
+        bulk_time = time.perf_counter() - start
+
+        if args.legacy_max_rows is not None and rows > args.legacy_max_rows:
+            print(f"{rows:>12} {'skipped':>12} {bulk_time:>10.2f} {'-':>10} {graph.number_of_edges():>10}")
+            continue
+
+        start = time.perf_counter()
+        legacy_graph = legacy_build(flight_data)
+        legacy_time = time.perf_counter() - start
+
+        assert legacy_graph.number_of_edges() == graph.number_of_edges()
+        print(
+            f"{rows:>12} {legacy_time:>12.2f} {bulk_time:>10.2f} "
+            f"{legacy_time / bulk_time:>9.1f}x {graph.number_of_edges():>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# backend/analytics/components/anomaly_stream.py
+
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dashboard_aggregates import BOOKING_METRICS
+from .ml_models import ANOMALY_FEATURES, fit_model
+
+ANOMALY_METHODS = ('robust_zscore', 'isolation_forest')
+# Scales the median absolute deviation to a standard deviation
+MAD_SCALE = 0.6745
+
+class RouteWindow:
+    """Ring buffer of the most recent feature rows of one route"""
+
+    def __init__(self, size: int, n_features: int):
+        self.rows = np.empty((size, n_features), dtype=np.float64)
+        self.count = 0
+        self.position = 0
+
+    def values(self) -> np.ndarray:
+        return self.rows[:self.count]
+
+    def push(self, row: np.ndarray):
+        self.rows[self.position] = row
+        self.position = (self.position + 1) % len(self.rows)
+        self.count = min(self.count + 1, len(self.rows))
+
+class StreamingAnomalyDetector:
+    """
+    Scores bookings one batch at a time as they arrive.
+
+    robust_zscore compares each booking with the last `window` bookings of
+    its route: a booking is anomalous when any feature lies more than
+    `threshold` robust standard deviations (median absolute deviation)
+    from the route median. Routes with fewer than `min_history` bookings
+    are not scored yet. A booking with a null feature is scored on its
+    other features but kept out of the route window, so one missing value
+    cannot turn a feature's median into NaN for the whole window.
+
+    isolation_forest scores bookings with a pre-fitted IsolationForest.
+    The model is refitted on the most recent `history_size` bookings by
+    refresh(), which start() runs every `refresh_interval` seconds in a
+    background thread; scoring keeps using the previous model meanwhile.
+    Bookings with a null feature are neither scored nor kept for refits.
+
+    Anomalies are kept as alerts with increasing ids so that feeds can
+    poll for the alerts after the last one they have seen.
+    """
+
+    def __init__(
+        self,
+        method: str = 'robust_zscore',
+        features: Optional[List[str]] = None,
+        model=None,
+        window: int = 200,
+        threshold: float = 3.5,
+        min_history: int = 20,
+        history_size: int = 10000,
+        refresh_interval: float = 3600,
+        max_alerts: int = 1000
+    ):
+        """
+        Args:
+            method: 'robust_zscore' or 'isolation_forest'
+            features: Numeric booking columns to score (default
+                passenger_count and total_revenue for robust_zscore, the
+                anomaly detector's features for isolation_forest)
+            model: Pre-fitted IsolationForest over features
+            window: Bookings per route kept for the robust z-score
+            threshold: Robust z-score above which a booking is anomalous
+            min_history: Bookings a route (or the model history) needs
+                before it is scored (or refitted)
+            history_size: Recent bookings kept to refit the model
+            refresh_interval: Seconds between background refits
+            max_alerts: Alerts kept for the feed
+        """
+        if method not in ANOMALY_METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {ANOMALY_METHODS}")
+        self.method = method
+        if features is None:
+            features = BOOKING_METRICS if method == 'robust_zscore' else ANOMALY_FEATURES
+        self.features = list(features)
+        self.model = model
+        self.window = window
+        self.threshold = threshold
+        self.min_history = min_history
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._windows: Dict[Tuple[str, str], RouteWindow] = {}
+        self._history = deque(maxlen=history_size)
+        self._alerts = deque(maxlen=max_alerts)
+        self._last_alert_id = 0
+        self._scored = 0
+        self._refreshes = 0
+        self._last_refresh: Optional[str] = None
+        self._last_refresh_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def observe(self, bookings: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score new bookings, add them to the history and raise alerts
+
+        Args:
+            bookings: New booking rows with the feature columns (plus origin
+                and destination for robust_zscore)
+
+        Returns:
+            score (NaN when not scored yet) and is_anomaly per booking,
+            indexed like bookings
+        """
+        missing = self.missing_columns(bookings)
+        if missing:
+            raise ValueError(f"Bookings are missing columns {missing}")
+
+        X = bookings[self.features].to_numpy(dtype=np.float64)
+        complete = ~np.isnan(X).any(axis=1)
+        with self._lock:
+            if self.method == 'robust_zscore':
+                scores = self._score_zscore(bookings, X)
+                is_anomaly = scores > self.threshold
+            else:
+                scores, is_anomaly = self._score_model(X, complete)
+            self._history.extend(X[complete])
+            self._scored += len(X)
+            self._add_alerts(bookings, scores, is_anomaly)
+
+        return pd.DataFrame({'score': scores, 'is_anomaly': is_anomaly}, index=bookings.index)
+
+    def missing_columns(self, bookings: pd.DataFrame) -> List[str]:
+        """Columns observe needs that bookings lacks"""
+        required = self.features + (['origin', 'destination'] if self.method == 'robust_zscore' else [])
+        return [column for column in required if column not in bookings.columns]
+
+    def _score_zscore(self, bookings: pd.DataFrame, X: np.ndarray) -> np.ndarray:
+        """Max absolute robust z-score per booking, in arrival order per route"""
+        scores = np.full(len(X), np.nan)
+        routes = zip(bookings['origin'].to_numpy(), bookings['destination'].to_numpy())
+        for i, route in enumerate(routes):
+            window = self._windows.get(route)
+            if window is None:
+                window = self._windows[route] = RouteWindow(self.window, len(self.features))
+            present = ~np.isnan(X[i])
+            if window.count >= self.min_history and present.any():
+                history = window.values()
+                median = np.median(history, axis=0)
+                mad = np.median(np.abs(history - median), axis=0)
+                deviation = np.abs(X[i] - median)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    z = np.where(mad > 0, MAD_SCALE * deviation / mad, np.where(deviation > 0, np.inf, 0))
+                scores[i] = z[present].max()
+            if present.all():
+                window.push(X[i])
+        return scores
+
+    def _score_model(self, X: np.ndarray, complete: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Anomaly score (higher is more anomalous) of the complete rows from the current model"""
+        scores = np.full(len(X), np.nan)
+        is_anomaly = np.zeros(len(X), dtype=bool)
+        model = self.model
+        if model is None or not complete.any():
+            return scores, is_anomaly
+        decision = model.decision_function(pd.DataFrame(X[complete], columns=self.features))
+        scores[complete] = -decision
+        is_anomaly[complete] = decision < 0
+        return scores, is_anomaly
+
+    def _add_alerts(self, bookings: pd.DataFrame, scores: np.ndarray, is_anomaly: np.ndarray):
+        if not is_anomaly.any():
+            return
+        detected_at = datetime.now(timezone.utc).isoformat()
+        rows = bookings[is_anomaly]
+        for booking, score in zip(rows.to_dict('records'), scores[is_anomaly]):
+            self._last_alert_id += 1
+            self._alerts.append({
+                'id': self._last_alert_id,
+                'detected_at': detected_at,
+                'method': self.method,
+                'score': float(score),
+                'booking': booking
+            })
+
+    def alerts(self, after: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Alerts with an id greater than after, oldest first"""
+        with self._lock:
+            alerts = [alert for alert in self._alerts if alert['id'] > after]
+        return alerts[:limit] if limit else alerts
+
+    @property
+    def last_alert_id(self) -> int:
+        return self._last_alert_id
+
+    def refresh(self) -> bool:
+        """
+        Refit the IsolationForest on the recent bookings
+
+        Fitting runs outside the lock; the new model is swapped in once
+        it is ready.
+
+        Returns:
+            False when there is not enough history (or for robust_zscore)
+        """
+        if self.method != 'isolation_forest':
+            return False
+        with self._lock:
+            if len(self._history) < self.min_history:
+                return False
+            history = pd.DataFrame(np.array(self._history), columns=self.features)
+        model = fit_model('anomaly_detector', history)
+        with self._lock:
+            self.model = model
+            self._refreshes += 1
+            self._last_refresh = datetime.now(timezone.utc).isoformat()
+        return True
+
+    def start(self):
+        """Refresh the model every refresh_interval seconds in a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name='anomaly-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the refresh thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+                self._last_refresh_error = None
+            except Exception as e:
+                # Keep scoring with the previous model
+                self._last_refresh_error = f'{type(e).__name__}: {e}'
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'method': self.method,
+                'features': self.features,
+                'scored': self._scored,
+                'routes': len(self._windows),
+                'history': len(self._history),
+                'alerts': len(self._alerts),
+                'last_alert_id': self._last_alert_id,
+                'model_loaded': self.model is not None,
+                'refreshes': self._refreshes,
+                'last_refresh': self._last_refresh,
+                'last_refresh_error': self._last_refresh_error,
+                'refreshing': self._thread is not None and self._thread.is_alive()
+            }
@@ -0,0 +1,194 @@
+# backend/analytics/components/connection_scanner.py
+
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Union
+
+class ConnectionScanner:
+    """
+    Earliest-arrival journey planner over flight schedules (Connection Scan Algorithm).
+
+    Every flight is one elementary connection. Connections are kept in flat
+    arrays sorted by departure time, so a query is a single forward scan
+    starting at the first departure after the requested time.
+    """
+
+    def __init__(
+        self,
+        min_connection_minutes: int = 45,
+        max_journey_hours: float = 48
+    ):
+        """
+        Args:
+            min_connection_minutes: Default minimum connection time at an
+                intermediate airport
+            max_journey_hours: Only scan departures within this window after
+                the requested departure time
+        """
+        self.min_connection_minutes = min_connection_minutes
+        self.max_journey_hours = max_journey_hours
+        self.airports = np.array([], dtype=object)
+        self.airport_index: Dict[str, int] = {}
+        self.min_connection: List[int] = []
+        self.flight_numbers = np.array([], dtype=object)
+        self.departure_times = np.array([], dtype=np.int64)
+        self.arrival_times = np.array([], dtype=np.int64)
+        self.departure_airports = np.array([], dtype=np.int32)
+        self.arrival_airports = np.array([], dtype=np.int32)
+
+    def build_timetable(
+        self,
+        flights_data: pd.DataFrame,
+        min_connection_minutes: Optional[Dict[str, int]] = None
+    ):
+        """
+        Build the sorted connection arrays from flight records
+
+        Args:
+            flights_data: Flights with flightNumber, from, to, departureTime
+                and arrivalTime columns
+            min_connection_minutes: Per-airport overrides of the default
+                minimum connection time
+        """
+        departures = self._to_epoch_seconds(flights_data['departureTime'])
+        arrivals = self._to_epoch_seconds(flights_data['arrivalTime'])
+        valid = arrivals >= departures
+        flights_data = flights_data[valid]
+        departures, arrivals = departures[valid], arrivals[valid]
+
+        n = len(flights_data)
+        codes, airports = pd.factorize(
+            np.concatenate([flights_data['from'].to_numpy(), flights_data['to'].to_numpy()])
+        )
+        order = np.lexsort((arrivals, departures))
+
+        self.airports = np.asarray(airports, dtype=object)
+        self.airport_index = {code: i for i, code in enumerate(self.airports.tolist())}
+        self.flight_numbers = flights_data['flightNumber'].to_numpy(dtype=object)[order]
+        self.departure_times = departures[order]
+        self.arrival_times = arrivals[order]
+        self.departure_airports = codes[:n][order].astype(np.int32)
+        self.arrival_airports = codes[n:][order].astype(np.int32)
+
+        overrides = min_connection_minutes or {}
+        self.min_connection = [
+            overrides.get(code, self.min_connection_minutes) * 60
+            for code in self.airports.tolist()
+        ]
+
+        # Plain lists for the scan loop; indexing them is much cheaper than
+        # indexing NumPy arrays element by element
+        self._scan_departures = self.departure_times.tolist()
+        self._scan_arrivals = self.arrival_times.tolist()
+        self._scan_from = self.departure_airports.tolist()
+        self._scan_to = self.arrival_airports.tolist()
+
+    def earliest_arrival(
+        self,
+        origin: str,
+        destination: str,
+        departure_after: Union[str, datetime],
+        min_connection_minutes: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Find the journey arriving earliest at destination
+
+        Args:
+            origin: Origin airport code
+            destination: Destination airport code
+            departure_after: Earliest departure time (naive times are UTC)
+            min_connection_minutes: Override the minimum connection time at
+                every intermediate airport for this query
+
+        Returns:
+            Dict containing path, legs, departure/arrival times, duration and
+            stops, or None when destination cannot be reached
+        """
+        if origin not in self.airport_index or destination not in self.airport_index:
+            return None
+
+        source = self.airport_index[origin]
+        target = self.airport_index[destination]
+        if source == target:
+            return None
+        start_time = int(self._to_epoch_seconds(pd.Series([departure_after]))[0])
+
+        if min_connection_minutes is not None:
+            min_connection = [min_connection_minutes * 60] * len(self.airports)
+        else:
+            min_connection = self.min_connection
+
+        first = int(np.searchsorted(self.departure_times, start_time, side='left'))
+        last = int(np.searchsorted(
+            self.departure_times,
+            start_time + int(self.max_journey_hours * 3600),
+            side='right'
+        ))
+
+        # ready[s]: earliest time a connection may leave airport s
+        infinity = float('inf')
+        ready = [infinity] * len(self.airports)
+        ready[source] = start_time
+        arrival = [infinity] * len(self.airports)
+        arrival[source] = start_time
+        in_connection = [-1] * len(self.airports)
+
+        departures = self._scan_departures
+        arrivals = self._scan_arrivals
+        from_airports = self._scan_from
+        to_airports = self._scan_to
+
+        for c in range(first, last):
+            departure = departures[c]
+            if departure >= arrival[target]:
+                break
+
+            stop = from_airports[c]
+            if departure < ready[stop]:
+                continue
+
+            next_stop = to_airports[c]
+            if arrivals[c] < arrival[next_stop]:
+                arrival[next_stop] = arrivals[c]
+                ready[next_stop] = arrivals[c] + min_connection[next_stop]
+                in_connection[next_stop] = c
+
+        if in_connection[target] < 0:
+            return None
+
+        legs = []
+        stop = target
+        while stop != source:
+            c = in_connection[stop]
+            legs.append(c)
+            stop = from_airports[c]
+        legs.reverse()
+
+        departure_time = int(self.departure_times[legs[0]])
+        arrival_time = int(self.arrival_times[legs[-1]])
+        return {
+            'path': [self.airports[from_airports[legs[0]]]] + [self.airports[to_airports[c]] for c in legs],
+            'legs': [
+                {
+                    'flight_number': self.flight_numbers[c],
+                    'from': self.airports[from_airports[c]],
+                    'to': self.airports[to_airports[c]],
+                    'departure_time': self._to_iso(self.departure_times[c]),
+                    'arrival_time': self._to_iso(self.arrival_times[c])
+                }
+                for c in legs
+            ],
+            'departure_time': self._to_iso(departure_time),
+            'arrival_time': self._to_iso(arrival_time),
+            'duration_hours': (arrival_time - departure_time) / 3600,
+            'stops': len(legs) - 1
+        }
+
+    def _to_epoch_seconds(self, times: pd.Series) -> np.ndarray:
+        """Convert datetimes (naive times are treated as UTC) to epoch seconds"""
+        times = pd.to_datetime(times, utc=True)
+        return ((times - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+
+    def _to_iso(self, seconds: int) -> str:
+        return (datetime(1970, 1, 1) + timedelta(seconds=int(seconds))).isoformat() + 'Z'
@@ -0,0 +1,142 @@
+# backend/analytics/components/dashboard_aggregates.py
+
+import threading
+import pandas as pd
+from typing import Dict
+
+BOOKING_METRICS = ['passenger_count', 'total_revenue']
+
+class DashboardAggregateStore:
+    """
+    Materialized dashboard aggregates, updated incrementally from booking deltas.
+
+    Bookings are aggregated per day, per route, per payment method and per
+    hotel. Appending a batch of new bookings only aggregates that batch and
+    merges it into the stored totals, so reads cost O(keys) instead of a
+    groupby over every booking. Each update swaps in new frames under a
+    lock; readers always see a complete, consistent snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self._clear()
+
+    def _clear(self):
+        self.daily = self._empty_frame('booking_date')
+        self.routes = self._empty_frame(['origin', 'destination'])
+        self.payments = pd.Series(dtype='int64', name='count')
+        self.payments.index.name = 'payment_method'
+        self.hotels = pd.Series(dtype='float64', name='booking_count')
+        self.hotels.index.name = 'hotel_name'
+        self.bookings = 0
+
+    @classmethod
+    def from_bookings(cls, data: pd.DataFrame) -> 'DashboardAggregateStore':
+        """Build a store from a full booking frame"""
+        store = cls()
+        store.append(data)
+        return store
+
+    @classmethod
+    def from_csv(cls, path, chunksize: int = 100_000) -> 'DashboardAggregateStore':
+        """
+        Build a store from a booking history CSV
+
+        The file is aggregated chunksize rows at a time, so the full history
+        is never loaded at once.
+        """
+        store = cls()
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            store.append(chunk)
+        return store
+
+    def append(self, bookings: pd.DataFrame) -> int:
+        """
+        Merge a batch of new bookings into the aggregates
+
+        Only the aggregates whose source columns are present in the batch
+        are updated.
+
+        Args:
+            bookings: New booking rows (booking_date, origin, destination,
+                passenger_count, total_revenue, payment_method, hotel_name,
+                booking_count)
+
+        Returns:
+            The store version after the update
+        """
+        deltas = self.aggregate(bookings)
+
+        with self._lock:
+            if 'daily' in deltas:
+                self.daily = self._merge(self.daily, deltas['daily'])
+            if 'routes' in deltas:
+                self.routes = self._merge(self.routes, deltas['routes'])
+            if 'payments' in deltas:
+                self.payments = self._merge(self.payments, deltas['payments']).astype('int64')
+            if 'hotels' in deltas:
+                self.hotels = self._merge(self.hotels, deltas['hotels'])
+            self.bookings += len(bookings)
+            self.version += 1
+            return self.version
+
+    @staticmethod
+    def aggregate(bookings: pd.DataFrame) -> Dict:
+        """Aggregate one batch of bookings into per-key deltas"""
+        columns = set(bookings.columns)
+        metrics = [column for column in BOOKING_METRICS if column in columns]
+        deltas = {}
+
+        if 'booking_date' in columns and metrics:
+            days = pd.to_datetime(bookings['booking_date']).dt.normalize().rename('booking_date')
+            deltas['daily'] = bookings[metrics].groupby(days).sum().reindex(columns=BOOKING_METRICS, fill_value=0)
+        if {'origin', 'destination'} <= columns and metrics:
+            deltas['routes'] = (
+                bookings.groupby(['origin', 'destination'], observed=True)[metrics].sum()
+                .reindex(columns=BOOKING_METRICS, fill_value=0)
+            )
+        if 'payment_method' in columns:
+            deltas['payments'] = bookings.groupby('payment_method', observed=True).size().rename('count')
+        if {'hotel_name', 'booking_count'} <= columns:
+            deltas['hotels'] = bookings.groupby('hotel_name', observed=True)['booking_count'].sum()
+
+        return deltas
+
+    def snapshot(self) -> Dict:
+        """Current aggregates (frames are never mutated in place)"""
+        with self._lock:
+            return {
+                'daily': self.daily,
+                'routes': self.routes,
+                'payments': self.payments,
+                'hotels': self.hotels,
+                'bookings': self.bookings,
+                'version': self.version
+            }
+
+    def reset(self):
+        """Drop all aggregates"""
+        with self._lock:
+            self._clear()
+            self.version += 1
+
+    @staticmethod
+    def _merge(current, delta):
+        if not len(current):
+            return delta.sort_index()
+        return current.add(delta, fill_value=0).sort_index()
+
+    @staticmethod
+    def _empty_frame(index) -> pd.DataFrame:
+        if isinstance(index, list):
+            return pd.DataFrame(
+                columns=BOOKING_METRICS,
+                index=pd.MultiIndex.from_tuples([], names=index),
+                dtype='float64'
+            )
+        return pd.DataFrame(
+            columns=BOOKING_METRICS,
+            index=pd.DatetimeIndex([], name=index),
+            dtype='float64'
+        )
@@ -2,21 +2,57 @@
 
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List
+from typing import Dict, List, Optional
 import pandas as pd
 import json
+from .dashboard_aggregates import DashboardAggregateStore
+
+# 'compact': chart spec plus columnar arrays; 'plotly': full Plotly figure JSON
+CHART_OUTPUTS = {'compact', 'plotly'}
 
 class DashboardGenerator:
-    def __init__(self):
+    def __init__(self, aggregates: Optional[DashboardAggregateStore] = None):
         self.theme = 'plotly'
         self.color_scheme = px.colors.qualitative.Set3
+        self.aggregates = aggregates or DashboardAggregateStore()
+
+    def append_bookings(self, bookings: pd.DataFrame) -> int:
+        """Merge new bookings into the materialized aggregates"""
+        return self.aggregates.append(bookings)
+
+    def _snapshot(self, data: Optional[pd.DataFrame]) -> Dict:
+        """Aggregates of the given bookings, or of the store when data is None"""
+        if data is None:
+            return self.aggregates.snapshot()
+        return DashboardAggregateStore.from_bookings(data).snapshot()
+
+    def _check_output(self, output: str):
+        if output not in CHART_OUTPUTS:
+            raise ValueError(f"Unknown output {output!r}; expected one of {sorted(CHART_OUTPUTS)}")
+
+    def _dates(self, index: pd.DatetimeIndex) -> List[str]:
+        return index.strftime('%Y-%m-%d').tolist()
+
+    def generate_booking_trends(self, data: Optional[pd.DataFrame] = None, output: str = 'compact') -> Dict:
+        """
+        Generate booking trends visualization
+
+        The default compact output is a small chart spec with columnar
+        arrays; output='plotly' returns the full Plotly figure.
+        """
+        self._check_output(output)
+        daily_bookings = self._snapshot(data)['daily']['passenger_count']
+
+        if output == 'compact':
+            return {
+                'type': 'line',
+                'title': 'Daily Booking Trends',
+                'x': self._dates(daily_bookings.index),
+                'series': [{'name': 'passenger_count', 'y': daily_bookings.to_numpy()}]
+            }
 
-    def generate_booking_trends(self, data: pd.DataFrame) -> Dict:
-        """Generate booking trends visualization"""
-        daily_bookings = data.groupby('booking_date')['passenger_count'].sum().reset_index()
-        
         fig = px.line(
-            daily_bookings,
+            daily_bookings.reset_index(),
             x='booking_date',
             y='passenger_count',
             title='Daily Booking Trends'
@@ -24,22 +60,35 @@ class DashboardGenerator:
         
         return json.loads(fig.to_json())
 
-    def generate_revenue_analysis(self, data: pd.DataFrame) -> Dict:
+    def generate_revenue_analysis(self, data: Optional[pd.DataFrame] = None, output: str = 'compact') -> Dict:
         """Generate revenue analysis visualization"""
-        revenue_data = data.groupby('booking_date')['total_revenue'].sum().reset_index()
-        
+        self._check_output(output)
+        revenue = self._snapshot(data)['daily']['total_revenue']
+        moving_average = revenue.rolling(7).mean()
+
+        if output == 'compact':
+            return {
+                'type': 'line',
+                'title': 'Revenue Analysis',
+                'x': self._dates(revenue.index),
+                'series': [
+                    {'name': 'Daily Revenue', 'y': revenue.to_numpy(), 'mode': 'lines+markers'},
+                    {'name': '7-day Moving Average', 'y': moving_average.to_numpy(), 'mode': 'lines', 'dash': 'dash'}
+                ]
+            }
+
         fig = go.Figure()
         fig.add_trace(go.Scatter(
-            x=revenue_data['booking_date'],
-            y=revenue_data['total_revenue'],
+            x=revenue.index,
+            y=revenue.values,
             mode='lines+markers',
             name='Daily Revenue'
         ))
         
         # Add trend line
         fig.add_trace(go.Scatter(
-            x=revenue_data['booking_date'],
-            y=revenue_data['total_revenue'].rolling(7).mean(),
+            x=revenue.index,
+            y=moving_average.values,
             mode='lines',
             name='7-day Moving Average',
             line=dict(dash='dash')
@@ -48,12 +97,20 @@ class DashboardGenerator:
         fig.update_layout(title='Revenue Analysis')
         return json.loads(fig.to_json())
 
-    def generate_route_performance(self, data: pd.DataFrame) -> Dict:
+    def generate_route_performance(self, data: Optional[pd.DataFrame] = None, output: str = 'compact') -> Dict:
         """Generate route performance visualization"""
-        route_perf = data.groupby(['origin', 'destination']).agg({
-            'passenger_count': 'sum',
-            'total_revenue': 'sum'
-        }).reset_index()
+        self._check_output(output)
+        route_perf = self._snapshot(data)['routes'].reset_index()
+
+        if output == 'compact':
+            return {
+                'type': 'scatter',
+                'title': 'Route Performance Analysis',
+                'x': route_perf['passenger_count'].to_numpy(),
+                'series': [{'name': 'total_revenue', 'y': route_perf['total_revenue'].to_numpy()}],
+                'labels': route_perf['origin'].astype(str).tolist(),
+                'destinations': route_perf['destination'].astype(str).tolist()
+            }
         
         fig = px.scatter(
             route_perf,
@@ -65,9 +122,18 @@ class DashboardGenerator:
         
         return json.loads(fig.to_json())
 
-    def generate_payment_distribution(self, data: pd.DataFrame) -> Dict:
+    def generate_payment_distribution(self, data: Optional[pd.DataFrame] = None, output: str = 'compact') -> Dict:
         """Generate payment method distribution visualization"""
-        payment_dist = data['payment_method'].value_counts()
+        self._check_output(output)
+        payment_dist = self._snapshot(data)['payments'].sort_values(ascending=False, kind='stable')
+
+        if output == 'compact':
+            return {
+                'type': 'pie',
+                'title': 'Payment Method Distribution',
+                'labels': payment_dist.index.astype(str).tolist(),
+                'values': payment_dist.to_numpy()
+            }
         
         fig = px.pie(
             values=payment_dist.values,
@@ -77,12 +143,21 @@ class DashboardGenerator:
         
         return json.loads(fig.to_json())
 
-    def generate_hotel_preferences(self, data: pd.DataFrame) -> Dict:
+    def generate_hotel_preferences(self, data: Optional[pd.DataFrame] = None, output: str = 'compact') -> Dict:
         """Generate hotel booking preferences visualization"""
-        hotel_bookings = data.groupby('hotel_name')['booking_count'].sum().reset_index()
+        self._check_output(output)
+        hotel_bookings = self._snapshot(data)['hotels']
+
+        if output == 'compact':
+            return {
+                'type': 'bar',
+                'title': 'Popular Hotels',
+                'x': hotel_bookings.index.astype(str).tolist(),
+                'series': [{'name': 'booking_count', 'y': hotel_bookings.to_numpy()}]
+            }
         
         fig = px.bar(
-            hotel_bookings,
+            hotel_bookings.reset_index(),
             x='hotel_name',
             y='booking_count',
             title='Popular Hotels'
@@ -1,13 +1,34 @@
 # backend/analytics/components/map_visualizer.py
 
+import shutil
+from pathlib import Path
 import folium
-from typing import Dict, List, Tuple
+from folium.plugins import FastMarkerCluster
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from branca.colormap import LinearColormap
+from ..utils.artifact_cache import ArtifactCache
+from ..utils.geo_utils import great_circle_path_list, split_antimeridian
+
+# Client-side marker factory for clustered airports: row = [lat, lon, popup]
+AIRPORT_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {radius: 5, color: 'red', fill: true});
+    marker.bindPopup(row[2]);
+    return marker;
+}
+"""
+
+AIRPORT_COLUMNS = ['code', 'name', 'latitude', 'longitude']
+ROUTE_COLUMNS = ['origin_lat', 'origin_lon', 'dest_lat', 'dest_lon', 'traffic_density']
 
 class MapVisualizer:
-    def __init__(self):
+    def __init__(self, artifact_cache: Optional[ArtifactCache] = None):
         self.base_map = None
+        # Cached page matching base_map, set by render_network_map
+        self.rendered_page: Optional[Path] = None
+        self.artifact_cache = artifact_cache or ArtifactCache()
         self.route_colors = LinearColormap(
             colors=['green', 'yellow', 'red'],
             vmin=0,
@@ -21,15 +42,47 @@ class MapVisualizer:
             zoom_start=2,
             tiles='OpenStreetMap'
         )
+        self.rendered_page = None
         return self.base_map
 
-    def add_airports(self, airports_data: pd.DataFrame):
-        """Add airports to the map"""
-        for _, airport in airports_data.iterrows():
+    def add_airports(self, airports_data: pd.DataFrame, cluster: bool = False):
+        """
+        Add airports to the map
+
+        Args:
+            airports_data: Airports with code, name, latitude and longitude
+            cluster: Render all airports as one client-side marker cluster
+                layer instead of one map object per airport
+        """
+        self._add_airport_rows(self.airport_marker_rows(airports_data), cluster)
+
+    def airport_marker_rows(self, airports_data: pd.DataFrame) -> List[List]:
+        """[latitude, longitude, popup] rows for airport markers"""
+        popups = airports_data['name'].astype(str) + ' (' + airports_data['code'].astype(str) + ')'
+        return [
+            [lat, lon, popup]
+            for lat, lon, popup in zip(
+                airports_data['latitude'].tolist(),
+                airports_data['longitude'].tolist(),
+                popups.tolist()
+            )
+        ]
+
+    def _add_airport_rows(self, rows: List[List], cluster: bool):
+        self.rendered_page = None
+        if cluster:
+            FastMarkerCluster(
+                data=rows,
+                callback=AIRPORT_MARKER_CALLBACK,
+                name='Airports'
+            ).add_to(self.base_map)
+            return
+
+        for lat, lon, popup in rows:
             folium.CircleMarker(
-                location=[airport['latitude'], airport['longitude']],
+                location=[lat, lon],
                 radius=5,
-                popup=f"{airport['name']} ({airport['code']})",
+                popup=popup,
                 color='red',
                 fill=True
             ).add_to(self.base_map)
@@ -41,6 +94,7 @@ class MapVisualizer:
         route_info: Dict = None
     ):
         """Visualize specific route on the map"""
+        self.rendered_page = None
         coordinates = []
         for airport_code in route:
             airport = airports_data[airport_code]
@@ -55,21 +109,222 @@ class MapVisualizer:
             popup=self._create_route_popup(route_info) if route_info else None
         ).add_to(self.base_map)
 
-    def visualize_traffic_density(self, routes_data: pd.DataFrame):
-        """Visualize route traffic density"""
-        for _, route in routes_data.iterrows():
-            color = self.route_colors(route['traffic_density'])
-            
+    def visualize_traffic_density(
+        self,
+        routes_data: pd.DataFrame,
+        aggregate: bool = False,
+        min_traffic_percentile: Optional[float] = None
+    ):
+        """
+        Visualize route traffic density
+
+        Args:
+            routes_data: Route rows with origin/destination coordinates and
+                traffic_density
+            aggregate: Bundle routes by airport pair into a single GeoJSON
+                layer instead of one PolyLine per row
+            min_traffic_percentile: With aggregate, drop routes below this
+                traffic percentile
+        """
+        if aggregate:
+            return self.visualize_aggregated_traffic(routes_data, min_traffic_percentile)
+
+        self.rendered_page = None
+        for origin_lat, origin_lon, dest_lat, dest_lon, density in zip(
+            routes_data['origin_lat'].tolist(),
+            routes_data['origin_lon'].tolist(),
+            routes_data['dest_lat'].tolist(),
+            routes_data['dest_lon'].tolist(),
+            routes_data['traffic_density'].tolist()
+        ):
             folium.PolyLine(
-                locations=[
-                    [route['origin_lat'], route['origin_lon']],
-                    [route['dest_lat'], route['dest_lon']]
-                ],
+                locations=[[origin_lat, origin_lon], [dest_lat, dest_lon]],
                 weight=2,
-                color=color,
+                color=self.route_colors(density),
                 opacity=0.6
             ).add_to(self.base_map)
 
+    def aggregate_routes(self, routes_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Collapse route rows into one row per airport pair
+
+        Both directions of a pair are bundled together. Traffic density is
+        summed and the number of underlying rows kept as flights.
+        """
+        origin = routes_data[['origin_lat', 'origin_lon']].to_numpy(dtype=np.float64)
+        dest = routes_data[['dest_lat', 'dest_lon']].to_numpy(dtype=np.float64)
+
+        # Canonical endpoint order so A->B and B->A share a key
+        swap = (origin[:, 0] > dest[:, 0]) | ((origin[:, 0] == dest[:, 0]) & (origin[:, 1] > dest[:, 1]))
+        first = np.where(swap[:, None], dest, origin)
+        second = np.where(swap[:, None], origin, dest)
+
+        pairs = pd.DataFrame({
+            'origin_lat': first[:, 0],
+            'origin_lon': first[:, 1],
+            'dest_lat': second[:, 0],
+            'dest_lon': second[:, 1],
+            'traffic_density': routes_data['traffic_density'].to_numpy()
+        })
+        return pairs.groupby(
+            ['origin_lat', 'origin_lon', 'dest_lat', 'dest_lon'], sort=False
+        ).agg(
+            traffic_density=('traffic_density', 'sum'),
+            flights=('traffic_density', 'size')
+        ).reset_index()
+
+    def build_route_features(
+        self,
+        routes_data: pd.DataFrame,
+        min_traffic_percentile: Optional[float] = None,
+        great_circle: bool = False
+    ) -> Dict:
+        """
+        Build a GeoJSON FeatureCollection of aggregated routes
+
+        Args:
+            routes_data: Route rows with origin_lat/origin_lon,
+                dest_lat/dest_lon and traffic_density
+            min_traffic_percentile: Keep only routes at or above this
+                traffic percentile (e.g. 90 keeps the busiest 10%)
+            great_circle: Draw great-circle arcs (split at the
+                antimeridian) instead of straight segments
+
+        Returns:
+            GeoJSON dict whose features carry traffic_density, flights and
+            a precomputed color
+        """
+        routes = self.aggregate_routes(routes_data)
+        if min_traffic_percentile is not None and len(routes):
+            threshold = np.percentile(routes['traffic_density'], min_traffic_percentile)
+            routes = routes[routes['traffic_density'] >= threshold]
+
+        origins = routes[['origin_lat', 'origin_lon']].to_numpy()
+        destinations = routes[['dest_lat', 'dest_lon']].to_numpy()
+        if great_circle:
+            paths = great_circle_path_list(origins, destinations)
+        else:
+            paths = np.stack([origins, destinations], axis=1)
+
+        features = []
+        for path, density, flights in zip(
+            paths,
+            routes['traffic_density'].tolist(),
+            routes['flights'].tolist()
+        ):
+            # GeoJSON positions are [lon, lat]
+            segments = [segment[:, ::-1].tolist() for segment in split_antimeridian(path)]
+            features.append({
+                'type': 'Feature',
+                'geometry': (
+                    {'type': 'LineString', 'coordinates': segments[0]}
+                    if len(segments) == 1
+                    else {'type': 'MultiLineString', 'coordinates': segments}
+                ),
+                'properties': {
+                    'traffic_density': density,
+                    'flights': flights,
+                    'color': self.route_colors(density)
+                }
+            })
+
+        return {'type': 'FeatureCollection', 'features': features}
+
+    def add_route_features(self, feature_collection: Dict, name: str = 'Traffic density'):
+        """Add a route FeatureCollection to the map as a single GeoJSON layer"""
+        self.rendered_page = None
+        folium.GeoJson(
+            feature_collection,
+            name=name,
+            style_function=lambda feature: {
+                'color': feature['properties']['color'],
+                'weight': 2,
+                'opacity': 0.6
+            },
+            tooltip=folium.GeoJsonTooltip(fields=['traffic_density', 'flights'])
+        ).add_to(self.base_map)
+
+    def visualize_aggregated_traffic(
+        self,
+        routes_data: pd.DataFrame,
+        min_traffic_percentile: Optional[float] = None,
+        great_circle: bool = False
+    ) -> Dict:
+        """
+        Visualize route traffic density aggregated by airport pair
+
+        Output size scales with unique routes rather than raw rows.
+        Returns the GeoJSON that was added to the map.
+        """
+        feature_collection = self.build_route_features(
+            routes_data, min_traffic_percentile, great_circle
+        )
+        self.add_route_features(feature_collection)
+        return feature_collection
+
+    def render_network_map(
+        self,
+        airports_data: pd.DataFrame,
+        routes_data: pd.DataFrame,
+        filename: Optional[str] = None,
+        cluster: bool = True,
+        min_traffic_percentile: Optional[float] = None,
+        great_circle: bool = False
+    ) -> Path:
+        """
+        Render the aggregated route network map through the artifact cache
+
+        The airport and traffic layers are cached separately, keyed by a
+        hash of their input data and options, and the HTML page is keyed by
+        the layer keys. Unchanged inputs are served from disk without any
+        recomputation; when only the routes change, the airport layer is
+        reused and only the traffic layer and page are regenerated.
+
+        Args:
+            airports_data: Airports with code, name, latitude and longitude
+            routes_data: Route rows with origin/destination coordinates and
+                traffic_density
+            filename: Optionally copy the rendered page to this path
+            cluster: Cluster airport markers
+            min_traffic_percentile: Drop routes below this traffic percentile
+            great_circle: Draw great-circle arcs
+
+        Returns:
+            Path of the cached HTML page
+        """
+        cache = self.artifact_cache
+        airports_key = cache.fingerprint('airports', airports_data[AIRPORT_COLUMNS])
+        traffic_key = cache.fingerprint(
+            'traffic',
+            routes_data[ROUTE_COLUMNS],
+            {
+                'min_traffic_percentile': min_traffic_percentile,
+                'great_circle': great_circle,
+                'colors': [self.route_colors.vmin, self.route_colors.vmax, self.route_colors.colors]
+            }
+        )
+        page_key = cache.fingerprint(airports_key, traffic_key, {'cluster': cluster})
+
+        def render() -> str:
+            markers = cache.get_or_create_json(
+                'map-layers', airports_key, lambda: self.airport_marker_rows(airports_data)
+            )
+            features = cache.get_or_create_json(
+                'map-layers',
+                traffic_key,
+                lambda: self.build_route_features(routes_data, min_traffic_percentile, great_circle)
+            )
+            self.create_base_map()
+            self._add_airport_rows(markers, cluster)
+            self.add_route_features(features)
+            return self.base_map.get_root().render()
+
+        path = cache.get_or_create('maps', page_key, '.html', render)
+        self.rendered_page = path
+        if filename:
+            shutil.copyfile(path, filename)
+        return path
+
     def _create_route_popup(self, route_info: Dict) -> str:
         """Create popup HTML for route information"""
         return f"""
@@ -82,5 +337,15 @@ class MapVisualizer:
         """
 
     def save_map(self, filename: str):
-        """Save map to HTML file"""
+        """
+        Save map to HTML file
+
+        After render_network_map the page is copied from the artifact cache
+        instead of being rendered again.
+        """
+        if self.rendered_page is not None and self.rendered_page.exists():
+            shutil.copyfile(self.rendered_page, filename)
+            return
+        if self.base_map is None:
+            raise ValueError("No map to save; render or create a map first")
         self.base_map.save(filename)
\ No newline at end of file
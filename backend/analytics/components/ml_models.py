@@ -3,10 +3,82 @@
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor, IsolationForest
-from sklearn.preprocessing import StandardScaler
-from tensorflow import keras
-from typing import Dict, Tuple, List
+import os
+import threading
+from typing import Dict, Tuple, List, Optional
 import joblib
+from ..utils.checksums import verify_checksums
+from ..utils.dense_network import DenseNetwork
+from ..utils.feature_pipeline import FeaturePipeline
+from ..utils.packed_forest import PackedForest
+
+# Never used as model inputs
+TARGET_COLUMNS = ['passenger_count', 'total_revenue', 'optimal_price']
+ANOMALY_FEATURES = ['passenger_count', 'total_revenue', 'booking_rate']
+
+# Files written by save_models, relative to the model directory
+MODEL_FILES = {
+    'passenger_predictor': 'passenger_model.pkl',
+    'revenue_predictor': 'revenue_model.pkl',
+    'anomaly_detector': 'anomaly_model.pkl',
+    'price_optimizer': 'price_optimizer',
+    # NumPy exports of the trained models used for inference
+    'passenger_forest': 'passenger_model.forest.npy',
+    'revenue_forest': 'revenue_model.forest.npy',
+    'price_network': 'price_optimizer.npz'
+}
+# Inference export of each trained model
+INFERENCE_EXPORTS = {
+    'passenger_predictor': 'passenger_forest',
+    'revenue_predictor': 'revenue_forest',
+    'price_optimizer': 'price_network'
+}
+FEATURE_PIPELINES_FILE = 'feature_pipelines.pkl'
+
+def get_keras():
+    """Import Keras on first use; TensorFlow is only needed for the price optimizer"""
+    from tensorflow import keras
+    return keras
+
+def fit_model(name: str, X, y=None, n_jobs: Optional[int] = None):
+    """
+    Build and fit one of the models with its standard hyperparameters
+
+    Args:
+        name: passenger_predictor, revenue_predictor, anomaly_detector or
+            price_optimizer
+        X: Training features
+        y: Training target (unused by the anomaly detector)
+        n_jobs: Cores for the tree ensembles (default single core)
+    """
+    if name in ('passenger_predictor', 'revenue_predictor'):
+        model = RandomForestRegressor(
+            n_estimators=100,
+            random_state=42,
+            n_jobs=n_jobs
+        )
+        return model.fit(X, y)
+
+    if name == 'anomaly_detector':
+        model = IsolationForest(
+            contamination=0.1,
+            random_state=42,
+            n_jobs=n_jobs
+        )
+        return model.fit(X)
+
+    if name == 'price_optimizer':
+        keras = get_keras()
+        model = keras.Sequential([
+            keras.layers.Dense(64, activation='relu'),
+            keras.layers.Dense(32, activation='relu'),
+            keras.layers.Dense(1)
+        ])
+        model.compile(optimizer='adam', loss='mse')
+        model.fit(X, y, epochs=50, batch_size=32, verbose=0)
+        return model
+
+    raise ValueError(f"Unknown model {name!r}")
 
 class MLModels:
     def __init__(self):
@@ -14,107 +86,211 @@ class MLModels:
         self.revenue_predictor = None
         self.anomaly_detector = None
         self.price_optimizer = None
-        self.scaler = StandardScaler()
+        self.passenger_forest: Optional[PackedForest] = None
+        self.revenue_forest: Optional[PackedForest] = None
+        self.price_network: Optional[DenseNetwork] = None
+        # One fitted pipeline per model, keyed like the model attributes
+        self.feature_pipelines: Dict[str, FeaturePipeline] = {}
+        # Set by load_models(lazy=True): models are read on first use
+        self.model_path: Optional[str] = None
+        self.checksums: Optional[Dict[str, str]] = None
+        self._load_lock = threading.RLock()
 
     def train_passenger_predictor(self, data: pd.DataFrame):
         """Train passenger prediction model"""
-        X = self._prepare_features(data)
-        y = data['passenger_count']
-        
-        self.passenger_predictor = RandomForestRegressor(
-            n_estimators=100,
-            random_state=42
-        )
-        self.passenger_predictor.fit(X, y)
+        X = self._prepare_features(data, 'passenger_predictor', fit=True)
+        self.passenger_predictor = fit_model('passenger_predictor', X, data['passenger_count'])
+        self.export_inference_model('passenger_predictor')
 
     def train_revenue_predictor(self, data: pd.DataFrame):
         """Train revenue prediction model"""
-        X = self._prepare_features(data)
-        y = data['total_revenue']
-        
-        self.revenue_predictor = RandomForestRegressor(
-            n_estimators=100,
-            random_state=42
-        )
-        self.revenue_predictor.fit(X, y)
+        X = self._prepare_features(data, 'revenue_predictor', fit=True)
+        self.revenue_predictor = fit_model('revenue_predictor', X, data['total_revenue'])
+        self.export_inference_model('revenue_predictor')
 
     def train_anomaly_detector(self, data: pd.DataFrame):
         """Train anomaly detection model"""
-        features = data[[
-            'passenger_count',
-            'total_revenue',
-            'booking_rate'
-        ]]
-        
-        self.anomaly_detector = IsolationForest(
-            contamination=0.1,
-            random_state=42
-        )
-        self.anomaly_detector.fit(features)
+        self.anomaly_detector = fit_model('anomaly_detector', data[ANOMALY_FEATURES])
 
     def train_price_optimizer(self, data: pd.DataFrame):
         """Train price optimization model"""
-        X = self._prepare_features(data)
-        y = data['optimal_price']
-        
-        self.price_optimizer = keras.Sequential([
-            keras.layers.Dense(64, activation='relu'),
-            keras.layers.Dense(32, activation='relu'),
-            keras.layers.Dense(1)
-        ])
-        
-        self.price_optimizer.compile(optimizer='adam', loss='mse')
-        self.price_optimizer.fit(X, y, epochs=50, batch_size=32, verbose=0)
+        X = self._prepare_features(data, 'price_optimizer', fit=True)
+        self.price_optimizer = fit_model('price_optimizer', X, data['optimal_price'])
+        self.export_inference_model('price_optimizer')
 
     def predict_passengers(self, features: pd.DataFrame) -> np.ndarray:
         """Predict passenger numbers"""
-        X = self._prepare_features(features)
-        return self.passenger_predictor.predict(X)
+        pipeline, model = self._inference_pair('passenger_predictor')
+        return model.predict(pipeline.transform(features))
 
     def predict_revenue(self, features: pd.DataFrame) -> np.ndarray:
         """Predict revenue"""
-        X = self._prepare_features(features)
-        return self.revenue_predictor.predict(X)
+        pipeline, model = self._inference_pair('revenue_predictor')
+        return model.predict(pipeline.transform(features))
+
+    def forecast(self, name: str, days_ahead: int, start=None) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """
+        Predict the next days_ahead days with the passenger or revenue model
+
+        Only the dates of the horizon are known, so the model's other
+        inputs are held at their training means (zero once scaled).
+
+        Args:
+            name: passenger_predictor or revenue_predictor
+            days_ahead: Number of days to forecast
+            start: First forecast date (defaults to now)
+
+        Returns:
+            (dates, predictions)
+        """
+        pipeline, model = self._inference_pair(name)
+        dates = pd.date_range(
+            pd.Timestamp(start) if start is not None else pd.Timestamp.now(),
+            periods=days_ahead,
+            freq='D'
+        )
+        n_inputs = len(pipeline.input_columns)
+        horizon = pd.DataFrame(
+            np.tile(pipeline.mean_[:n_inputs], (days_ahead, 1)),
+            columns=pipeline.input_columns
+        )
+        if pipeline.uses_date:
+            horizon['date'] = dates
+        return dates, model.predict(pipeline.transform(horizon))
 
     def detect_anomalies(self, data: pd.DataFrame) -> np.ndarray:
         """Detect booking anomalies"""
-        features = data[[
-            'passenger_count',
-            'total_revenue',
-            'booking_rate'
-        ]]
-        return self.anomaly_detector.predict(features)
+        return self.get_model('anomaly_detector').predict(data[ANOMALY_FEATURES])
 
     def optimize_price(self, features: pd.DataFrame) -> np.ndarray:
-        """Optimize ticket pricing"""
-        X = self._prepare_features(features)
-        return self.price_optimizer.predict(X)
-
-    def _prepare_features(self, data: pd.DataFrame) -> np.ndarray:
-        """Prepare features for ML models"""
-        features = data.copy()
-        
-        # Convert dates to cyclical features
-        if 'date' in features.columns:
-            features['day_sin'] = np.sin(2 * np.pi * features['date'].dt.day / 31)
-            features['day_cos'] = np.cos(2 * np.pi * features['date'].dt.day / 31)
-            features['month_sin'] = np.sin(2 * np.pi * features['date'].dt.month / 12)
-            features['month_cos'] = np.cos(2 * np.pi * features['date'].dt.month / 12)
-            features.drop('date', axis=1, inplace=True)
-
-        # Scale features
-        return self.scaler.fit_transform(features)
+        """Optimize ticket pricing (NumPy forward pass, no TensorFlow)"""
+        pipeline, model = self._inference_pair('price_optimizer')
+        return model.predict(pipeline.transform(features))
+
+    def export_inference_model(self, name: str):
+        """
+        Build the inference export of a trained model
+
+        Random forests are packed into flat node arrays (PackedForest) and
+        the Keras price optimizer into a NumPy network (DenseNetwork).
+        """
+        model = getattr(self, name)
+        if name == 'price_optimizer':
+            export = DenseNetwork.from_keras(model)
+        else:
+            export = PackedForest.from_sklearn(model)
+        setattr(self, INFERENCE_EXPORTS[name], export)
+        return export
+
+    def get_inference_model(self, name: str):
+        """
+        Inference export of a trained model
+
+        Loaded from its exported file; model directories saved before the
+        export existed fall back to converting the trained model once.
+        """
+        export = self.get_model(INFERENCE_EXPORTS[name])
+        if export is None and self.get_model(name) is not None:
+            export = self.export_inference_model(name)
+        return export
+
+    def _inference_pair(self, name: str):
+        """
+        Feature pipeline and inference model of one model version
+
+        Both are read under the load lock, so activating another version
+        meanwhile cannot pair one version's pipeline with the other's model.
+        """
+        with self._load_lock:
+            pipeline = self.feature_pipelines.get(name)
+            model = self.get_inference_model(name) if pipeline is not None else None
+        if pipeline is None or model is None:
+            raise ValueError(f"Model {name} has not been trained or loaded")
+        return pipeline, model
+
+    def _prepare_features(self, data, model: str, fit: bool = False) -> np.ndarray:
+        """
+        Prepare features for ML models
+
+        Training fits the model's pipeline; prediction only transforms with
+        it. data may be a DataFrame or, for a single prediction, a dict.
+        """
+        if fit:
+            self.feature_pipelines[model] = FeaturePipeline(exclude=TARGET_COLUMNS)
+            return self.feature_pipelines[model].fit_transform(data)
+        return self.feature_pipelines[model].transform(data)
+
+    def get_model(self, name: str):
+        """A model by attribute name, loading it from model_path on first use"""
+        model = getattr(self, name)
+        if model is not None or self.model_path is None:
+            return model
+        with self._load_lock:
+            model = getattr(self, name)
+            if model is None:
+                model = self._load_model(name)
+                setattr(self, name, model)
+        return model
+
+    def warm_up(self, models: Optional[List[str]] = None):
+        """
+        Load models ahead of their first request
+
+        By default only the models used for inference are loaded; the
+        pickled forests and the Keras price optimizer stay on disk.
+        """
+        for name in models or [name for name in MODEL_FILES if name not in INFERENCE_EXPORTS]:
+            self.get_model(name)
 
     def save_models(self, path: str):
-        """Save trained models"""
-        joblib.dump(self.passenger_predictor, f"{path}/passenger_model.pkl")
-        joblib.dump(self.revenue_predictor, f"{path}/revenue_model.pkl")
-        joblib.dump(self.anomaly_detector, f"{path}/anomaly_model.pkl")
-        self.price_optimizer.save(f"{path}/price_optimizer")
-
-    def load_models(self, path: str):
-        """Load trained models"""
-        self.passenger_predictor = joblib.load(f"{path}/passenger_model.pkl")
-        self.revenue_predictor = joblib.load(f"{path}/revenue_model.pkl")
-        self.anomaly_detector = joblib.load(f"{path}/anomaly_model.pkl")
-        self.price_optimizer = keras.models.load_model(f"{path}/price_optimizer")
\ No newline at end of file
+        """Save trained models (models that were never trained are skipped)"""
+        for name, filename in MODEL_FILES.items():
+            model = self.get_model(name)
+            if model is None:
+                continue
+            if name == 'price_optimizer' or name in INFERENCE_EXPORTS.values():
+                model.save(f"{path}/{filename}")
+            else:
+                joblib.dump(model, f"{path}/{filename}")
+        joblib.dump(self.feature_pipelines, f"{path}/{FEATURE_PIPELINES_FILE}")
+
+    def load_models(self, path: str, lazy: bool = False, checksums: Optional[Dict[str, str]] = None):
+        """
+        Load trained models
+
+        Args:
+            path: Directory written by save_models
+            lazy: Only load the feature pipelines now and each model on
+                its first use
+            checksums: Expected SHA-256 per file (relative to path); each
+                file is verified before it is deserialized
+        """
+        if checksums is not None:
+            verify_checksums(path, checksums, FEATURE_PIPELINES_FILE)
+        feature_pipelines = joblib.load(f"{path}/{FEATURE_PIPELINES_FILE}")
+
+        # Swapped together so predictions never mix two versions
+        with self._load_lock:
+            self.model_path = path
+            self.checksums = checksums
+            self.feature_pipelines = feature_pipelines
+            for name in MODEL_FILES:
+                setattr(self, name, None)
+
+        if not lazy:
+            self.warm_up()
+
+    def _load_model(self, name: str):
+        filename = MODEL_FILES[name]
+        if not os.path.exists(f"{self.model_path}/{filename}"):
+            return None
+        if self.checksums is not None:
+            verify_checksums(self.model_path, self.checksums, filename)
+        if name == 'price_optimizer':
+            return get_keras().models.load_model(f"{self.model_path}/{filename}")
+        if name == 'price_network':
+            return DenseNetwork.load(f"{self.model_path}/{filename}")
+        if name in ('passenger_forest', 'revenue_forest'):
+            # Memory-mapped, so worker processes share the pages
+            return PackedForest.load(f"{self.model_path}/{filename}")
+        return joblib.load(f"{self.model_path}/{filename}")
@@ -0,0 +1,156 @@
+# backend/analytics/components/model_registry.py
+
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from .ml_models import FEATURE_PIPELINES_FILE, MODEL_FILES, MLModels
+from ..utils.artifact_cache import ArtifactCache
+from ..utils.checksums import checksum_tree, verify_checksums
+
+ANALYTICS_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_REGISTRY_PATH = ANALYTICS_DIR / '.models'
+MANIFEST_FILE = 'manifest.json'
+LATEST_FILE = 'LATEST'
+
+class ModelRegistry:
+    """
+    Versioned on-disk store of trained MLModels.
+
+    Each version is a directory holding the files written by
+    MLModels.save_models plus a manifest with the SHA-256 of every file,
+    a fingerprint of the training data and free-form metadata. Versions
+    are published atomically and never modified; LATEST names the version
+    served by default.
+
+        <root>/<version>/manifest.json
+        <root>/<version>/passenger_model.pkl ...
+        <root>/LATEST
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_REGISTRY_PATH):
+        self.root = Path(root)
+
+    def publish(
+        self,
+        ml_models: MLModels,
+        training_data: Optional[pd.DataFrame] = None,
+        metadata: Optional[Dict] = None,
+        make_latest: bool = True
+    ) -> str:
+        """
+        Save models as a new version
+
+        Args:
+            ml_models: Trained models
+            training_data: Data the models were trained on; only its
+                fingerprint is stored
+            metadata: Extra manifest fields (metrics, git revision, ...)
+            make_latest: Point LATEST at the new version
+
+        Returns:
+            The new version name
+        """
+        fingerprint = ArtifactCache.fingerprint(training_data) if training_data is not None else None
+        created_at = datetime.now(timezone.utc)
+        version = created_at.strftime('%Y%m%dT%H%M%S%fZ')
+        if fingerprint:
+            version = f'{version}-{fingerprint[:8]}'
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f'.{version}.{os.getpid()}.tmp'
+        staging.mkdir()
+        try:
+            ml_models.save_models(str(staging))
+
+            checksums = {}
+            for filename in list(MODEL_FILES.values()) + [FEATURE_PIPELINES_FILE]:
+                if (staging / filename).exists():
+                    checksums.update(checksum_tree(staging, filename))
+
+            manifest = {
+                'version': version,
+                'created_at': created_at.isoformat(),
+                'data_fingerprint': fingerprint,
+                'models': [
+                    name for name, filename in MODEL_FILES.items() if (staging / filename).exists()
+                ],
+                'files': checksums,
+                'metadata': metadata or {}
+            }
+            with open(staging / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+
+            os.replace(staging, self.root / version)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if make_latest:
+            self.set_latest(version)
+        return version
+
+    def set_latest(self, version: str):
+        """Point LATEST at an existing version (written atomically)"""
+        self.manifest(version)
+        tmp_path = self.root / f'{LATEST_FILE}.{os.getpid()}.tmp'
+        tmp_path.write_text(version)
+        os.replace(tmp_path, self.root / LATEST_FILE)
+
+    def latest_version(self) -> Optional[str]:
+        """Version named by LATEST, or None for an empty registry"""
+        try:
+            return (self.root / LATEST_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def versions(self) -> List[str]:
+        """Published versions, oldest first"""
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if (path / MANIFEST_FILE).exists())
+
+    def path(self, version: str) -> Path:
+        """Directory of a published version; FileNotFoundError for any other name"""
+        if version not in self.versions():
+            raise FileNotFoundError(f"Unknown model version {version!r}")
+        return self.root / version
+
+    def manifest(self, version: str) -> Dict:
+        """Manifest of a version; FileNotFoundError if it does not exist"""
+        with open(self.path(version) / MANIFEST_FILE, encoding='utf-8') as f:
+            return json.load(f)
+
+    def verify(self, version: str):
+        """Check every file of a version against its manifest (ValueError on mismatch)"""
+        files = self.manifest(version)['files']
+        for filename in list(MODEL_FILES.values()) + [FEATURE_PIPELINES_FILE]:
+            if any(name == filename or name.startswith(filename + '/') for name in files):
+                verify_checksums(self.path(version), files, filename)
+
+    def load(
+        self,
+        ml_models: MLModels,
+        version: Optional[str] = None,
+        lazy: bool = True
+    ) -> Optional[Dict]:
+        """
+        Load a version (LATEST by default) into ml_models
+
+        With lazy loading only the feature pipelines are read now; each
+        model is read, after checking its checksum, on first use.
+
+        Returns:
+            The loaded manifest, or None when the registry is empty
+        """
+        version = version or self.latest_version()
+        if version is None:
+            return None
+        manifest = self.manifest(version)
+        ml_models.load_models(str(self.path(version)), lazy=lazy, checksums=manifest['files'])
+        return manifest
@@ -0,0 +1,138 @@
+# backend/analytics/components/route_cache.py
+
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from scipy.sparse.csgraph import dijkstra
+from ..utils.csr_graph import CSRRouteGraph
+
+class RouteCache:
+    """
+    Precomputed shortest-path trees for the busiest hub airports.
+
+    Only the predecessor arrays are kept (int32, one row per hub and
+    criterion), so a cached query is a predecessor walk. Because the route
+    graph is undirected, a tree rooted at a hub answers queries both from
+    and to that hub.
+
+    build, invalidate and lookup are serialized by ``lock``; callers that
+    need several of them to see the same trees (check, build, then look
+    up) hold the lock around the whole sequence.
+    """
+
+    def __init__(
+        self,
+        max_hubs: int = 256,
+        all_pairs_threshold: int = 1000,
+        criteria: Sequence[str] = ('distance', 'cost')
+    ):
+        """
+        Args:
+            max_hubs: Number of highest-degree airports to precompute
+            all_pairs_threshold: Precompute every airport when the graph has
+                at most this many airports
+            criteria: Optimization criteria to precompute trees for
+        """
+        self.max_hubs = max_hubs
+        self.all_pairs_threshold = all_pairs_threshold
+        self.criteria = tuple(criteria)
+        self.graph: Optional[CSRRouteGraph] = None
+        self.hub_rows: Dict[int, int] = {}
+        self.predecessors: Dict[str, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def __getstate__(self):
+        # Locks cannot be pickled (the cache travels to process-pool workers)
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    @property
+    def is_built(self) -> bool:
+        return self.graph is not None
+
+    def build(self, graph: CSRRouteGraph):
+        """Precompute shortest-path trees for the selected hubs"""
+        if graph.node_count <= self.all_pairs_threshold:
+            hubs = np.arange(graph.node_count)
+        else:
+            # Highest-degree airports first; stable so ties keep id order
+            hubs = np.sort(np.argsort(-graph.degree, kind='stable')[:self.max_hubs])
+
+        trees = {}
+        for criterion in self.criteria:
+            if len(hubs):
+                _, predecessors = dijkstra(
+                    graph.matrix(criterion),
+                    directed=True,
+                    indices=hubs,
+                    return_predecessors=True
+                )
+            else:
+                predecessors = np.empty((0, graph.node_count), dtype=np.int32)
+            trees[criterion] = predecessors.astype(np.int32, copy=False)
+
+        with self.lock:
+            self.predecessors = trees
+            self.hub_rows = {int(hub): row for row, hub in enumerate(hubs.tolist())}
+            self.graph = graph
+
+    def invalidate(self):
+        """Drop all precomputed trees, e.g. after the route network is rebuilt"""
+        with self.lock:
+            self.graph = None
+            self.hub_rows = {}
+            self.predecessors = {}
+
+    def lookup(self, origin: int, destination: int, criterion: str) -> Tuple[bool, Optional[List[int]]]:
+        """
+        Answer a query from the cached trees.
+
+        Returns:
+            (hit, path): ``hit`` is False when neither endpoint is a cached
+            hub. On a hit, ``path`` is the list of airport ids, or None when
+            the airports are not connected.
+        """
+        with self.lock:
+            if criterion not in self.predecessors:
+                self.misses += 1
+                return False, None
+
+            if origin in self.hub_rows:
+                path = self._walk(self.hub_rows[origin], origin, destination, criterion)
+            elif destination in self.hub_rows:
+                path = self._walk(self.hub_rows[destination], destination, origin, criterion)
+                path = path[::-1] if path is not None else None
+            else:
+                self.misses += 1
+                return False, None
+
+            self.hits += 1
+            return True, path
+
+    def stats(self) -> Dict:
+        """Memory and hit-rate statistics"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'built': self.is_built,
+                'airports': self.graph.node_count if self.graph is not None else 0,
+                'hubs': len(self.hub_rows),
+                'criteria': list(self.predecessors),
+                'memory_bytes': sum(array.nbytes for array in self.predecessors.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def _walk(self, row: int, source: int, target: int, criterion: str) -> Optional[List[int]]:
+        predecessors = self.predecessors[criterion][row]
+        if source != target and predecessors[target] < 0:
+            return None
+        return CSRRouteGraph.walk_predecessors(predecessors, target)
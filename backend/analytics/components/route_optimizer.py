@@ -1,32 +1,105 @@
 # backend/analytics/components/route_optimizer.py
 
+import heapq
 import networkx as nx
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
-from ..utils.geo_utils import calculate_distance
+from typing import Dict, List, Optional, Tuple
+from ..utils.geo_utils import haversine_distances
+from ..utils.csr_graph import CSRRouteGraph
+from .route_cache import RouteCache
+
+# Edge attribute holding each optimization criterion in the networkx graph
+CRITERION_ATTRIBUTES = {
+    'distance': 'weight',
+    'cost': 'cost'
+}
 
 class RouteOptimizer:
-    def __init__(self):
+    def __init__(
+        self,
+        engine: str = 'networkx',
+        cache_hubs: Optional[int] = None,
+        cache_all_pairs_threshold: int = 1000
+    ):
+        """
+        Args:
+            engine: 'networkx' for the dict-based graph or 'csr' for the
+                compact NumPy CSR engine
+            cache_hubs: Precompute shortest-path trees for this many of the
+                busiest airports; None disables the route cache
+            cache_all_pairs_threshold: Precompute every airport instead when
+                the network has at most this many airports
+        """
+        if engine not in ('networkx', 'csr'):
+            raise ValueError(f"Unknown route engine: {engine}")
+
+        self.engine = engine
         self.route_graph = nx.Graph()
+        self.csr_graph: Optional[CSRRouteGraph] = None
         self.airports_data = {}
+        self.route_cache = (
+            RouteCache(max_hubs=cache_hubs, all_pairs_threshold=cache_all_pairs_threshold)
+            if cache_hubs is not None else None
+        )
 
     def build_route_network(self, routes_data: pd.DataFrame, airports_data: pd.DataFrame):
-        """Build network graph from routes and airports data"""
+        """
+        Build network graph from routes and airports data
+
+        Both engines rebuild from scratch, so routes missing from a later
+        call are dropped rather than merged with the previous network.
+        """
         self.airports_data = airports_data.set_index('code').to_dict('index')
-        
-        for _, route in routes_data.iterrows():
-            distance = calculate_distance(
-                self.airports_data[route['origin']]['coordinates'],
-                self.airports_data[route['destination']]['coordinates']
+
+        # Distances for all routes in one vectorized pass
+        airport_codes = pd.Index(airports_data['code'])
+        coordinates = np.array(airports_data['coordinates'].tolist(), dtype=np.float64).reshape(-1, 2)
+        origin_rows = airport_codes.get_indexer(routes_data['origin'])
+        destination_rows = airport_codes.get_indexer(routes_data['destination'])
+        if (origin_rows < 0).any() or (destination_rows < 0).any():
+            unknown = set(routes_data['origin'][origin_rows < 0]) | set(routes_data['destination'][destination_rows < 0])
+            raise KeyError(f"Airports missing from airports_data: {sorted(unknown)}")
+
+        distances = haversine_distances(
+            coordinates[origin_rows],
+            coordinates[destination_rows]
+        ).tolist()
+
+        route_graph = nx.Graph()
+        csr_graph = None
+        if self.engine == 'csr':
+            csr_graph = CSRRouteGraph.from_edges(
+                routes_data['origin'].to_numpy(),
+                routes_data['destination'].to_numpy(),
+                distances,
+                routes_data['base_cost'].to_numpy()
             )
-            
-            self.route_graph.add_edge(
-                route['origin'],
-                route['destination'],
-                weight=distance,
-                cost=route['base_cost']
+        else:
+            route_graph.add_edges_from(
+                (origin, destination, {'weight': distance, 'cost': cost})
+                for origin, destination, distance, cost in zip(
+                    routes_data['origin'],
+                    routes_data['destination'],
+                    distances,
+                    routes_data['base_cost']
+                )
             )
 
+        self._install_network(route_graph, csr_graph)
+
+    def _install_network(self, route_graph: nx.Graph, csr_graph: Optional[CSRRouteGraph]):
+        """Swap in a rebuilt network and drop the route cache trees of the old one"""
+        if self.route_cache is None:
+            self.route_graph, self.csr_graph = route_graph, csr_graph
+            return
+
+        # Under the cache lock, so no query builds trees from the old network
+        # after they have been invalidated
+        with self.route_cache.lock:
+            self.route_graph, self.csr_graph = route_graph, csr_graph
+            self.route_cache.invalidate()
+
     def find_optimal_route(
         self, 
         origin: str, 
@@ -44,12 +117,23 @@ class RouteOptimizer:
         Returns:
             Dict containing path, distance, cost, and estimated time
         """
+        if optimization_criterion not in CRITERION_ATTRIBUTES:
+            raise ValueError(f"Unknown optimization criterion: {optimization_criterion}")
+
+        if self.route_cache is not None:
+            hit, route = self._find_cached_route(origin, destination, optimization_criterion)
+            if hit:
+                return route
+
+        if self.engine == 'csr':
+            return self._find_optimal_route_csr(origin, destination, optimization_criterion)
+
         try:
             path = nx.shortest_path(
                 self.route_graph, 
                 origin, 
                 destination, 
-                weight=optimization_criterion
+                weight=CRITERION_ATTRIBUTES[optimization_criterion]
             )
             
             total_distance = sum(
@@ -62,15 +146,7 @@ class RouteOptimizer:
                 for i in range(len(path)-1)
             )
             
-            estimated_time = self.calculate_flight_time(total_distance)
-            
-            return {
-                'path': path,
-                'total_distance': total_distance,
-                'total_cost': total_cost,
-                'estimated_time': estimated_time,
-                'stops': len(path) - 2 if len(path) > 2 else 0
-            }
+            return self._route_summary(path, total_distance, total_cost)
             
         except nx.NetworkXNoPath:
             return None
@@ -79,37 +155,369 @@ class RouteOptimizer:
         self, 
         origin: str, 
         destination: str, 
-        max_alternatives: int = 3
+        max_alternatives: int = 3,
+        optimization_criterion: str = 'distance',
+        max_stops: Optional[int] = None,
+        max_detour: Optional[float] = None
     ) -> List[Dict]:
-        """Find alternative routes between airports"""
+        """
+        Find alternative routes between airports
+
+        Args:
+            origin: Origin airport code
+            destination: Destination airport code
+            max_alternatives: Maximum number of routes to return
+            optimization_criterion: 'distance' or 'cost', ranked as in
+                find_optimal_route
+            max_stops: Skip routes with more intermediate stops; the
+                search itself is bounded, so paths longer than this are
+                never enumerated
+            max_detour: Stop once routes exceed this multiple of the best
+                route's distance or cost
+
+        Returns:
+            List of route dicts in order of increasing distance or cost
+        """
+        if optimization_criterion not in CRITERION_ATTRIBUTES:
+            raise ValueError(f"Unknown optimization criterion: {optimization_criterion}")
+
+        if self.engine == 'csr':
+            return self._find_alternative_routes_csr(
+                origin, destination, max_alternatives, optimization_criterion, max_stops, max_detour
+            )
+
+        if max_stops is not None:
+            return self._find_stop_limited_routes(
+                origin, destination, max_alternatives, optimization_criterion, max_stops, max_detour
+            )
+
         routes = []
-        for path in nx.shortest_simple_paths(
-            self.route_graph, 
-            origin, 
-            destination
-        ):
-            if len(routes) >= max_alternatives:
-                break
+        max_weight = None
+        try:
+            for path in nx.shortest_simple_paths(
+                self.route_graph, 
+                origin, 
+                destination,
+                weight=CRITERION_ATTRIBUTES[optimization_criterion]
+            ):
+                if len(routes) >= max_alternatives:
+                    break
+                    
+                total_distance = sum(
+                    self.route_graph[path[i]][path[i+1]]['weight'] 
+                    for i in range(len(path)-1)
+                )
                 
-            total_distance = sum(
-                self.route_graph[path[i]][path[i+1]]['weight'] 
-                for i in range(len(path)-1)
-            )
+                total_cost = sum(
+                    self.route_graph[path[i]][path[i+1]]['cost'] 
+                    for i in range(len(path)-1)
+                )
+
+                weight = total_distance if optimization_criterion == 'distance' else total_cost
+                if max_weight is None and max_detour is not None:
+                    max_weight = weight * max_detour
+                if max_weight is not None and weight > max_weight:
+                    break
+                
+                routes.append({
+                    'path': path,
+                    'total_distance': total_distance,
+                    'total_cost': total_cost,
+                    'stops': len(path) - 2
+                })
+        except nx.NetworkXNoPath:
+            pass
             
-            total_cost = sum(
-                self.route_graph[path[i]][path[i+1]]['cost'] 
-                for i in range(len(path)-1)
+        return routes
+
+    def _find_stop_limited_routes(
+        self,
+        origin: str,
+        destination: str,
+        max_alternatives: int,
+        optimization_criterion: str,
+        max_stops: int,
+        max_detour: Optional[float]
+    ) -> List[Dict]:
+        """
+        find_alternative_routes on the networkx engine under a stop limit
+
+        shortest_simple_paths has no hop bound and would enumerate every
+        longer path before giving up, so the simple paths with at most
+        max_stops + 1 legs are enumerated directly (all_simple_paths with
+        a cutoff) and the lightest ones kept. As on the CSR engine, the
+        detour limit is relative to the unrestricted best route.
+        """
+        attribute = CRITERION_ATTRIBUTES[optimization_criterion]
+        try:
+            best = nx.shortest_path_length(self.route_graph, origin, destination, weight=attribute)
+        except nx.NetworkXNoPath:
+            return []
+        max_weight = best * max_detour if max_detour is not None else float('inf')
+
+        if origin == destination:
+            paths = [[origin]]
+        else:
+            paths = nx.all_simple_paths(self.route_graph, origin, destination, cutoff=max_stops + 1)
+
+        candidates = []
+        for path in paths:
+            legs = [self.route_graph[path[i]][path[i + 1]] for i in range(len(path) - 1)]
+            total_distance = sum(leg['weight'] for leg in legs)
+            total_cost = sum(leg['cost'] for leg in legs)
+            weight = total_distance if optimization_criterion == 'distance' else total_cost
+            if weight <= max_weight:
+                candidates.append((weight, len(path), path, total_distance, total_cost))
+
+        return [
+            {
+                'path': path,
+                'total_distance': total_distance,
+                'total_cost': total_cost,
+                'stops': len(path) - 2
+            }
+            for _, _, path, total_distance, total_cost in heapq.nsmallest(
+                max_alternatives, candidates, key=lambda candidate: candidate[:2]
             )
-            
+        ]
+
+    def find_pareto_routes(
+        self,
+        origin: str,
+        destination: str,
+        max_stops: int = 2,
+        max_cost: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Find every Pareto-optimal route between two airports in one search
+
+        A multi-criteria label-setting search over (distance, cost, stops).
+        Estimated time is derived from distance by calculate_flight_time, so
+        it is reported for each route but never changes dominance.
+
+        Args:
+            origin: Origin airport code
+            destination: Destination airport code
+            max_stops: Discard routes with more intermediate stops
+            max_cost: Discard routes costing more than this
+
+        Returns:
+            List of route dicts (as returned by find_optimal_route), sorted
+            by distance
+        """
+        source, target, neighbors, to_code = self._search_adapter(origin, destination)
+        max_hops = max_stops + 1
+
+        # Label i: (node, parent label, distance, cost, hops)
+        labels = [(source, -1, 0.0, 0.0, 0)]
+        alive = [True]
+        node_labels = {source: [0]}
+        queue = [(0.0, 0.0, 0, 0)]
+
+        def dominated(node, distance, cost, hops):
+            return any(
+                alive[i] and labels[i][2] <= distance and labels[i][3] <= cost and labels[i][4] <= hops
+                for i in node_labels.get(node, ())
+            )
+
+        while queue:
+            _, _, _, label_id = heapq.heappop(queue)
+            if not alive[label_id]:
+                continue
+
+            node, _, distance, cost, hops = labels[label_id]
+            if node == target or hops >= max_hops:
+                continue
+            if dominated(target, distance, cost, hops + 1):
+                continue
+
+            for neighbor, edge_distance, edge_cost in neighbors(node):
+                new_distance = distance + edge_distance
+                new_cost = cost + edge_cost
+                new_hops = hops + 1
+
+                if max_cost is not None and new_cost > max_cost:
+                    continue
+                if dominated(neighbor, new_distance, new_cost, new_hops):
+                    continue
+                if neighbor != target and dominated(target, new_distance, new_cost, new_hops):
+                    continue
+
+                for i in node_labels.get(neighbor, ()):
+                    if (alive[i] and new_distance <= labels[i][2] and new_cost <= labels[i][3]
+                            and new_hops <= labels[i][4]):
+                        alive[i] = False
+
+                labels.append((neighbor, label_id, new_distance, new_cost, new_hops))
+                alive.append(True)
+                node_labels.setdefault(neighbor, []).append(len(labels) - 1)
+                heapq.heappush(queue, (new_distance, new_cost, new_hops, len(labels) - 1))
+
+        routes = []
+        for label_id in node_labels.get(target, ()):
+            if not alive[label_id]:
+                continue
+
+            path = []
+            i = label_id
+            while i >= 0:
+                path.append(to_code(labels[i][0]))
+                i = labels[i][1]
+
+            _, _, total_distance, total_cost, _ = labels[label_id]
+            routes.append(self._route_summary(path[::-1], total_distance, total_cost))
+
+        return sorted(routes, key=lambda route: (route['total_distance'], route['total_cost'], route['stops']))
+
+    def route_cache_stats(self) -> Dict:
+        """Memory and hit-rate statistics of the precomputed route cache"""
+        if self.route_cache is None:
+            return {'enabled': False}
+
+        with self.route_cache.lock:
+            stats = self.route_cache.stats()
+            graph = self.route_cache.graph
+        stats['enabled'] = True
+        stats['graph_bytes'] = graph.nbytes if graph is not None and graph is not self.csr_graph else 0
+        return stats
+
+    def _find_cached_route(
+        self,
+        origin: str,
+        destination: str,
+        optimization_criterion: str
+    ) -> Tuple[bool, Optional[Dict]]:
+        """
+        Answer a query from the route cache, building it on first use
+
+        The cache lock is held from the build check to the lookup, so
+        concurrent first queries build the trees once and a rebuild of the
+        network cannot swap the trees out between the two.
+        """
+        with self.route_cache.lock:
+            if not self.route_cache.is_built:
+                self.route_cache.build(
+                    self.csr_graph if self.engine == 'csr' and self.csr_graph is not None
+                    else CSRRouteGraph.from_networkx(self.route_graph)
+                )
+
+            graph = self.route_cache.graph
+            if not (graph.has_airport(origin) and graph.has_airport(destination)):
+                return False, None
+
+            hit, path = self.route_cache.lookup(
+                graph.index_of(origin),
+                graph.index_of(destination),
+                optimization_criterion
+            )
+
+        if not hit or path is None:
+            return hit, None
+
+        total_distance, total_cost = graph.path_totals(path)
+        return True, self._route_summary(graph.path_codes(path), total_distance, total_cost)
+
+    def _find_optimal_route_csr(
+        self,
+        origin: str,
+        destination: str,
+        optimization_criterion: str
+    ) -> Optional[Dict]:
+        """find_optimal_route on the CSR engine"""
+        source, target = self._csr_endpoints(origin, destination)
+        path = self.csr_graph.shortest_path(source, target, optimization_criterion)
+        if path is None:
+            return None
+
+        total_distance, total_cost = self.csr_graph.path_totals(path)
+        return self._route_summary(self.csr_graph.path_codes(path), total_distance, total_cost)
+
+    def _find_alternative_routes_csr(
+        self,
+        origin: str,
+        destination: str,
+        max_alternatives: int,
+        optimization_criterion: str,
+        max_stops: Optional[int],
+        max_detour: Optional[float]
+    ) -> List[Dict]:
+        """find_alternative_routes on the CSR engine"""
+        source, target = self._csr_endpoints(origin, destination)
+
+        routes = []
+        for path in self.csr_graph.k_shortest_paths(
+            source,
+            target,
+            optimization_criterion,
+            max_hops=max_stops + 1 if max_stops is not None else None,
+            max_detour=max_detour
+        ):
+            if len(routes) >= max_alternatives:
+                break
+
+            total_distance, total_cost = self.csr_graph.path_totals(path)
             routes.append({
-                'path': path,
+                'path': self.csr_graph.path_codes(path),
                 'total_distance': total_distance,
                 'total_cost': total_cost,
                 'stops': len(path) - 2
             })
-            
+
         return routes
 
+    def _search_adapter(self, origin: str, destination: str):
+        """
+        Engine-independent view of the graph for custom searches
+
+        Returns (source, target, neighbors, to_code) where neighbors(node)
+        yields (neighbor, distance, cost) and to_code maps a node back to
+        its airport code.
+        """
+        if self.engine == 'csr':
+            graph = self.csr_graph
+            source, target = self._csr_endpoints(origin, destination)
+
+            def neighbors(node):
+                edges = slice(graph.indptr[node], graph.indptr[node + 1])
+                return zip(
+                    graph.indices[edges].tolist(),
+                    graph.distance[edges].tolist(),
+                    graph.cost[edges].tolist()
+                )
+
+            return source, target, neighbors, lambda node: graph.codes[node]
+
+        for code in (origin, destination):
+            if code not in self.route_graph:
+                raise nx.NodeNotFound(f"Node {code} is not in G")
+
+        def neighbors(node):
+            return (
+                (neighbor, data['weight'], data['cost'])
+                for neighbor, data in self.route_graph[node].items()
+            )
+
+        return origin, destination, neighbors, lambda node: node
+
+    def _csr_endpoints(self, origin: str, destination: str):
+        """Resolve airport codes to CSR ids, mirroring networkx's NodeNotFound"""
+        if self.csr_graph is None:
+            raise nx.NodeNotFound(f"Source {origin} is not in G")
+        for code in (origin, destination):
+            if not self.csr_graph.has_airport(code):
+                raise nx.NodeNotFound(f"Node {code} is not in G")
+        return self.csr_graph.index_of(origin), self.csr_graph.index_of(destination)
+
+    def _route_summary(self, path: List[str], total_distance: float, total_cost: float) -> Dict:
+        """Build the result dict returned by find_optimal_route"""
+        return {
+            'path': path,
+            'total_distance': total_distance,
+            'total_cost': total_cost,
+            'estimated_time': self.calculate_flight_time(total_distance),
+            'stops': len(path) - 2 if len(path) > 2 else 0
+        }
+
     def calculate_flight_time(self, distance: float) -> float:
         """Calculate estimated flight time based on distance"""
         average_speed = 800  # km/h
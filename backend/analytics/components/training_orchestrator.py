@@ -0,0 +1,167 @@
+# backend/analytics/components/training_orchestrator.py
+
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .ml_models import ANOMALY_FEATURES, INFERENCE_EXPORTS, TARGET_COLUMNS, MLModels, fit_model, get_keras
+from ..utils.feature_pipeline import FeaturePipeline
+
+# Target column of each model (None: unsupervised)
+MODEL_TARGETS = {
+    'passenger_predictor': 'passenger_count',
+    'revenue_predictor': 'total_revenue',
+    'anomaly_detector': None,
+    'price_optimizer': 'optimal_price'
+}
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    # VmHWM belongs to this process image; ru_maxrss can carry over the
+    # parent's peak across fork/exec
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _train_model(name: str, X, y, n_jobs: int):
+    """Fit one model and measure it; runs in a pool worker"""
+    start_peak = _peak_rss_mb()
+    start = time.perf_counter()
+    model = fit_model(name, X, y, n_jobs)
+    wall_time = time.perf_counter() - start
+    peak = _peak_rss_mb()
+
+    if name == 'price_optimizer':
+        # Ship Keras models as architecture plus weights rather than pickles
+        model = (model.to_json(), model.get_weights())
+
+    return model, {
+        'wall_time_s': wall_time,
+        'peak_memory_mb': peak,
+        'memory_growth_mb': peak - start_peak
+    }
+
+class TrainingOrchestrator:
+    """
+    Trains the independent MLModels concurrently from one feature pass.
+
+    The feature pipeline is fitted and applied once and shared by the
+    passenger, revenue and price models. Each model then trains in its own
+    worker with an equal share of the CPU cores for the tree ensembles.
+    The seeded tree ensembles grow the same trees as sequential training
+    whatever their n_jobs; the Keras price optimizer is unseeded and
+    differs from run to run either way.
+
+    With the default process backend every model gets a fresh worker
+    process, so its reported peak memory is that worker's peak RSS. With
+    the thread backend all models share this process and the memory
+    figures are process-wide.
+    """
+
+    def __init__(
+        self,
+        ml_models: MLModels,
+        max_workers: Optional[int] = None,
+        backend: str = 'process'
+    ):
+        """
+        Args:
+            ml_models: Receives the trained models and feature pipelines
+            max_workers: Models trained at the same time (default: all)
+            backend: 'process' or 'thread'
+        """
+        if backend not in ('process', 'thread'):
+            raise ValueError(f"Unknown backend {backend!r}; expected 'process' or 'thread'")
+        self.ml_models = ml_models
+        self.max_workers = max_workers
+        self.backend = backend
+
+    def train_all(self, data: pd.DataFrame, models: Optional[List[str]] = None) -> Dict:
+        """
+        Train models concurrently and install them on ml_models
+
+        Args:
+            data: Training data
+            models: Models to train (default: every model whose columns
+                are present in data)
+
+        Returns:
+            Report with backend, feature_time_s, wall_time_s and per-model
+            wall_time_s, peak_memory_mb and memory_growth_mb
+        """
+        models = models or self.trainable_models(data)
+        start = time.perf_counter()
+
+        pipeline = FeaturePipeline(exclude=TARGET_COLUMNS)
+        X = pipeline.fit_transform(data)
+        feature_time = time.perf_counter() - start
+
+        workers = min(self.max_workers or len(models), len(models))
+        n_jobs = max(1, (os.cpu_count() or 1) // workers)
+
+        with self._executor(workers) as executor:
+            futures = {}
+            for name in models:
+                target = MODEL_TARGETS[name]
+                futures[name] = executor.submit(
+                    _train_model,
+                    name,
+                    data[ANOMALY_FEATURES] if name == 'anomaly_detector' else X,
+                    data[target].to_numpy() if target else None,
+                    n_jobs
+                )
+            results = {name: future.result() for name, future in futures.items()}
+
+        report = {}
+        for name, (model, stats) in results.items():
+            if name == 'price_optimizer' and isinstance(model, tuple):
+                architecture, weights = model
+                model = get_keras().models.model_from_json(architecture)
+                model.set_weights(weights)
+            setattr(self.ml_models, name, model)
+            if name in INFERENCE_EXPORTS:
+                self.ml_models.export_inference_model(name)
+            if name != 'anomaly_detector':
+                self.ml_models.feature_pipelines[name] = pipeline
+            report[name] = stats
+
+        return {
+            'backend': self.backend,
+            'feature_time_s': feature_time,
+            'wall_time_s': time.perf_counter() - start,
+            'models': report
+        }
+
+    @staticmethod
+    def trainable_models(data: pd.DataFrame) -> List[str]:
+        """Models whose required columns are all present in data"""
+        columns = set(data.columns)
+        trainable = []
+        for name, target in MODEL_TARGETS.items():
+            required = set(ANOMALY_FEATURES) if name == 'anomaly_detector' else {target}
+            if required <= columns:
+                trainable.append(name)
+        return trainable
+
+    def _executor(self, workers: int):
+        if self.backend == 'thread':
+            return ThreadPoolExecutor(workers)
+        # A fresh spawned process per model keeps per-model memory figures
+        # separate and avoids forking a process that may hold thread pools
+        options = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+        return ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            **options
+        )
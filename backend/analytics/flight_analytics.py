@@ -1,17 +1,19 @@
 import pandas as pd
 import numpy as np
 import networkx as nx
-import folium
 from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier, IsolationForest
 from sklearn.model_selection import train_test_split
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import tensorflow as tf
-from tensorflow import keras
 import json
 import warnings
+from .utils.airport_index import get_airport_index
+from .utils.dataset_loader import BOOKING_SCHEMA, FLIGHT_SCHEMA, HOTEL_SCHEMA, DatasetLoader
+from .components.map_visualizer import MapVisualizer
+from .components.ml_models import get_keras
+from .utils.dense_network import DenseNetwork
 warnings.filterwarnings('ignore')
 
 class FlightAnalyticsSystem:
@@ -22,48 +24,148 @@ class FlightAnalyticsSystem:
         self.hotel_data = None
         self.passenger_predictor = None
         self.revenue_predictor = None
+        self.prediction_scaler = None
+        self.pricing_scaler = None
+        self.anomaly_detector = None
+        self.map_visualizer = None
         
-    def load_data(self, flight_data_path, booking_data_path, hotel_data_path):
-        """Load and preprocess all necessary data"""
-        self.flight_data = pd.read_csv(flight_data_path)
-        self.booking_data = pd.read_csv(booking_data_path)
-        self.hotel_data = pd.read_csv(hotel_data_path)
-        
+    def load_data(self, flight_data_path, booking_data_path, hotel_data_path,
+                  chunksize=100_000, cache_format='feather'):
+        """
+        Load and preprocess all necessary data
+
+        CSVs are read in chunks into compact dtypes (categorical airport
+        codes and payment methods, parsed dates) and, unless cache_format
+        is None, cached as Feather or Parquet for faster reloads.
+        """
+        loader = DatasetLoader(chunksize=chunksize, cache_format=cache_format)
+        self.flight_data = loader.load(flight_data_path, FLIGHT_SCHEMA)
+        self.booking_data = loader.load(booking_data_path, BOOKING_SCHEMA)
+        self.hotel_data = loader.load(hotel_data_path, HOTEL_SCHEMA)
+
         # Create network graph from airports and routes
-        for _, flight in self.flight_data.iterrows():
-            self.graph.add_edge(
-                flight['origin_airport'],
-                flight['destination_airport'],
-                weight=flight['distance'],
-                cost=flight['base_cost']
+        self.build_route_graph(self.flight_data)
+
+    def build_route_graph(self, flight_data):
+        """Build the route network in bulk from flight column arrays"""
+        routes = self.aggregate_routes(
+            flight_data['origin_airport'].to_numpy(),
+            flight_data['destination_airport'].to_numpy(),
+            flight_data['distance'].to_numpy(dtype=np.float64),
+            flight_data['base_cost'].to_numpy(dtype=np.float64)
+        )
+
+        self.graph.add_edges_from(
+            (origin, destination, {'weight': distance, 'cost': cost, 'frequency': frequency})
+            for origin, destination, distance, cost, frequency in zip(
+                routes['origin'].tolist(),
+                routes['destination'].tolist(),
+                routes['distance'].tolist(),
+                routes['cost'].tolist(),
+                routes['frequency'].tolist()
             )
+        )
+        return self.graph
 
-    def visualize_route_network(self):
-        """Create an interactive world map with flight routes"""
-        world_map = folium.Map(location=[0, 0], zoom_start=2)
-        
-        # Add airports as markers
-        for airport in self.flight_data['origin_airport'].unique():
-            coords = self.get_airport_coordinates(airport)
-            folium.CircleMarker(
-                location=coords,
-                radius=5,
-                color='red',
-                fill=True
-            ).add_to(world_map)
-            
-        # Add flight routes as lines
-        for _, flight in self.flight_data.iterrows():
-            origin_coords = self.get_airport_coordinates(flight['origin_airport'])
-            dest_coords = self.get_airport_coordinates(flight['destination_airport'])
-            folium.PolyLine(
-                locations=[origin_coords, dest_coords],
-                weight=2,
-                color='blue',
-                opacity=0.6
-            ).add_to(world_map)
-            
-        return world_map
+    @staticmethod
+    def aggregate_routes(origins, destinations, distances, costs):
+        """
+        Collapse duplicate airport pairs into one route each.
+
+        The graph is undirected, so A->B and B->A rows aggregate into the
+        same route. Each route keeps its minimum distance and cost and the
+        number of flight rows that served it. Rows missing either airport
+        code are dropped.
+        """
+        known = ~(pd.isna(origins) | pd.isna(destinations))
+        if not known.all():
+            origins, destinations = origins[known], destinations[known]
+            distances, costs = distances[known], costs[known]
+
+        n = len(origins)
+        if n == 0:
+            empty = np.array([], dtype=object)
+            return {
+                'origin': empty,
+                'destination': empty,
+                'distance': np.array([]),
+                'cost': np.array([]),
+                'frequency': np.array([], dtype=np.int64)
+            }
+
+        codes, airports = pd.factorize(np.concatenate([origins, destinations]))
+        u, v = codes[:n], codes[n:]
+        lo = np.minimum(u, v).astype(np.int64)
+        hi = np.maximum(u, v).astype(np.int64)
+        keys = lo * len(airports) + hi
+
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        first = order[starts]
+
+        return {
+            'origin': airports[lo[first]],
+            'destination': airports[hi[first]],
+            'distance': np.minimum.reduceat(distances[order], starts),
+            'cost': np.minimum.reduceat(costs[order], starts),
+            'frequency': np.diff(np.r_[starts, n])
+        }
+
+    def visualize_route_network(self, filename=None, **render_options):
+        """
+        Create an interactive world map with flight routes
+
+        Delegates to save_route_network_map, so the map is rendered from
+        the aggregated route graph through the artifact cache.
+
+        Returns:
+            Path of the cached HTML page
+        """
+        return self.save_route_network_map(filename, **render_options)
+
+    def save_route_network_map(self, filename=None, **render_options):
+        """
+        Render the route network map through the on-disk artifact cache.
+
+        Routes are taken from the aggregated route graph, with the number
+        of flights per airport pair as traffic density. Repeat calls on an
+        unchanged network are served from the cache.
+
+        Args:
+            filename: Optionally copy the rendered page to this path
+            **render_options: Passed to MapVisualizer.render_network_map
+
+        Returns:
+            Path of the cached HTML page
+        """
+        index = get_airport_index()
+        if self.map_visualizer is None:
+            self.map_visualizer = MapVisualizer()
+
+        edges = list(self.graph.edges(data='frequency', default=1))
+        origins = index.coordinates([origin for origin, _, _ in edges]).reshape(-1, 2)
+        destinations = index.coordinates([destination for _, destination, _ in edges]).reshape(-1, 2)
+        routes_data = pd.DataFrame({
+            'origin_lat': origins[:, 0],
+            'origin_lon': origins[:, 1],
+            'dest_lat': destinations[:, 0],
+            'dest_lon': destinations[:, 1],
+            'traffic_density': [frequency for _, _, frequency in edges]
+        }).dropna()
+
+        codes = sorted(code for code in self.graph.nodes if code in index)
+        airports = [index.get_airport(code) for code in codes]
+        airports_data = pd.DataFrame({
+            'code': codes,
+            'name': [airport['name'] for airport in airports],
+            'latitude': [airport['lat'] for airport in airports],
+            'longitude': [airport['lon'] for airport in airports]
+        })
+
+        return self.map_visualizer.render_network_map(
+            airports_data, routes_data, filename=filename, **render_options
+        )
 
     def find_optimal_route(self, origin, destination):
         """Calculate optimal route using Dijkstra's algorithm"""
@@ -93,45 +195,97 @@ class FlightAnalyticsSystem:
 
     def train_prediction_models(self):
         """Train ML models for passenger and revenue prediction"""
-        # Prepare features for passenger prediction
-        X_passengers = self.prepare_prediction_features(self.booking_data)
-        y_passengers = self.booking_data['passenger_count']
-        
+        # Both models share the same calendar features; the scaler is
+        # refitted here and reused for forecasting
+        X = self.prepare_prediction_features(self.booking_data, fit=True)
+
         # Train passenger prediction model
         self.passenger_predictor = RandomForestRegressor(n_estimators=100)
-        self.passenger_predictor.fit(X_passengers, y_passengers)
-        
-        # Prepare features for revenue prediction
-        X_revenue = self.prepare_prediction_features(self.booking_data)
-        y_revenue = self.booking_data['total_revenue']
-        
+        self.passenger_predictor.fit(X, self.booking_data['passenger_count'])
+
         # Train revenue prediction model
         self.revenue_predictor = RandomForestRegressor(n_estimators=100)
-        self.revenue_predictor.fit(X_revenue, y_revenue)
+        self.revenue_predictor.fit(X, self.booking_data['total_revenue'])
 
-    def predict_future_metrics(self, days_ahead=30):
-        """Predict future passengers and revenue"""
-        future_dates = pd.date_range(
-            start=datetime.now(),
-            periods=days_ahead
-        )
-        
-        predictions = []
-        for date in future_dates:
-            features = self.prepare_prediction_features(
-                pd.DataFrame({'date': [date]})
-            )
-            
-            passenger_pred = self.passenger_predictor.predict(features)[0]
-            revenue_pred = self.revenue_predictor.predict(features)[0]
-            
-            predictions.append({
-                'date': date,
-                'predicted_passengers': passenger_pred,
-                'predicted_revenue': revenue_pred
+    def predict_future_metrics(self, days_ahead=30, routes=None, start=None):
+        """
+        Predict future passengers and revenue for a whole horizon at once.
+
+        Calendar features only take a few dozen distinct values (weekday x
+        month), so each model runs one batched predict over the distinct
+        feature rows and the results are broadcast to every date and route.
+
+        Args:
+            days_ahead: Number of days to forecast, or a sequence of day
+                offsets (horizons) from start; rows follow the sequence's
+                order, repeats included
+            routes: Optional (origin, destination) pairs; network forecasts
+                are split by each route's historical share of bookings
+            start: First forecast date (defaults to now)
+
+        Returns:
+            DataFrame with date, predicted_passengers and predicted_revenue,
+            plus origin and destination (one row per date and route) when
+            routes are given
+        """
+        start = pd.Timestamp(start if start is not None else datetime.now())
+        offsets = np.arange(days_ahead) if np.isscalar(days_ahead) else np.asarray(days_ahead).ravel()
+        future_dates = pd.DatetimeIndex(start + pd.to_timedelta(offsets, unit='D'))
+
+        calendar = self.calendar_features(future_dates)
+        distinct, inverse = np.unique(calendar, axis=0, return_inverse=True)
+        X = self.scale_calendar_features(distinct)
+        passengers = self.passenger_predictor.predict(X)[inverse.ravel()]
+        revenue = self.revenue_predictor.predict(X)[inverse.ravel()]
+
+        if routes is None:
+            return pd.DataFrame({
+                'date': future_dates,
+                'predicted_passengers': passengers,
+                'predicted_revenue': revenue
             })
-            
-        return pd.DataFrame(predictions)
+
+        shares = self.route_shares(routes)
+        n_dates, n_routes = len(future_dates), len(shares)
+        return pd.DataFrame({
+            'date': np.repeat(future_dates.to_numpy(), n_routes),
+            'origin': np.tile(shares['origin'].to_numpy(), n_dates),
+            'destination': np.tile(shares['destination'].to_numpy(), n_dates),
+            'predicted_passengers': np.outer(passengers, shares['passenger_share'].to_numpy()).ravel(),
+            'predicted_revenue': np.outer(revenue, shares['revenue_share'].to_numpy()).ravel()
+        })
+
+    @staticmethod
+    def calendar_features(dates):
+        """(n, 3) day_of_week, month, is_weekend matrix for a column of dates"""
+        dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        day_of_week = dates.dayofweek.to_numpy()
+        return np.column_stack([
+            day_of_week,
+            dates.month.to_numpy(),
+            (day_of_week >= 5).astype(int)
+        ])
+
+    # Booking columns identifying a route
+    ROUTE_COLUMNS = ['origin_airport', 'destination_airport']
+
+    def route_shares(self, routes):
+        """
+        Historical share of passengers and revenue for each route.
+
+        Routes missing from the booking data get a zero share.
+        """
+        routes = pd.DataFrame(list(routes), columns=['origin', 'destination'])
+        totals = self.booking_data.groupby(self.ROUTE_COLUMNS, observed=True)[
+            ['passenger_count', 'total_revenue']
+        ].sum()
+        route_totals = totals.reindex(pd.MultiIndex.from_frame(routes), fill_value=0)
+        return pd.DataFrame({
+            'origin': routes['origin'],
+            'destination': routes['destination'],
+            'passenger_share': route_totals['passenger_count'].to_numpy() / totals['passenger_count'].sum(),
+            'revenue_share': route_totals['total_revenue'].to_numpy() / totals['total_revenue'].sum()
+        })
 
     def generate_analytics_dashboard(self):
         """Generate real-time analytics dashboard"""
@@ -152,7 +306,7 @@ class FlightAnalyticsSystem:
         
         # Hotel booking analysis
         hotel_preference = px.bar(
-            self.hotel_data.groupby('hotel_name')['bookings'].sum().reset_index(),
+            self.hotel_data.groupby('hotel_name', observed=True)['bookings'].sum().reset_index(),
             x='hotel_name',
             y='bookings',
             title='Popular Hotels'
@@ -175,9 +329,7 @@ class FlightAnalyticsSystem:
 
     def analyze_route_profitability(self):
         """Analyze profitability of different routes"""
-        route_stats = self.booking_data.groupby(
-            ['origin_airport', 'destination_airport']
-        ).agg({
+        route_stats = self.booking_data.groupby(self.ROUTE_COLUMNS, observed=True).agg({
             'total_revenue': 'sum',
             'total_cost': 'sum',
             'passenger_count': 'sum'
@@ -190,26 +342,46 @@ class FlightAnalyticsSystem:
         
         return route_stats
 
-    def detect_anomalies(self):
-        """Detect anomalies in booking patterns using Isolation Forest"""
-        iso_forest = IsolationForest(contamination=0.1)
-        
-        features = self.booking_data[[
-            'passenger_count', 
-            'total_revenue', 
-            'total_cost'
-        ]]
-        
-        anomalies = iso_forest.fit_predict(features)
+    ANOMALY_FEATURES = ['passenger_count', 'total_revenue', 'total_cost']
+
+    def detect_anomalies(self, bookings=None, refit=False):
+        """
+        Detect anomalies in booking patterns using Isolation Forest
+
+        The forest is fitted on booking_data once (or again with refit) and
+        reused, so new bookings are scored without rescoring the table.
+
+        Args:
+            bookings: Bookings to score (default: all of booking_data)
+            refit: Refit the forest on the current booking_data
+        """
+        if self.anomaly_detector is None or refit:
+            self.anomaly_detector = IsolationForest(contamination=0.1).fit(
+                self.booking_data[self.ANOMALY_FEATURES]
+            )
+        if bookings is None:
+            bookings = self.booking_data
+
+        anomalies = self.anomaly_detector.predict(bookings[self.ANOMALY_FEATURES])
         return pd.DataFrame({
-            'date': self.booking_data['booking_date'],
+            'date': bookings['booking_date'],
             'is_anomaly': anomalies == -1
         })
 
     def optimize_pricing(self):
-        """Optimize ticket pricing using machine learning"""
-        features = self.prepare_prediction_features(self.booking_data)
+        """
+        Optimize ticket pricing using machine learning.
+
+        Keras is only used for training; the returned model is its NumPy
+        export, which predicts without TensorFlow. Its inputs are scaled by
+        pricing_scaler, fitted here; prediction_scaler belongs to the
+        already trained forecasting models and is left alone.
+        """
+        calendar = self.calendar_features(self.booking_data['date'])
+        self.pricing_scaler = StandardScaler().fit(calendar)
+        features = self.pricing_scaler.transform(calendar)
         target = self.booking_data['ticket_price']
+        keras = get_keras()
         
         model = keras.Sequential([
             keras.layers.Dense(64, activation='relu'),
@@ -220,30 +392,32 @@ class FlightAnalyticsSystem:
         model.compile(optimizer='adam', loss='mse')
         model.fit(features, target, epochs=50, batch_size=32, verbose=0)
         
-        return model
-
-    def prepare_prediction_features(self, data):
-        """Prepare features for ML models"""
-        # Convert dates to useful features
-        data['day_of_week'] = pd.to_datetime(data['date']).dt.dayofweek
-        data['month'] = pd.to_datetime(data['date']).dt.month
-        data['is_weekend'] = data['day_of_week'].isin([5, 6]).astype(int)
-        
-        # Select and scale features
-        features = data[[
-            'day_of_week',
-            'month',
-            'is_weekend'
-        ]]
-        
-        scaler = StandardScaler()
-        return scaler.fit_transform(features)
+        return DenseNetwork.from_keras(model)
+
+    def prepare_prediction_features(self, data, fit=False):
+        """
+        Prepare features for ML models.
+
+        Training passes fit=True to fit the scaler on the training data;
+        prediction only applies it, so predictions are scaled like the
+        training data.
+        """
+        return self.scale_calendar_features(self.calendar_features(data['date']), fit=fit)
+
+    def scale_calendar_features(self, features, fit=False):
+        """Standardize calendar features, fitting the scaler when fit is set"""
+        if fit:
+            self.prediction_scaler = StandardScaler().fit(features)
+        elif self.prediction_scaler is None:
+            raise ValueError('Train the prediction models before preparing prediction features')
+        return self.prediction_scaler.transform(features)
 
     def get_airport_coordinates(self, airport_code):
-        """Get airport coordinates from database"""
-        # This would typically query a database of airport coordinates
-        # For now, return dummy coordinates
-        return [0, 0]
+        """Get airport coordinates from the shared airport index"""
+        coordinates = get_airport_index().get_coordinates(airport_code)
+        if coordinates is None:
+            return [0, 0]
+        return list(coordinates)
 
     def generate_api_response(self):
         """Generate JSON response for admin dashboard"""
@@ -275,7 +449,7 @@ if __name__ == "__main__":
     analytics_system.train_prediction_models()
     
     # Generate world map
-    route_map = analytics_system.visualize_route_network()
+    route_map_path = analytics_system.visualize_route_network('route_network.html')
     
     # Find optimal route
     optimal_route = analytics_system.find_optimal_route(
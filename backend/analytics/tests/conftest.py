@@ -0,0 +1,13 @@
+# backend/analytics/tests/conftest.py
+#
+# Make the analytics package importable when pytest is started from the
+# repository root as well as from the backend directory:
+#
+#     python -m pytest analytics/tests
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
@@ -0,0 +1,110 @@
+# backend/analytics/tests/test_analytics_routes.py
+
+import asyncio
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from analytics.api import analytics_routes
+from analytics.api.executors import AnalyticsExecutor
+from analytics.components.connection_scanner import ConnectionScanner
+from analytics.components.route_optimizer import RouteOptimizer
+from analytics.tests.test_route_engines import AIRPORTS, ROUTES
+
+
+@pytest.fixture
+def client(monkeypatch):
+    route_optimizer = RouteOptimizer(engine='csr', cache_hubs=4)
+    route_optimizer.build_route_network(ROUTES, AIRPORTS)
+    monkeypatch.setattr(analytics_routes, 'route_optimizer', route_optimizer)
+    monkeypatch.setattr(analytics_routes, 'connection_scanner', ConnectionScanner())
+    monkeypatch.setattr(analytics_routes, 'executor', AnalyticsExecutor(process_workers=0))
+    analytics_routes.response_cache.invalidate()
+
+    app = FastAPI()
+    app.include_router(analytics_routes.router)
+    # Not used as a context manager: startup handlers stay out of the tests
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('path', [
+    '/api/analytics/route-optimization/JFK/XXX',
+    '/api/analytics/route-alternatives/XXX/SYD',
+    '/api/analytics/route-pareto/JFK/XXX'
+])
+def test_unknown_airport_is_not_found(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 404
+    assert 'XXX' in response.json()['detail']
+
+
+@pytest.mark.parametrize('path', [
+    '/api/analytics/route-optimization/JFK/SYD?criteria=time',
+    '/api/analytics/route-alternatives/JFK/SYD?criteria=time'
+])
+def test_unknown_criterion_is_bad_request(client, path):
+    assert client.get(path).status_code == 400
+
+
+def test_known_airports_are_routed(client):
+    response = client.get('/api/analytics/route-optimization/JFK/SYD?criteria=cost')
+
+    assert response.status_code == 200
+    assert response.json()['path'][0] == 'JFK'
+    assert response.json()['path'][-1] == 'SYD'
+
+
+SCHEDULE = [
+    {'flightNumber': 'BA112', 'from': 'JFK', 'to': 'LHR', 'price': 612.5,
+     'departureTime': '2026-03-01T18:00:00Z', 'arrivalTime': '2026-03-02T06:00:00Z'},
+    {'flightNumber': 'BA115', 'from': 'JFK', 'to': 'LHR', 'price': 540.0,
+     'departureTime': '2026-03-01T21:00:00Z', 'arrivalTime': '2026-03-02T09:00:00Z'},
+    {'flightNumber': 'EK4', 'from': 'LHR', 'to': 'DXB', 'price': 498.0,
+     'departureTime': '2026-03-02T08:00:00Z', 'arrivalTime': '2026-03-02T15:00:00Z'},
+    {'flightNumber': 'ZZ1', 'from': 'DXB', 'to': 'ZZZ', 'price': 99.0,
+     'departureTime': '2026-03-02T18:00:00Z', 'arrivalTime': '2026-03-02T20:00:00Z'}
+]
+
+
+def test_posted_schedule_serves_routes_and_connections(client):
+    response = client.post('/api/analytics/schedule', json=SCHEDULE)
+
+    # ZZZ is not a known airport: it has connections but no route
+    assert response.json() == {'flights': 4, 'airports': 3, 'routes': 2}
+    journey = client.get(
+        '/api/analytics/connections/earliest-arrival/JFK/DXB',
+        params={'departure_after': '2026-03-01T12:00:00'}
+    ).json()
+    assert [leg['flight_number'] for leg in journey['legs']] == ['BA112', 'EK4']
+    route = client.get('/api/analytics/route-optimization/JFK/DXB?criteria=cost').json()
+    assert route['path'] == ['JFK', 'LHR', 'DXB']
+    assert route['total_cost'] == 540.0 + 498.0
+    assert client.get('/api/analytics/route-optimization/JFK/SYD').status_code == 404
+
+
+def test_schedule_without_required_columns_is_rejected(client):
+    response = client.post('/api/analytics/schedule', json=[{'flightNumber': 'BA112'}])
+
+    assert response.status_code == 400
+
+
+def test_startup_loads_schedule_from_environment(client, monkeypatch, tmp_path):
+    path = tmp_path / 'flights.csv'
+    pd.DataFrame(SCHEDULE).to_csv(path, index=False)
+    monkeypatch.setenv('FLIGHT_SCHEDULE_PATH', str(path))
+
+    asyncio.run(analytics_routes.load_flight_schedule_on_startup())
+
+    assert client.get('/api/analytics/connections/earliest-arrival/JFK/LHR',
+                      params={'departure_after': '2026-03-01T12:00:00'}).status_code == 200
+
+
+def test_each_client_starts_without_a_schedule(client):
+    # Runs after the tests above loaded schedules: none of them may leak
+    response = client.get('/api/analytics/connections/earliest-arrival/JFK/LHR',
+                          params={'departure_after': '2026-03-01T12:00:00'})
+
+    assert response.status_code == 404
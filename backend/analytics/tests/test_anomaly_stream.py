@@ -0,0 +1,196 @@
+# backend/analytics/tests/test_anomaly_stream.py
+
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from analytics.api import analytics_routes
+from analytics.api.executors import AnalyticsExecutor
+from analytics.components.anomaly_stream import StreamingAnomalyDetector
+from analytics.flight_analytics import FlightAnalyticsSystem
+from analytics.tests.test_response_cache import make_request
+
+
+def route_bookings(n, origin='JFK', destination='LHR', seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'origin': origin,
+        'destination': destination,
+        'passenger_count': rng.integers(1, 5, n).astype(float),
+        'total_revenue': rng.normal(800, 50, n),
+        'booking_rate': rng.uniform(0.4, 0.9, n)
+    })
+
+
+def outlier(origin='JFK', revenue=10_000_000.0):
+    return pd.DataFrame({
+        'origin': [origin], 'destination': ['LHR'], 'passenger_count': [2.0],
+        'total_revenue': [revenue], 'booking_rate': [0.6]
+    })
+
+
+def test_zscore_scores_routes_once_they_have_history():
+    detector = StreamingAnomalyDetector(min_history=20)
+
+    warm_up = detector.observe(route_bookings(20))
+    scores = detector.observe(pd.concat([route_bookings(5, seed=1), outlier()], ignore_index=True))
+
+    assert warm_up['score'].isna().all()
+    assert not scores['is_anomaly'][:5].any()
+    assert scores['is_anomaly'].iloc[5]
+    assert detector.alerts()[0]['booking']['total_revenue'] == 10_000_000.0
+    # Another route has no history yet
+    assert np.isnan(detector.observe(outlier('CDG'))['score'].iloc[0])
+
+
+def test_null_feature_does_not_disable_scoring_for_the_route():
+    detector = StreamingAnomalyDetector(min_history=20)
+    detector.observe(route_bookings(30))
+    missing_revenue = outlier(revenue=np.nan)
+
+    missing = detector.observe(missing_revenue)
+    # Scored on passenger_count alone, and kept out of the window
+    assert np.isfinite(missing['score'].iloc[0])
+    assert detector._windows[('JFK', 'LHR')].count == 30
+
+    scores = detector.observe(outlier())
+
+    assert scores['is_anomaly'].iloc[0]
+    assert scores['score'].iloc[0] > 1000
+
+
+def test_isolation_forest_scores_after_a_refresh():
+    detector = StreamingAnomalyDetector(method='isolation_forest', min_history=50)
+    unscored = detector.observe(route_bookings(200))
+    assert unscored['score'].isna().all() and not unscored['is_anomaly'].any()
+
+    assert detector.refresh()
+    extreme = outlier()
+    extreme['passenger_count'] = 400.0
+    scores = detector.observe(pd.concat([route_bookings(3, seed=2), extreme], ignore_index=True))
+
+    assert scores['score'].notna().all()
+    assert scores['is_anomaly'].iloc[3]
+    assert detector.stats()['refreshes'] == 1
+
+
+def test_isolation_forest_skips_bookings_with_null_features():
+    detector = StreamingAnomalyDetector(method='isolation_forest', min_history=50)
+    detector.observe(route_bookings(100))
+    detector.refresh()
+
+    scores = detector.observe(outlier(revenue=np.nan))
+
+    assert np.isnan(scores['score'].iloc[0]) and not scores['is_anomaly'].iloc[0]
+    assert detector.stats()['history'] == 100
+
+
+def test_alerts_page_after_an_id():
+    detector = StreamingAnomalyDetector(min_history=20)
+    detector.observe(route_bookings(20))
+    detector.observe(pd.concat([outlier()] * 3, ignore_index=True))
+
+    assert [alert['id'] for alert in detector.alerts(after=1)] == [2, 3]
+    assert [alert['id'] for alert in detector.alerts(limit=1)] == [1]
+
+
+def make_system_bookings(n=300, seed=5):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'booking_date': pd.date_range('2025-01-01', periods=n, freq='h'),
+        'passenger_count': rng.integers(1, 5, n),
+        'total_revenue': rng.normal(800, 50, n),
+        'total_cost': rng.normal(600, 40, n)
+    })
+
+
+def test_detect_anomalies_reuses_the_forest_until_refit():
+    system = FlightAnalyticsSystem()
+    system.booking_data = make_system_bookings()
+
+    table = system.detect_anomalies()
+    forest = system.anomaly_detector
+    new = make_system_bookings(5, seed=6)
+    new.loc[4, 'total_revenue'] = 1e6
+    scored = system.detect_anomalies(new)
+
+    assert len(table) == 300 and 0 < table['is_anomaly'].sum() < 300
+    assert system.anomaly_detector is forest
+    assert scored['is_anomaly'].iloc[4]
+
+    system.booking_data = make_system_bookings(seed=7)
+    system.detect_anomalies(refit=True)
+    assert system.anomaly_detector is not forest
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    detector = StreamingAnomalyDetector(min_history=20)
+    monkeypatch.setattr(analytics_routes, 'anomaly_detector', detector)
+    monkeypatch.setattr(analytics_routes, 'executor', AnalyticsExecutor(process_workers=0))
+    monkeypatch.setattr(analytics_routes, 'ANOMALY_POLL_INTERVAL', 0.001)
+    return detector
+
+
+def test_score_endpoint_rejects_bookings_without_features(detector):
+    app = FastAPI()
+    app.include_router(analytics_routes.router)
+    client = TestClient(app)
+
+    assert client.post('/api/analytics/anomalies/score', json=[{'origin': 'JFK'}]).status_code == 400
+    response = client.post('/api/analytics/anomalies/score', json=route_bookings(3).to_dict('records'))
+    assert response.json()['scores'] == [None, None, None]
+
+
+def read_events(detector, polls, **arguments):
+    """Body of the SSE feed for a client that disconnects after polls polls"""
+    request = make_request('/api/analytics/anomalies/stream', b'')
+    remaining = iter(range(polls, -1, -1))
+
+    async def is_disconnected():
+        return next(remaining) == 0
+
+    request.is_disconnected = is_disconnected
+
+    async def collect():
+        response = await analytics_routes.stream_anomalies(request, **arguments)
+        assert response.media_type == 'text/event-stream'
+        return b''.join([chunk async for chunk in response.body_iterator]).decode()
+
+    return asyncio.run(collect())
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if line and not line.startswith(':'))
+        if fields:
+            events.append(fields)
+    return events
+
+
+def test_stream_sends_alerts_newer_than_after(detector):
+    detector.observe(route_bookings(20))
+    detector.observe(pd.concat([outlier()] * 3, ignore_index=True))
+
+    events = parse_events(read_events(detector, 1, after=1, last_event_id=None))
+
+    assert [event['id'] for event in events] == ['2', '3']
+    assert all(event['event'] == 'anomaly' for event in events)
+    assert json.loads(events[0]['data'])['booking']['total_revenue'] == 10_000_000.0
+
+
+def test_stream_resumes_from_last_event_id_and_skips_old_alerts(detector):
+    detector.observe(route_bookings(20))
+    detector.observe(pd.concat([outlier()] * 2, ignore_index=True))
+
+    resumed = parse_events(read_events(detector, 1, after=None, last_event_id='1'))
+    fresh = parse_events(read_events(detector, 1, after=None, last_event_id=None))
+
+    assert [event['id'] for event in resumed] == ['2']
+    assert fresh == []
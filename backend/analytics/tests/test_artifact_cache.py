@@ -0,0 +1,123 @@
+# backend/analytics/tests/test_artifact_cache.py
+
+import os
+import time
+
+import networkx as nx
+import pandas as pd
+import pytest
+
+from analytics.components.map_visualizer import MapVisualizer
+from analytics.flight_analytics import FlightAnalyticsSystem
+from analytics.utils.artifact_cache import ArtifactCache
+
+
+def age(path, seconds):
+    """Pretend an artifact was last used seconds ago"""
+    timestamp = time.time() - seconds
+    os.utime(path, (timestamp, timestamp))
+
+
+def test_put_evicts_least_recently_used_above_max_bytes(tmp_path):
+    cache = ArtifactCache(tmp_path, max_bytes=250)
+    first = cache.put('maps', 'first', '.html', 'a' * 100)
+    second = cache.put('maps', 'second', '.html', 'b' * 100)
+    age(first, 30)
+    age(second, 20)
+
+    # A hit makes 'first' the most recently used artifact
+    assert cache.get('maps', 'first', '.html') == first
+    third = cache.put('maps', 'third', '.html', 'c' * 100)
+
+    assert first.exists() and third.exists()
+    assert not second.exists()
+    assert cache.get('maps', 'second', '.html') is None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['disk_bytes'] == 200
+
+
+def test_put_keeps_the_new_artifact_even_when_over_budget(tmp_path):
+    cache = ArtifactCache(tmp_path, max_bytes=50)
+    old = cache.put('datasets', 'old', '.feather', b'x' * 40)
+    age(old, 10)
+
+    new = cache.put('datasets', 'new', '.feather', b'y' * 100)
+
+    assert new.exists()
+    assert not old.exists()
+
+
+def test_put_evicts_artifacts_older_than_max_age(tmp_path):
+    cache = ArtifactCache(tmp_path, max_bytes=None, max_age=60)
+    stale = cache.put('map-layers', 'stale', '.json', '{}')
+    fresh = cache.put('map-layers', 'fresh', '.json', '{}')
+    age(stale, 120)
+
+    cache.put('map-layers', 'other', '.json', '{}')
+
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_store_cleans_up_after_a_failed_write(tmp_path):
+    cache = ArtifactCache(tmp_path)
+
+    def write(tmp):
+        tmp.write_bytes(b'partial')
+        raise OSError('disk full')
+
+    with pytest.raises(OSError):
+        cache.store('datasets', 'key', '.feather', write)
+
+    assert cache.stats()['artifacts'] == 0
+    assert list((tmp_path / 'datasets').iterdir()) == []
+
+
+AIRPORTS = pd.DataFrame({
+    'code': ['JFK', 'LHR'],
+    'name': ['John F. Kennedy', 'Heathrow'],
+    'latitude': [40.6413, 51.47],
+    'longitude': [-73.7781, -0.4543]
+})
+ROUTES = pd.DataFrame({
+    'origin_lat': [40.6413], 'origin_lon': [-73.7781],
+    'dest_lat': [51.47], 'dest_lon': [-0.4543],
+    'traffic_density': [12]
+})
+
+
+def test_save_map_copies_the_cached_page(tmp_path):
+    visualizer = MapVisualizer(ArtifactCache(tmp_path / 'cache'))
+    page = visualizer.render_network_map(AIRPORTS, ROUTES)
+
+    # A second visualizer hits the cache without building a folium map
+    cached = MapVisualizer(ArtifactCache(tmp_path / 'cache'))
+    assert cached.render_network_map(AIRPORTS, ROUTES) == page
+    assert cached.base_map is None
+    cached.save_map(tmp_path / 'network.html')
+
+    assert (tmp_path / 'network.html').read_bytes() == page.read_bytes()
+
+
+def test_save_map_renders_a_modified_map(tmp_path):
+    visualizer = MapVisualizer(ArtifactCache(tmp_path / 'cache'))
+    page = visualizer.render_network_map(AIRPORTS, ROUTES)
+    visualizer.create_base_map()
+    visualizer.add_airports(AIRPORTS)
+
+    visualizer.save_map(tmp_path / 'airports.html')
+
+    assert (tmp_path / 'airports.html').read_bytes() != page.read_bytes()
+
+
+def test_visualize_route_network_renders_through_the_cache(tmp_path):
+    system = FlightAnalyticsSystem()
+    system.map_visualizer = MapVisualizer(ArtifactCache(tmp_path))
+    system.graph = nx.Graph([('JFK', 'LHR', {'frequency': 3}), ('LHR', 'CDG', {'frequency': 1})])
+
+    page = system.visualize_route_network()
+    assert system.visualize_route_network() == page
+
+    stats = system.map_visualizer.artifact_cache.stats()
+    assert stats['hits'] == 1
+    assert page.read_text(encoding='utf-8').count('FeatureCollection') >= 1
@@ -0,0 +1,101 @@
+# backend/analytics/tests/test_connection_scanner.py
+
+import pandas as pd
+import pytest
+
+from analytics.components.connection_scanner import ConnectionScanner
+
+
+def flights(*rows):
+    return pd.DataFrame(rows, columns=['flightNumber', 'from', 'to', 'departureTime', 'arrivalTime'])
+
+
+SCHEDULE = flights(
+    ('AA100', 'JFK', 'LHR', '2026-03-01T18:00:00', '2026-03-02T06:00:00'),
+    # 30 minutes at LHR: below the default 45-minute connection time
+    ('BA200', 'LHR', 'DXB', '2026-03-02T06:30:00', '2026-03-02T13:30:00'),
+    ('BA202', 'LHR', 'DXB', '2026-03-02T09:00:00', '2026-03-02T16:00:00'),
+    # Nonstop, but arrives after the one-stop journey
+    ('EK202', 'JFK', 'DXB', '2026-03-01T23:00:00', '2026-03-02T20:00:00'),
+    ('QF1', 'DXB', 'SYD', '2026-03-02T22:00:00', '2026-03-03T18:00:00'),
+    # Only flies into NBO: nothing leaves it
+    ('KQ1', 'DXB', 'NBO', '2026-03-02T17:00:00', '2026-03-02T21:00:00'),
+    # Arrives before it departs: dropped from the timetable
+    ('XX1', 'JFK', 'SYD', '2026-03-02T10:00:00', '2026-03-02T09:00:00')
+)
+
+
+def scanner(**options):
+    scanner = ConnectionScanner(**options)
+    scanner.build_timetable(SCHEDULE)
+    return scanner
+
+
+def flight_numbers(journey):
+    return [leg['flight_number'] for leg in journey['legs']]
+
+
+def test_connections_respect_the_minimum_connection_time():
+    journey = scanner().earliest_arrival('JFK', 'DXB', '2026-03-01T12:00:00')
+
+    assert flight_numbers(journey) == ['AA100', 'BA202']
+    assert journey['path'] == ['JFK', 'LHR', 'DXB']
+    assert journey['arrival_time'] == '2026-03-02T16:00:00Z'
+    assert journey['duration_hours'] == 22
+    assert journey['stops'] == 1
+
+
+def test_minimum_connection_time_overrides():
+    per_airport = ConnectionScanner()
+    per_airport.build_timetable(SCHEDULE, min_connection_minutes={'LHR': 30})
+
+    assert flight_numbers(per_airport.earliest_arrival('JFK', 'DXB', '2026-03-01T12:00:00')) == ['AA100', 'BA200']
+    assert flight_numbers(scanner().earliest_arrival(
+        'JFK', 'DXB', '2026-03-01T12:00:00', min_connection_minutes=30
+    )) == ['AA100', 'BA200']
+    # A longer connection time at LHR leaves only the nonstop flight
+    assert flight_numbers(scanner().earliest_arrival(
+        'JFK', 'DXB', '2026-03-01T12:00:00', min_connection_minutes=240
+    )) == ['EK202']
+
+
+def test_departures_before_departure_after_are_not_taken():
+    journey = scanner().earliest_arrival('JFK', 'DXB', '2026-03-01T18:00:01')
+
+    assert flight_numbers(journey) == ['EK202']
+    # A departure exactly at departure_after is taken
+    assert flight_numbers(scanner().earliest_arrival('JFK', 'DXB', '2026-03-01T18:00:00'))[0] == 'AA100'
+    assert scanner().earliest_arrival('JFK', 'DXB', '2026-03-02T00:00:00') is None
+
+
+@pytest.mark.parametrize('origin,destination', [
+    ('NBO', 'JFK'), ('SYD', 'LHR'), ('JFK', 'XXX'), ('JFK', 'JFK')
+])
+def test_unreachable_destinations_return_none(origin, destination):
+    assert scanner().earliest_arrival(origin, destination, '2026-03-01T00:00:00') is None
+
+
+def test_journeys_are_limited_to_the_scan_window():
+    assert flight_numbers(scanner().earliest_arrival('JFK', 'SYD', '2026-03-01T12:00:00')) == \
+        ['AA100', 'BA202', 'QF1']
+    assert scanner(max_journey_hours=24).earliest_arrival('JFK', 'SYD', '2026-03-01T12:00:00') is None
+
+
+def test_flights_arriving_before_departure_are_dropped():
+    timetable = scanner()
+
+    assert 'XX1' not in timetable.flight_numbers.tolist()
+    assert len(timetable.flight_numbers) == len(SCHEDULE) - 1
+    assert (timetable.departure_times[:-1] <= timetable.departure_times[1:]).all()
+
+
+def test_timezone_aware_times_are_compared_in_utc():
+    timetable = ConnectionScanner()
+    timetable.build_timetable(flights(
+        ('LH400', 'FRA', 'JFK', '2026-03-01T10:00:00+01:00', '2026-03-01T13:00:00-05:00')
+    ))
+
+    journey = timetable.earliest_arrival('FRA', 'JFK', '2026-03-01T08:30:00')
+
+    assert journey['departure_time'] == '2026-03-01T09:00:00Z'
+    assert journey['duration_hours'] == 9
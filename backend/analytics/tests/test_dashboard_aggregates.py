@@ -0,0 +1,150 @@
+# backend/analytics/tests/test_dashboard_aggregates.py
+
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from analytics.api import analytics_routes
+from analytics.api.executors import AnalyticsExecutor
+from analytics.components.anomaly_stream import StreamingAnomalyDetector
+from analytics.components.dashboard_aggregates import DashboardAggregateStore
+from analytics.components.dashboard_generator import DashboardGenerator
+from analytics.utils import json_encoding
+
+
+def make_bookings(n=60, seed=0, start='2026-03-01'):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'booking_date': (pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, 96, n), unit='h')).astype(str),
+        'origin': rng.choice(['JFK', 'LHR', 'CDG'], n),
+        'destination': rng.choice(['DXB', 'SIN'], n),
+        'passenger_count': rng.integers(1, 5, n),
+        'total_revenue': rng.uniform(100, 900, n).round(2),
+        'payment_method': rng.choice(['card', 'paypal', 'voucher'], n),
+        'hotel_name': rng.choice(['Hilton', 'Ibis'], n),
+        'booking_count': rng.integers(1, 3, n)
+    })
+
+
+def assert_same_aggregates(actual, expected):
+    for name in ['daily', 'routes']:
+        pd.testing.assert_frame_equal(actual[name], expected[name], check_dtype=False)
+    for name in ['payments', 'hotels']:
+        pd.testing.assert_series_equal(actual[name], expected[name], check_dtype=False)
+    assert actual['bookings'] == expected['bookings']
+
+
+def test_appended_batches_match_one_full_aggregation():
+    history = make_bookings(200)
+    store = DashboardAggregateStore()
+
+    versions = [store.append(history.iloc[start:start + 50]) for start in range(0, 200, 50)]
+    # New keys in a later batch: another day, route, payment method, hotel
+    extra = make_bookings(10, seed=1, start='2026-04-01').assign(
+        origin='SYD', payment_method='cash', hotel_name='Ritz'
+    )
+    store.append(extra)
+
+    assert versions == [1, 2, 3, 4]
+    expected = DashboardAggregateStore.from_bookings(pd.concat([history, extra], ignore_index=True))
+    assert_same_aggregates(store.snapshot(), expected.snapshot())
+    assert store.payments['cash'] == 10
+
+
+def test_batches_only_update_the_aggregates_they_carry():
+    store = DashboardAggregateStore.from_bookings(make_bookings())
+    before = store.snapshot()
+
+    store.append(pd.DataFrame({'payment_method': ['card', 'card']}))
+    after = store.snapshot()
+
+    assert after['payments']['card'] == before['payments']['card'] + 2
+    assert after['daily'] is before['daily']
+    assert after['routes'] is before['routes']
+
+
+def test_csv_history_is_aggregated_chunk_by_chunk(tmp_path):
+    history = make_bookings(150)
+    path = tmp_path / 'bookings.csv'
+    history.to_csv(path, index=False)
+
+    store = DashboardAggregateStore.from_csv(path, chunksize=40)
+
+    assert store.version == 4
+    assert_same_aggregates(store.snapshot(), DashboardAggregateStore.from_bookings(history).snapshot())
+
+
+@pytest.mark.parametrize('encoder', ['orjson', 'json'])
+def test_compact_payloads_are_columnar(monkeypatch, encoder):
+    if encoder == 'json':
+        monkeypatch.setattr(json_encoding, 'orjson', None)
+    elif json_encoding.orjson is None:
+        pytest.skip('orjson is not installed')
+    history = make_bookings()
+    generator = DashboardGenerator(DashboardAggregateStore.from_bookings(history))
+
+    trends = json.loads(json_encoding.dumps(generator.generate_booking_trends()))
+    revenue = json.loads(json_encoding.dumps(generator.generate_revenue_analysis()))
+    routes = json.loads(json_encoding.dumps(generator.generate_route_performance()))
+    payments = json.loads(json_encoding.dumps(generator.generate_payment_distribution()))
+    hotels = json.loads(json_encoding.dumps(generator.generate_hotel_preferences()))
+
+    assert trends['type'] == 'line'
+    assert trends['x'] == ['2026-03-01', '2026-03-02', '2026-03-03', '2026-03-04']
+    assert sum(trends['series'][0]['y']) == history['passenger_count'].sum()
+    # Fewer than 7 days: the moving average is NaN, encoded as null
+    assert revenue['series'][1]['y'] == [None] * 4
+    assert len(routes['x']) == len(routes['labels']) == len(routes['destinations'])
+    assert payments['values'] == sorted(payments['values'], reverse=True)
+    assert dict(zip(payments['labels'], payments['values'])) == history['payment_method'].value_counts().to_dict()
+    assert hotels['x'] == ['Hilton', 'Ibis']
+
+
+def test_unknown_output_is_rejected():
+    with pytest.raises(ValueError):
+        DashboardGenerator().generate_booking_trends(output='svg')
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(analytics_routes, 'dashboard_generator', DashboardGenerator())
+    monkeypatch.setattr(analytics_routes, 'anomaly_detector', StreamingAnomalyDetector())
+    monkeypatch.setattr(analytics_routes, 'executor', AnalyticsExecutor(process_workers=0))
+    analytics_routes.response_cache.invalidate()
+    app = FastAPI()
+    app.include_router(analytics_routes.router)
+    return TestClient(app)
+
+
+def test_posted_bookings_update_cached_dashboards(client):
+    first = make_bookings(20)
+    second = make_bookings(20, seed=1)
+
+    response = client.post('/api/analytics/dashboard/bookings', json=first.to_dict('records'))
+    trends = client.get('/api/analytics/dashboard/booking-trends').json()
+    client.post('/api/analytics/dashboard/bookings', json=second.to_dict('records'))
+    updated = client.get('/api/analytics/dashboard/booking-trends').json()
+
+    assert response.json() == {'bookings': 20, 'version': 1, 'anomalies': 0}
+    assert sum(trends['series'][0]['y']) == first['passenger_count'].sum()
+    assert sum(updated['series'][0]['y']) == first['passenger_count'].sum() + second['passenger_count'].sum()
+
+
+def test_startup_seeds_dashboards_from_booking_history(client, monkeypatch, tmp_path):
+    history = make_bookings(100)
+    path = tmp_path / 'bookings.csv'
+    history.to_csv(path, index=False)
+    monkeypatch.setenv('BOOKING_HISTORY_PATH', str(path))
+    assert client.get('/api/analytics/dashboard/booking-trends').json()['x'] == []
+
+    asyncio.run(analytics_routes.load_booking_history_on_startup())
+
+    trends = client.get('/api/analytics/dashboard/booking-trends').json()
+    assert sum(trends['series'][0]['y']) == history['passenger_count'].sum()
+    payments = client.get('/api/analytics/dashboard/payment-distribution').json()
+    assert sum(payments['values']) == 100
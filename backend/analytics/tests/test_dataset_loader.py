@@ -0,0 +1,118 @@
+# backend/analytics/tests/test_dataset_loader.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.utils.artifact_cache import ArtifactCache
+from analytics.utils import dataset_loader
+from analytics.utils.dataset_loader import BOOKING_SCHEMA, FLIGHT_SCHEMA, DatasetLoader
+
+FLIGHTS = pd.DataFrame({
+    'origin_airport': ['JFK', 'LHR', None, 'SYD', 'CDG', 'JFK', 'NRT'],
+    'destination_airport': ['LHR', 'ZRH', 'JFK', None, 'AAA', 'SYD', 'JFK'],
+    'airline': ['BA', 'AA', 'BA', 'QF', None, 'EK', 'JL'],
+    'departure_time': pd.date_range('2026-03-01', periods=7, freq='h').astype(str),
+    'distance': [5540.0, 9050.5, 5540.0, 15990.0, 340.0, 16010.0, 10840.0],
+    'base_cost': [123456.78, 2.5, 612.5, 1999.99, 87.0, 1450.0, 990.01],
+    'remarks': list('abcdefg')
+})
+
+
+@pytest.fixture
+def flights_csv(tmp_path):
+    path = tmp_path / 'flights.csv'
+    FLIGHTS.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('chunksize', [1, 2, 3])
+def test_chunked_read_matches_single_chunk(flights_csv, chunksize):
+    expected = DatasetLoader(chunksize=100, cache_format=None).read_csv(flights_csv, FLIGHT_SCHEMA)
+
+    actual = DatasetLoader(chunksize=chunksize, cache_format=None).read_csv(flights_csv, FLIGHT_SCHEMA)
+
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual['origin_airport'].dtype == actual['destination_airport'].dtype
+    assert list(actual['origin_airport'].cat.categories) == ['AAA', 'CDG', 'JFK', 'LHR', 'NRT', 'SYD', 'ZRH']
+    assert actual['origin_airport'].isna().tolist() == FLIGHTS['origin_airport'].isna().tolist()
+
+
+def test_money_columns_keep_cents(flights_csv):
+    data = DatasetLoader(chunksize=2, cache_format=None).read_csv(flights_csv, FLIGHT_SCHEMA)
+
+    assert data['base_cost'].dtype == np.float64
+    assert data['base_cost'][0] == 123456.78
+    assert data['distance'].dtype == np.float32
+    assert BOOKING_SCHEMA['ticket_price'] == 'float64'
+
+
+def test_integer_columns_are_compacted_across_chunks(tmp_path):
+    path = tmp_path / 'bookings.csv'
+    pd.DataFrame({'passenger_count': [1, 2, 3], 'booking_count': [4, None, 6]}).to_csv(path, index=False)
+
+    data = DatasetLoader(chunksize=1, cache_format=None).read_csv(path, BOOKING_SCHEMA)
+
+    assert data['passenger_count'].dtype == np.int32
+    assert data['booking_count'].dtype == np.float32
+
+
+@pytest.mark.parametrize('cache_format', ['feather', 'parquet'])
+def test_cached_load_matches_csv(flights_csv, tmp_path, cache_format):
+    loader = DatasetLoader(chunksize=2, cache_format=cache_format,
+                           artifact_cache=ArtifactCache(tmp_path / 'cache'))
+
+    first = loader.load(flights_csv, FLIGHT_SCHEMA)
+    second = loader.load(flights_csv, FLIGHT_SCHEMA)
+
+    assert loader.artifact_cache.stats()['hits'] == 1
+    pd.testing.assert_frame_equal(second, first)
+
+
+def mapped_ranges(path):
+    """Address ranges at which this process maps path (Linux only)"""
+    ranges = []
+    with open('/proc/self/maps') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 6 and fields[5] == str(path):
+                start, end = fields[0].split('-')
+                ranges.append((int(start, 16), int(end, 16)))
+    return ranges
+
+
+def test_feather_numeric_columns_map_the_cache_file(flights_csv, tmp_path):
+    if not os.path.exists('/proc/self/maps'):
+        pytest.skip('needs /proc/self/maps')
+    loader = DatasetLoader(chunksize=2, artifact_cache=ArtifactCache(tmp_path / 'cache'))
+    loader.load(flights_csv, FLIGHT_SCHEMA)
+
+    data = loader.load(flights_csv, FLIGHT_SCHEMA)
+
+    cached = next((tmp_path / 'cache' / 'datasets').iterdir())
+    ranges = mapped_ranges(cached.resolve())
+    for column in ['distance', 'base_cost', 'departure_time']:
+        address = data[column].to_numpy().__array_interface__['data'][0]
+        assert any(start <= address < end for start, end in ranges), column
+
+
+def test_default_dataset_cache_is_separate_from_map_artifacts():
+    assert DatasetLoader().artifact_cache.root != ArtifactCache().root
+
+
+def test_large_dataset_copies_do_not_evict_map_artifacts(tmp_path, monkeypatch):
+    maps = ArtifactCache(tmp_path / 'artifacts', max_bytes=4096)
+    rendered = maps.put('maps', 'network', '.html', '<html></html>')
+    monkeypatch.setattr(dataset_loader, 'DEFAULT_DATASET_CACHE_DIR', tmp_path / 'datasets')
+    monkeypatch.setattr(dataset_loader, 'DEFAULT_DATASET_CACHE_MAX_BYTES', 4096)
+    big = tmp_path / 'big.csv'
+    pd.concat([FLIGHTS] * 200, ignore_index=True).to_csv(big, index=False)
+
+    loader = DatasetLoader()
+    loader.load(big, FLIGHT_SCHEMA)
+
+    # Over the map budget: in a shared store this copy would evict the map
+    assert loader.artifact_cache.stats()['disk_bytes'] > maps.max_bytes
+    assert maps.get('maps', 'network', '.html') == rendered
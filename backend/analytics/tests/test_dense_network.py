@@ -0,0 +1,70 @@
+# backend/analytics/tests/test_dense_network.py
+
+import numpy as np
+import pytest
+
+from analytics.utils.dense_network import DenseNetwork
+
+
+def make_layers(sizes=(5, 16, 8, 1), activations=('relu', 'tanh', 'linear'), seed=5):
+    rng = np.random.default_rng(seed)
+    return [
+        (rng.normal(size=(inputs, units)), rng.normal(size=units), activation)
+        for inputs, units, activation in zip(sizes, sizes[1:], activations)
+    ]
+
+
+def reference_predict(layers, X):
+    """Float64 forward pass"""
+    functions = {
+        'linear': lambda x: x,
+        'relu': lambda x: np.maximum(x, 0),
+        'tanh': np.tanh,
+        'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+    }
+    output = np.asarray(X, dtype=np.float64)
+    for kernel, bias, activation in layers:
+        output = functions[activation](output @ kernel + bias)
+    return output
+
+
+@pytest.mark.parametrize('activations', [('relu', 'tanh', 'linear'), ('sigmoid', 'relu', 'sigmoid')])
+def test_forward_pass_matches_float64_reference(activations):
+    layers = make_layers(activations=activations)
+    X = np.random.default_rng(1).normal(size=(300, 5))
+
+    np.testing.assert_allclose(DenseNetwork(layers).predict(X), reference_predict(layers, X),
+                               rtol=1e-4, atol=1e-5)
+
+
+def test_saved_network_predicts_the_same(tmp_path):
+    network = DenseNetwork(make_layers())
+    X = np.random.default_rng(2).normal(size=(50, 5))
+    network.save(tmp_path / 'price_optimizer.npz')
+
+    np.testing.assert_array_equal(DenseNetwork.load(tmp_path / 'price_optimizer.npz').predict(X),
+                                  network.predict(X))
+    assert network.predict(X[0]).shape == (1, 1)
+
+
+def test_unsupported_activation_is_rejected():
+    with pytest.raises(ValueError):
+        DenseNetwork([(np.ones((2, 1)), np.ones(1), 'softmax')])
+
+
+def test_exported_keras_model_matches_model_predict():
+    keras = pytest.importorskip('tensorflow').keras
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(400, 5)).astype(np.float32)
+    y = X @ rng.normal(size=5) + 0.1 * rng.normal(size=400)
+    model = keras.Sequential([
+        keras.Input(shape=(5,)),
+        keras.layers.Dense(64, activation='relu'),
+        keras.layers.Dense(32, activation='relu'),
+        keras.layers.Dense(1)
+    ])
+    model.compile(optimizer='adam', loss='mse')
+    model.fit(X, y, epochs=5, batch_size=32, verbose=0)
+
+    np.testing.assert_allclose(DenseNetwork.from_keras(model).predict(X),
+                               model.predict(X, verbose=0), rtol=1e-4, atol=1e-5)
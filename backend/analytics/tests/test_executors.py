@@ -0,0 +1,135 @@
+# backend/analytics/tests/test_executors.py
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from analytics.api import analytics_routes
+from analytics.api.executors import AnalyticsExecutor, ExecutorSaturated
+from analytics.components.route_optimizer import RouteOptimizer
+from analytics.tests.test_route_engines import AIRPORTS, ROUTES
+
+
+@pytest.fixture
+def executor():
+    executor = AnalyticsExecutor(thread_workers=2, process_workers=0, max_pending=1, default_timeout=5)
+    yield executor
+    executor.shutdown()
+
+
+def blocked(release: threading.Event, started: threading.Event):
+    started.set()
+    release.wait(5)
+    return 'done'
+
+
+async def start_blocked(executor, endpoint='slow', **kwargs):
+    """Start a task that holds its pool slot until the returned event is set"""
+    release, started = threading.Event(), threading.Event()
+    task = asyncio.ensure_future(executor.run_in_thread(endpoint, blocked, release, started, **kwargs))
+    while not started.is_set():
+        await asyncio.sleep(0.001)
+    return task, release
+
+
+async def wait_for_pending(executor, count):
+    while executor.stats()['pending']['thread'] != count:
+        await asyncio.sleep(0.001)
+
+
+def test_full_pool_rejects_with_a_503(executor):
+    async def scenario():
+        task, release = await start_blocked(executor)
+
+        with pytest.raises(ExecutorSaturated) as error:
+            await executor.run_in_thread('fast', lambda: 'never runs')
+
+        release.set()
+        assert await task == 'done'
+        await wait_for_pending(executor, 0)
+        # The slot is free again once the blocking task finished
+        assert await executor.run_in_thread('fast', lambda: 'ran') == 'ran'
+        return error.value
+
+    error = asyncio.run(scenario())
+
+    assert error.status_code == 503
+    assert error.headers == {'Retry-After': '1'}
+    assert executor.stats()['rejected'] == 1
+    assert executor.stats()['pending'] == {'thread': 0, 'process': 0}
+
+
+def test_timed_out_task_keeps_its_slot_until_it_finishes(executor):
+    async def scenario():
+        release, started = threading.Event(), threading.Event()
+        with pytest.raises(ExecutorSaturated, match='timed out'):
+            await executor.run_in_thread('slow', blocked, release, started, timeout=0.05)
+
+        # Still running, so still counted against max_pending
+        assert executor.stats()['pending']['thread'] == 1
+        with pytest.raises(ExecutorSaturated, match='saturated'):
+            await executor.run_in_thread('fast', lambda: 'never runs')
+
+        release.set()
+        await wait_for_pending(executor, 0)
+
+    asyncio.run(scenario())
+
+    assert executor.stats()['timed_out'] == 1
+    assert executor.stats()['rejected'] == 1
+
+
+def test_endpoint_limit_rejects_after_waiting():
+    executor = AnalyticsExecutor(thread_workers=2, process_workers=0, endpoint_limits={'slow': 1})
+
+    async def scenario():
+        task, release = await start_blocked(executor)
+
+        with pytest.raises(ExecutorSaturated, match='concurrency limit'):
+            await executor.run_in_thread('slow', lambda: 'never runs', timeout=0.05)
+        # Other endpoints are not held back by the limit
+        assert await executor.run_in_thread('other', lambda: 'ran') == 'ran'
+
+        release.set()
+        await task
+        assert await executor.run_in_thread('slow', lambda: 'ran') == 'ran'
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+
+    assert executor.stats()['timed_out'] == 1
+    assert executor.stats()['rejected'] == 0
+
+
+def test_errors_release_the_slot(executor):
+    def fail():
+        raise ValueError('bad input')
+
+    async def scenario():
+        with pytest.raises(ValueError, match='bad input'):
+            await executor.run_in_thread('fast', fail)
+        await wait_for_pending(executor, 0)
+
+    asyncio.run(scenario())
+
+
+def test_saturated_endpoint_responds_503(monkeypatch):
+    route_optimizer = RouteOptimizer(engine='csr')
+    route_optimizer.build_route_network(ROUTES, AIRPORTS)
+    monkeypatch.setattr(analytics_routes, 'route_optimizer', route_optimizer)
+    monkeypatch.setattr(analytics_routes, 'executor', AnalyticsExecutor(process_workers=0, max_pending=0))
+    app = FastAPI()
+    app.include_router(analytics_routes.router)
+    client = TestClient(app)
+
+    response = client.get('/api/analytics/route-optimization/JFK/SYD')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.json() == {'detail': 'Analytics thread pool is saturated'}
+    assert client.get('/api/analytics/executor/stats').json()['rejected'] == 1
@@ -0,0 +1,106 @@
+# backend/analytics/tests/test_feature_pipeline.py
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from analytics.tests.test_ml_models import make_bookings
+from analytics.utils.feature_pipeline import CYCLICAL_COLUMNS, FeaturePipeline
+
+TARGETS = ['passenger_count', 'total_revenue']
+
+
+def reference_features(data, columns):
+    """Features built with pandas accessors and trigonometry directly"""
+    dates = pd.to_datetime(data['date'])
+    return np.column_stack([
+        data[columns].to_numpy(dtype=np.float64),
+        np.sin(2 * np.pi * dates.dt.day / 31),
+        np.cos(2 * np.pi * dates.dt.day / 31),
+        np.sin(2 * np.pi * dates.dt.month / 12),
+        np.cos(2 * np.pi * dates.dt.month / 12)
+    ])
+
+
+@pytest.fixture
+def bookings():
+    data = make_bookings(days=400)
+    data['is_holiday'] = data['date'].dt.dayofweek >= 5
+    data['route'] = 'JFK-LHR'
+    return data
+
+
+def test_fit_selects_numeric_columns_and_excludes_targets(bookings):
+    pipeline = FeaturePipeline(exclude=TARGETS).fit(bookings)
+
+    assert pipeline.input_columns == ['booking_rate', 'is_holiday']
+    assert pipeline.feature_names == ['booking_rate', 'is_holiday'] + CYCLICAL_COLUMNS
+
+
+def test_fit_transform_matches_standard_scaler(bookings):
+    pipeline = FeaturePipeline(exclude=TARGETS)
+
+    X = pipeline.fit_transform(bookings)
+
+    expected = StandardScaler().fit_transform(reference_features(bookings, ['booking_rate', 'is_holiday']))
+    np.testing.assert_allclose(X, expected, atol=1e-12)
+
+
+def test_transform_reuses_the_training_scaling(bookings):
+    pipeline = FeaturePipeline(exclude=TARGETS).fit(bookings.iloc[:200])
+    later = bookings.iloc[200:]
+
+    X = pipeline.transform(later)
+
+    scaler = StandardScaler().fit(reference_features(bookings.iloc[:200], pipeline.input_columns))
+    np.testing.assert_allclose(X, scaler.transform(reference_features(later, pipeline.input_columns)), atol=1e-12)
+
+
+def test_columns_are_read_in_fitted_order(bookings):
+    pipeline = FeaturePipeline(exclude=TARGETS).fit(bookings)
+    shuffled = bookings[['route', 'is_holiday', 'total_revenue', 'date', 'booking_rate']]
+
+    np.testing.assert_array_equal(pipeline.transform(shuffled), pipeline.transform(bookings))
+
+
+def test_single_record_matches_frame_row(bookings):
+    pipeline = FeaturePipeline(exclude=TARGETS).fit(bookings)
+    record = bookings.iloc[37].to_dict()
+
+    row = pipeline.transform(record)
+
+    assert row.shape == (1, len(pipeline.feature_names))
+    np.testing.assert_allclose(row, pipeline.transform(bookings.iloc[37:38]), atol=1e-12)
+
+
+def test_constant_columns_are_centred_not_scaled(bookings):
+    bookings['booking_rate'] = 0.5
+
+    X = FeaturePipeline(exclude=TARGETS).fit_transform(bookings)
+
+    assert np.isfinite(X).all()
+    np.testing.assert_array_equal(X[:, 0], 0.0)
+
+
+def test_without_a_date_column(bookings):
+    pipeline = FeaturePipeline(exclude=TARGETS).fit(bookings.drop(columns='date'))
+
+    assert pipeline.feature_names == ['booking_rate', 'is_holiday']
+    assert pipeline.transform({'booking_rate': 0.4, 'is_holiday': True}).shape == (1, 2)
+
+
+def test_transform_before_fit_raises():
+    with pytest.raises(ValueError, match='fitted'):
+        FeaturePipeline().transform(make_bookings(days=3))
+
+
+def test_pipeline_survives_joblib_round_trip(bookings, tmp_path):
+    pipeline = FeaturePipeline(exclude=TARGETS).fit(bookings)
+    joblib.dump(pipeline, tmp_path / 'pipeline.pkl')
+
+    loaded = joblib.load(tmp_path / 'pipeline.pkl')
+
+    assert loaded.feature_names == pipeline.feature_names
+    np.testing.assert_array_equal(loaded.transform(bookings), pipeline.transform(bookings))
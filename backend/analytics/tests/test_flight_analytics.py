@@ -0,0 +1,139 @@
+# backend/analytics/tests/test_flight_analytics.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.flight_analytics import FlightAnalyticsSystem
+
+
+def test_build_route_graph_aggregates_both_directions():
+    flight_data = pd.DataFrame({
+        'origin_airport': ['JFK', 'LHR', 'JFK', 'CDG'],
+        'destination_airport': ['LHR', 'JFK', 'CDG', 'LHR'],
+        'distance': [5570.0, 5560.0, 5840.0, 344.0],
+        'base_cost': [450.0, 480.0, 520.0, 90.0]
+    })
+
+    graph = FlightAnalyticsSystem().build_route_graph(flight_data)
+
+    assert graph.number_of_edges() == 3
+    assert graph['JFK']['LHR'] == {'weight': 5560.0, 'cost': 450.0, 'frequency': 2}
+    assert graph['LHR']['CDG']['frequency'] == 1
+
+
+def test_build_route_graph_drops_rows_without_airport_codes():
+    flight_data = pd.DataFrame({
+        'origin_airport': pd.Categorical(['JFK', None, 'CDG', 'LHR']),
+        'destination_airport': pd.Categorical(['LHR', 'CDG', None, 'CDG']),
+        'distance': [5570.0, 5840.0, 5840.0, 344.0],
+        'base_cost': [450.0, 520.0, 520.0, 90.0]
+    })
+
+    graph = FlightAnalyticsSystem().build_route_graph(flight_data)
+
+    assert sorted(graph.nodes) == ['CDG', 'JFK', 'LHR']
+    assert sorted(tuple(sorted(edge)) for edge in graph.edges) == [('CDG', 'LHR'), ('JFK', 'LHR')]
+    assert not any(pd.isna(node) for node in graph.nodes)
+
+
+def test_aggregate_routes_with_only_unknown_codes_is_empty():
+    routes = FlightAnalyticsSystem.aggregate_routes(
+        np.array([None, 'JFK'], dtype=object),
+        np.array(['LHR', np.nan], dtype=object),
+        np.array([1.0, 2.0]),
+        np.array([1.0, 2.0])
+    )
+
+    assert len(routes['origin']) == 0
+    assert len(routes['frequency']) == 0
+
+
+def make_bookings(days=120, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2025-01-01', periods=days, freq='D')
+    return pd.DataFrame({
+        'date': dates,
+        'passenger_count': rng.integers(50, 300, days),
+        'total_revenue': rng.uniform(1e4, 5e4, days)
+    })
+
+
+def test_prediction_features_require_trained_scaler():
+    system = FlightAnalyticsSystem()
+
+    with pytest.raises(ValueError):
+        system.prepare_prediction_features(make_bookings(10))
+    assert system.prediction_scaler is None
+
+
+def test_prediction_features_reuse_the_training_scaler():
+    system = FlightAnalyticsSystem()
+    system.booking_data = make_bookings()
+    system.train_prediction_models()
+    scaler = system.prediction_scaler
+
+    future = make_bookings(days=7).assign(date=pd.date_range('2026-06-01', periods=7, freq='D'))
+    X = system.prepare_prediction_features(future)
+
+    assert system.prediction_scaler is scaler
+    np.testing.assert_allclose(X, scaler.transform(system.calendar_features(future['date'])))
+    forecast = system.predict_future_metrics(days_ahead=7, start='2026-06-01')
+    assert len(forecast) == 7
+
+
+@pytest.fixture
+def forecasting_system():
+    system = FlightAnalyticsSystem()
+    bookings = make_bookings()
+    bookings['origin_airport'] = np.where(np.arange(len(bookings)) % 4 == 0, 'LHR', 'JFK')
+    bookings['destination_airport'] = 'CDG'
+    bookings['total_cost'] = bookings['total_revenue'] * 0.8
+    system.booking_data = bookings
+    system.train_prediction_models()
+    return system
+
+
+def test_route_forecasts_split_the_network_forecast(forecasting_system):
+    system = forecasting_system
+    assert len(system.analyze_route_profitability()) == 2
+
+    network = system.predict_future_metrics(days_ahead=5, start='2026-06-01')
+    forecast = system.predict_future_metrics(
+        days_ahead=5, routes=[('JFK', 'CDG'), ('LHR', 'CDG'), ('SYD', 'CDG')], start='2026-06-01'
+    )
+
+    assert len(forecast) == 15
+    assert forecast['origin'].tolist()[:3] == ['JFK', 'LHR', 'SYD']
+    by_date = forecast.groupby('date')[['predicted_passengers', 'predicted_revenue']].sum()
+    np.testing.assert_allclose(by_date['predicted_passengers'], network['predicted_passengers'])
+    np.testing.assert_allclose(by_date['predicted_revenue'], network['predicted_revenue'])
+    assert (forecast.loc[forecast['origin'] == 'SYD', 'predicted_passengers'] == 0).all()
+
+
+def test_horizons_keep_the_requested_order_and_repeats(forecasting_system):
+    forecast = forecasting_system.predict_future_metrics(days_ahead=[7, 1, 3, 1], start='2026-06-01')
+
+    assert forecast['date'].dt.day.tolist() == [8, 2, 4, 2]
+    assert forecast['predicted_passengers'].iloc[1] == forecast['predicted_passengers'].iloc[3]
+
+
+def test_optimize_pricing_leaves_the_forecast_scaler_alone():
+    pytest.importorskip('tensorflow')
+    system = FlightAnalyticsSystem()
+    system.booking_data = make_bookings()
+    system.train_prediction_models()
+    scaler = system.prediction_scaler
+    before = system.predict_future_metrics(days_ahead=14, start='2026-06-01')
+
+    # New bookings from another season with prices for the price model
+    system.booking_data = make_bookings(days=60, seed=8).assign(
+        date=pd.date_range('2025-06-01', periods=60, freq='D'),
+        ticket_price=np.linspace(200, 800, 60)
+    )
+    network = system.optimize_pricing()
+
+    assert system.prediction_scaler is scaler
+    pd.testing.assert_frame_equal(system.predict_future_metrics(days_ahead=14, start='2026-06-01'), before)
+    X = system.pricing_scaler.transform(system.calendar_features(system.booking_data['date']))
+    assert network.predict(X).shape == (60, 1)
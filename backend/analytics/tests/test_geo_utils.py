@@ -0,0 +1,123 @@
+# backend/analytics/tests/test_geo_utils.py
+
+import numpy as np
+import pytest
+
+from analytics.utils.geo_utils import (
+    adaptive_point_counts,
+    distance_matrix,
+    great_circle_path_list,
+    great_circle_paths,
+    haversine_distances,
+    split_antimeridian,
+)
+
+ORIGINS = np.array([
+    [40.6413, -73.7781],   # JFK
+    [51.4700, -0.4543],    # LHR
+    [-33.9399, 151.1753],  # SYD
+    [35.5494, 139.7798],   # HND
+    [0.5, 10.0],
+])
+DESTINATIONS = np.array([
+    [51.4700, -0.4543],    # LHR
+    [1.3644, 103.9915],    # SIN
+    [33.9416, -118.4085],  # LAX, across the antimeridian
+    [35.5494, 139.7798],   # same airport
+    [-0.5, -168.0],        # nearly antipodal
+])
+
+
+def test_distance_matrix_matches_pairwise_distances():
+    coordinates = np.vstack([ORIGINS, DESTINATIONS])
+    rows, cols = np.divmod(np.arange(len(coordinates) ** 2), len(coordinates))
+
+    matrix = distance_matrix(coordinates, chunk_size=3)
+
+    np.testing.assert_allclose(
+        matrix.ravel(), haversine_distances(coordinates[rows], coordinates[cols]), rtol=1e-12, atol=1e-9
+    )
+    np.testing.assert_allclose(matrix, matrix.T, atol=1e-9)
+
+
+def test_paths_start_and_end_at_the_endpoints():
+    paths = great_circle_paths(ORIGINS, DESTINATIONS, points=50)
+
+    assert paths.shape == (len(ORIGINS), 50, 2)
+    np.testing.assert_allclose(paths[:, 0], ORIGINS, atol=1e-9)
+    np.testing.assert_allclose(paths[:, -1], DESTINATIONS, atol=1e-9)
+
+
+def test_path_points_are_evenly_spaced_along_the_great_circle():
+    paths = great_circle_paths(ORIGINS, DESTINATIONS, points=50)
+    total = haversine_distances(ORIGINS, DESTINATIONS)
+
+    for path, distance in zip(paths, total):
+        steps = haversine_distances(path[:-1], path[1:])
+        np.testing.assert_allclose(steps, distance / 49, rtol=1e-6, atol=1e-6)
+        # Every point lies on the shortest arc between the endpoints
+        via = haversine_distances(np.repeat(path[:1], 50, axis=0), path) + haversine_distances(
+            path, np.repeat(path[-1:], 50, axis=0)
+        )
+        np.testing.assert_allclose(via, distance, rtol=1e-6, atol=1e-6)
+
+
+def test_coincident_endpoints_give_a_constant_path():
+    [path] = great_circle_paths(ORIGINS[3:4], DESTINATIONS[3:4], points=5)
+
+    assert np.isfinite(path).all()
+    np.testing.assert_allclose(path, np.repeat(ORIGINS[3:4], 5, axis=0), atol=1e-9)
+
+
+def test_adaptive_point_counts_are_clipped():
+    counts = adaptive_point_counts(np.array([0.0, 50.0, 100.0, 101.0, 950.0, 1e6]), km_per_point=100)
+
+    np.testing.assert_array_equal(counts, [2, 2, 2, 3, 11, 100])
+
+
+def test_path_list_matches_single_route_paths():
+    paths = great_circle_path_list(ORIGINS, DESTINATIONS, km_per_point=500, max_points=30)
+    counts = adaptive_point_counts(haversine_distances(ORIGINS, DESTINATIONS), 500, 2, 30)
+
+    assert [len(path) for path in paths] == counts.tolist()
+    for origin, destination, count, path in zip(ORIGINS, DESTINATIONS, counts, paths):
+        [expected] = great_circle_paths(origin, destination, int(count))
+        np.testing.assert_allclose(path, expected, atol=1e-12)
+
+
+def test_split_antimeridian_leaves_ordinary_paths_whole():
+    [path] = great_circle_paths(ORIGINS[:1], DESTINATIONS[:1], points=20)
+
+    segments = split_antimeridian(path)
+
+    assert len(segments) == 1
+    np.testing.assert_array_equal(segments[0], path)
+
+
+def test_split_antimeridian_cuts_at_the_crossing():
+    [path] = great_circle_paths(ORIGINS[2:3], DESTINATIONS[2:3], points=40)
+
+    segments = split_antimeridian(path)
+
+    assert len(segments) == 2
+    first, second = segments
+    assert first[-1, 1] == 180.0 and second[0, 1] == -180.0
+    assert first[-1, 0] == second[0, 0]
+    assert len(first) + len(second) == len(path) + 2
+    for segment in segments:
+        assert (np.abs(np.diff(segment[:, 1])) <= 180).all()
+    # The crossing latitude lies between the points either side of it
+    jump = len(first) - 2
+    assert min(path[jump, 0], path[jump + 1, 0]) <= first[-1, 0] <= max(path[jump, 0], path[jump + 1, 0])
+
+
+def test_split_antimeridian_handles_westbound_and_repeated_crossings():
+    path = np.array([[0.0, -170.0], [2.0, 170.0], [4.0, -175.0], [6.0, -160.0]])
+
+    segments = split_antimeridian(path)
+
+    assert [len(segment) for segment in segments] == [2, 3, 3]
+    assert segments[0][-1].tolist() == [1.0, -180.0]
+    assert segments[1][0].tolist() == [1.0, 180.0]
+    assert segments[1][-1, 1] == 180.0 and segments[2][0, 1] == -180.0
+    assert segments[1][-1, 0] == pytest.approx(2 + 2 * 10 / 15)
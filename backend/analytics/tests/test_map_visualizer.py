@@ -0,0 +1,123 @@
+# backend/analytics/tests/test_map_visualizer.py
+
+import folium
+import pandas as pd
+import pytest
+from folium.plugins import FastMarkerCluster
+
+from analytics.components.map_visualizer import MapVisualizer
+from analytics.utils.artifact_cache import ArtifactCache
+
+AIRPORTS = pd.DataFrame({
+    'code': ['JFK', 'LHR', 'SYD', 'LAX'],
+    'name': ['Kennedy', 'Heathrow', 'Kingsford Smith', 'Los Angeles'],
+    'latitude': [40.6413, 51.4700, -33.9399, 33.9416],
+    'longitude': [-73.7781, -0.4543, 151.1753, -118.4085],
+})
+
+JFK, LHR, SYD, LAX = AIRPORTS[['latitude', 'longitude']].to_numpy().tolist()
+
+
+def routes(*rows):
+    """Route rows from ((origin, destination, traffic_density), ...)"""
+    return pd.DataFrame(
+        [[*origin, *destination, density] for origin, destination, density in rows],
+        columns=['origin_lat', 'origin_lon', 'dest_lat', 'dest_lon', 'traffic_density']
+    )
+
+
+@pytest.fixture
+def visualizer(tmp_path):
+    visualizer = MapVisualizer(ArtifactCache(tmp_path))
+    visualizer.create_base_map()
+    return visualizer
+
+
+def layers(visualizer, kind):
+    return [child for child in visualizer.base_map._children.values() if isinstance(child, kind)]
+
+
+def test_aggregate_routes_bundles_both_directions(visualizer):
+    result = visualizer.aggregate_routes(routes(
+        (JFK, LHR, 100), (LHR, JFK, 50), (JFK, LHR, 25), (SYD, LAX, 10)
+    ))
+
+    assert len(result) == 2
+    jfk_lhr = result[(result['origin_lat'] == JFK[0]) & (result['dest_lat'] == LHR[0])]
+    assert jfk_lhr[['traffic_density', 'flights']].values.tolist() == [[175, 3]]
+    syd_lax = result[result['origin_lat'] == SYD[0]]
+    assert syd_lax[['dest_lat', 'dest_lon', 'traffic_density', 'flights']].values.tolist() == [[*LAX, 10, 1]]
+
+
+def test_route_features_are_geojson_lines(visualizer):
+    collection = visualizer.build_route_features(routes((JFK, LHR, 100), (LHR, JFK, 50)))
+
+    assert collection['type'] == 'FeatureCollection'
+    [feature] = collection['features']
+    assert feature['geometry'] == {
+        'type': 'LineString',
+        'coordinates': [[JFK[1], JFK[0]], [LHR[1], LHR[0]]]
+    }
+    assert feature['properties']['traffic_density'] == 150
+    assert feature['properties']['flights'] == 2
+    assert feature['properties']['color'] == visualizer.route_colors(150)
+
+
+def test_percentile_filter_keeps_the_busiest_routes(visualizer):
+    data = routes((JFK, LHR, 10), (LHR, SYD, 20), (SYD, LAX, 30), (LAX, JFK, 40))
+
+    collection = visualizer.build_route_features(data, min_traffic_percentile=75)
+
+    densities = [feature['properties']['traffic_density'] for feature in collection['features']]
+    assert densities == [40]
+    assert len(visualizer.build_route_features(data.iloc[:0], min_traffic_percentile=75)['features']) == 0
+
+
+def test_great_circle_routes_are_split_at_the_antimeridian(visualizer):
+    collection = visualizer.build_route_features(routes((SYD, LAX, 10), (JFK, LHR, 5)), great_circle=True)
+
+    geometries = {feature['properties']['traffic_density']: feature['geometry'] for feature in collection['features']}
+    assert geometries[10]['type'] == 'MultiLineString'
+    west, east = geometries[10]['coordinates']
+    assert west[0] == [SYD[1], SYD[0]] and west[-1][0] == 180.0
+    assert east[0][0] == -180.0 and east[-1] == pytest.approx([LAX[1], LAX[0]])
+    assert geometries[5]['type'] == 'LineString'
+    assert len(geometries[5]['coordinates']) > 2
+
+
+def test_aggregated_traffic_is_a_single_geojson_layer(visualizer):
+    data = routes(*[(JFK, LHR, i) for i in range(50)], *[(SYD, LAX, i) for i in range(50)])
+
+    collection = visualizer.visualize_traffic_density(data, aggregate=True)
+
+    assert len(collection['features']) == 2
+    assert len(layers(visualizer, folium.GeoJson)) == 1
+    assert layers(visualizer, folium.PolyLine) == []
+
+
+def test_clustered_airports_are_a_single_layer(visualizer):
+    visualizer.add_airports(AIRPORTS, cluster=True)
+
+    [cluster] = layers(visualizer, FastMarkerCluster)
+    assert cluster.data == [
+        [lat, lon, f'{name} ({code})']
+        for code, name, lat, lon in AIRPORTS[['code', 'name', 'latitude', 'longitude']].values.tolist()
+    ]
+    assert layers(visualizer, folium.CircleMarker) == []
+
+
+def test_unclustered_airports_are_one_marker_each(visualizer):
+    visualizer.add_airports(AIRPORTS)
+
+    assert len(layers(visualizer, folium.CircleMarker)) == len(AIRPORTS)
+    assert layers(visualizer, FastMarkerCluster) == []
+
+
+def test_render_network_map_contains_both_layers(visualizer):
+    path = visualizer.render_network_map(AIRPORTS, routes((JFK, LHR, 100), (SYD, LAX, 10)))
+
+    html = path.read_text()
+    assert 'Heathrow (LHR)' in html
+    assert 'MultiLineString' in html
+    assert len(layers(visualizer, folium.GeoJson)) == 1
+    assert len(layers(visualizer, FastMarkerCluster)) == 1
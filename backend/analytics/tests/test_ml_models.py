@@ -0,0 +1,98 @@
+# backend/analytics/tests/test_ml_models.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from analytics.api import analytics_routes
+from analytics.api.executors import AnalyticsExecutor
+from analytics.components.ml_models import MLModels
+from analytics.components.model_registry import ModelRegistry
+
+
+def make_bookings(days=90, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range('2025-01-01', periods=days, freq='D'),
+        'booking_rate': rng.uniform(0.2, 0.9, days),
+        'passenger_count': rng.integers(50, 300, days),
+        'total_revenue': rng.uniform(1e4, 5e4, days)
+    })
+
+
+@pytest.fixture(scope='module')
+def trained():
+    ml_models = MLModels()
+    data = make_bookings()
+    ml_models.train_passenger_predictor(data)
+    ml_models.train_revenue_predictor(data)
+    return ml_models
+
+
+def test_forecast_predicts_every_day_of_the_horizon(trained):
+    dates, predictions = trained.forecast('passenger_predictor', 14, start='2026-01-01')
+
+    assert len(dates) == len(predictions) == 14
+    assert dates[0] == pd.Timestamp('2026-01-01')
+    pipeline = trained.feature_pipelines['passenger_predictor']
+    horizon = pd.DataFrame({'booking_rate': pipeline.mean_[0], 'date': dates})
+    np.testing.assert_allclose(predictions, trained.predict_passengers(horizon))
+
+
+def test_forecast_without_a_model_raises_value_error():
+    with pytest.raises(ValueError):
+        MLModels().forecast('revenue_predictor', 7)
+
+
+def test_load_models_swaps_pipelines_with_the_models(trained, tmp_path):
+    registry = ModelRegistry(tmp_path)
+    version = registry.publish(trained)
+    served = MLModels()
+    registry.load(served, version)
+
+    assert served.model_path == str(tmp_path / version)
+    assert served.passenger_forest is None
+    _, lazy = served.forecast('passenger_predictor', 3, start='2026-01-01')
+    _, eager = trained.forecast('passenger_predictor', 3, start='2026-01-01')
+    np.testing.assert_allclose(lazy, eager)
+
+
+def test_registry_rejects_unpublished_versions(trained, tmp_path):
+    registry = ModelRegistry(tmp_path / 'registry')
+    registry.publish(trained)
+
+    for version in ['..', '../registry', 'missing']:
+        with pytest.raises(FileNotFoundError):
+            registry.load(MLModels(), version)
+
+
+@pytest.fixture
+def client(trained, monkeypatch, tmp_path):
+    registry = ModelRegistry(tmp_path)
+    registry.publish(trained)
+    monkeypatch.setattr(analytics_routes, 'ml_models', MLModels())
+    monkeypatch.setattr(analytics_routes, 'model_registry', registry)
+    monkeypatch.setattr(analytics_routes, 'active_model_manifest', None)
+    monkeypatch.setattr(analytics_routes, 'executor', AnalyticsExecutor(process_workers=0))
+    analytics_routes.response_cache.invalidate()
+
+    app = FastAPI()
+    app.include_router(analytics_routes.router)
+    return TestClient(app)
+
+
+def test_prediction_endpoints_forecast_with_the_active_version(client):
+    assert client.get('/api/analytics/predictions/revenue').status_code == 503
+
+    analytics_routes.load_model_version()
+    for path in ['/api/analytics/predictions/passengers', '/api/analytics/predictions/revenue']:
+        response = client.get(path, params={'days_ahead': 10})
+        assert response.status_code == 200
+        assert len(response.json()['predictions']) == len(response.json()['dates']) == 10
+
+
+@pytest.mark.parametrize('version', ['..', '...', 'missing'])
+def test_activating_an_unknown_version_is_not_found(client, version):
+    assert client.post(f'/api/analytics/models/{version}/activate').status_code == 404
@@ -0,0 +1,51 @@
+# backend/analytics/tests/test_packed_forest.py
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from analytics.components.ml_models import MLModels
+from analytics.tests.test_ml_models import make_bookings
+from analytics.utils.packed_forest import PackedForest
+
+
+@pytest.fixture(scope='module')
+def forest():
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(1500, 6))
+    y = X @ rng.normal(size=6) + rng.normal(size=1500)
+    model = RandomForestRegressor(40, min_samples_leaf=2, random_state=0).fit(X, y)
+    return model, rng.normal(size=(700, 6))
+
+
+def test_predictions_match_sklearn(forest):
+    model, X = forest
+
+    np.testing.assert_allclose(PackedForest.from_sklearn(model).predict(X), model.predict(X),
+                               rtol=1e-12, atol=0)
+
+
+def test_small_batches_match_one_batch(forest):
+    model, X = forest
+    packed = PackedForest.from_sklearn(model)
+
+    np.testing.assert_array_equal(packed.predict(X, batch_size=64), packed.predict(X))
+    np.testing.assert_array_equal(packed.predict(X[0]), packed.predict(X[:1]))
+
+
+def test_memory_mapped_forest_matches_sklearn(forest, tmp_path):
+    model, X = forest
+    path = tmp_path / 'model.forest.npy'
+    PackedForest.from_sklearn(model).save(path)
+
+    np.testing.assert_allclose(PackedForest.load(path).predict(X), model.predict(X),
+                               rtol=1e-12, atol=0)
+
+
+def test_exported_passenger_forest_matches_predictor():
+    ml_models = MLModels()
+    ml_models.train_passenger_predictor(make_bookings())
+    X = ml_models._prepare_features(make_bookings(seed=11), 'passenger_predictor')
+
+    np.testing.assert_allclose(ml_models.get_inference_model('passenger_predictor').predict(X),
+                               ml_models.passenger_predictor.predict(X), rtol=1e-12, atol=0)
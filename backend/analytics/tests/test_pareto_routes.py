@@ -0,0 +1,125 @@
+# backend/analytics/tests/test_pareto_routes.py
+
+import itertools
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.components.route_optimizer import RouteOptimizer
+from analytics.tests.test_route_engines import AIRPORTS, QUERIES, ROUTES
+
+ENGINES = ['networkx', 'csr']
+
+
+def build(engine, routes=ROUTES, airports=AIRPORTS):
+    optimizer = RouteOptimizer(engine=engine)
+    optimizer.build_route_network(routes, airports)
+    return optimizer
+
+
+def brute_force_front(routes, airports, origin, destination, max_stops, max_cost=None):
+    """Distinct non-dominated (distance, cost, stops) over all simple paths"""
+    graph = build('networkx', routes, airports).route_graph
+    if origin == destination:
+        return {(0.0, 0.0, 0)}
+    vectors = set()
+    for path in nx.all_simple_paths(graph, origin, destination, cutoff=max_stops + 1):
+        legs = list(zip(path, path[1:]))
+        cost = sum(graph[a][b]['cost'] for a, b in legs)
+        if max_cost is None or cost <= max_cost:
+            vectors.add((sum(graph[a][b]['weight'] for a, b in legs), cost, len(path) - 2))
+    return {
+        vector for vector in vectors
+        if not any(other != vector and all(o <= v for o, v in zip(other, vector)) for other in vectors)
+    }
+
+
+def front(routes):
+    return {(route['total_distance'], route['total_cost'], route['stops']) for route in routes}
+
+
+def assert_same_front(actual, expected):
+    assert len(actual) == len(expected)
+    for (distance, cost, stops), (e_distance, e_cost, e_stops) in zip(sorted(actual), sorted(expected)):
+        assert distance == pytest.approx(e_distance) and cost == pytest.approx(e_cost) and stops == e_stops
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('origin,destination', QUERIES)
+@pytest.mark.parametrize('max_stops', [0, 1, 3])
+def test_front_matches_brute_force(engine, origin, destination, max_stops):
+    routes = build(engine).find_pareto_routes(origin, destination, max_stops=max_stops)
+
+    assert_same_front(front(routes), brute_force_front(ROUTES, AIRPORTS, origin, destination, max_stops))
+    assert [route['total_distance'] for route in routes] == sorted(route['total_distance'] for route in routes)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_max_cost_drops_expensive_routes(engine):
+    optimizer = build(engine)
+    unbounded = optimizer.find_pareto_routes('JFK', 'SYD', max_stops=3)
+    routes = optimizer.find_pareto_routes('JFK', 'SYD', max_stops=3, max_cost=1900)
+
+    # The shortest route (via FRA and SIN) costs 1916
+    assert len(routes) == len(unbounded) - 1
+    assert all(route['total_cost'] <= 1900 for route in routes)
+    assert_same_front(front(routes), brute_force_front(ROUTES, AIRPORTS, 'JFK', 'SYD', 3, max_cost=1900))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_networks_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    codes = [f'A{i}' for i in range(9)]
+    airports = pd.DataFrame({
+        'code': codes,
+        'coordinates': [(rng.uniform(-50, 50), rng.uniform(-120, 120)) for _ in codes]
+    })
+    pairs = [pair for pair in itertools.combinations(codes, 2) if rng.random() < 0.45]
+    routes = pd.DataFrame(
+        [(a, b, float(rng.integers(1, 20)) * 50) for a, b in pairs],
+        columns=['origin', 'destination', 'base_cost']
+    )
+
+    expected = brute_force_front(routes, airports, 'A0', 'A8', 3)
+    for engine in ENGINES:
+        try:
+            actual = front(build(engine, routes, airports).find_pareto_routes('A0', 'A8', max_stops=3))
+        except nx.NodeNotFound:
+            actual = set()
+        assert_same_front(actual, expected)
+
+
+# A and D with two mirror-image one-stop routes (identical distance and
+# cost), a pricier nonstop and a dominated detour through E
+TIE_AIRPORTS = pd.DataFrame({
+    'code': ['A', 'B', 'C', 'D', 'E'],
+    'coordinates': [(0.0, 0.0), (1.0, 1.0), (-1.0, 1.0), (0.0, 2.0), (5.0, 1.0)]
+})
+TIE_ROUTES = pd.DataFrame(
+    [('A', 'B', 100.0), ('B', 'D', 100.0), ('A', 'C', 100.0), ('C', 'D', 100.0),
+     ('A', 'D', 500.0), ('A', 'E', 150.0), ('E', 'D', 150.0)],
+    columns=['origin', 'destination', 'base_cost']
+)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_dominance_and_ties(engine):
+    routes = build(engine, TIE_ROUTES, TIE_AIRPORTS).find_pareto_routes('A', 'D', max_stops=2)
+
+    # Nonstop: shortest but dearest. One-stop: cheaper. The equal-valued
+    # mirror routes are reported once; the detour through E is dominated.
+    assert [route['stops'] for route in routes] == [0, 1]
+    assert routes[0]['path'] == ['A', 'D']
+    assert routes[1]['path'] in (['A', 'B', 'D'], ['A', 'C', 'D'])
+    assert routes[1]['total_cost'] == 200.0
+    assert all('E' not in route['path'] for route in routes)
+    assert routes[0]['estimated_time'] == routes[0]['total_distance'] / 800
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_stop_limit_keeps_only_the_nonstop(engine):
+    routes = build(engine, TIE_ROUTES, TIE_AIRPORTS).find_pareto_routes('A', 'D', max_stops=0)
+
+    assert [route['path'] for route in routes] == [['A', 'D']]
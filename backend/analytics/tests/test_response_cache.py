@@ -0,0 +1,110 @@
+# backend/analytics/tests/test_response_cache.py
+
+import asyncio
+
+from fastapi import HTTPException, Request
+
+from analytics.api.response_cache import ResponseCache
+
+
+def make_request(path='/api/analytics/predictions/revenue', query=b'days_ahead=7', headers=()):
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'scheme': 'http',
+        'server': ('testserver', 80),
+        'path': path,
+        'query_string': query,
+        'headers': [(name.encode(), value.encode()) for name, value in headers]
+    })
+
+
+def test_concurrent_requests_share_one_computation():
+    async def scenario():
+        cache = ResponseCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'value': 42}
+
+        responses = await asyncio.gather(*(
+            cache.respond(make_request(), compute, ttl=60) for _ in range(5)
+        ))
+        return cache, calls, responses
+
+    cache, calls, responses = asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert {response.body for response in responses} == {b'{"value":42}'}
+    assert cache.stats()['inflight'] == 0
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    async def scenario():
+        cache = ResponseCache()
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return {'value': 1}
+
+        leader = asyncio.ensure_future(cache.respond(make_request(), compute, ttl=60))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.respond(make_request(), compute, ttl=60))
+        await asyncio.sleep(0)
+
+        # The leader's client disconnects while the computation runs
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        response = await follower
+
+        # The finished computation was cached for later requests
+        cached = await cache.respond(make_request(), compute, ttl=60)
+        return cache, leader, response, cached
+
+    cache, leader, response, cached = asyncio.run(scenario())
+
+    assert leader.cancelled()
+    assert response.body == b'{"value":1}'
+    assert cached.body == response.body
+    assert cache.stats()['inflight'] == 0
+    assert cache.stats()['entries'] == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        cache = ResponseCache()
+
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise HTTPException(status_code=404, detail='No route found')
+
+        results = await asyncio.gather(
+            *(cache.respond(make_request(), compute, ttl=60) for _ in range(3)),
+            return_exceptions=True
+        )
+        return cache, results
+
+    cache, results = asyncio.run(scenario())
+
+    assert all(isinstance(result, HTTPException) and result.status_code == 404 for result in results)
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['inflight'] == 0
+
+
+def test_if_none_match_gets_not_modified():
+    async def scenario():
+        cache = ResponseCache()
+        first = await cache.respond(make_request(), lambda: {'value': 3}, ttl=60)
+        second = await cache.respond(
+            make_request(headers=[('if-none-match', first.headers['etag'])]), lambda: {'value': 3}, ttl=60
+        )
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.status_code == 200
+    assert second.status_code == 304
@@ -0,0 +1,93 @@
+# backend/analytics/tests/test_route_cache.py
+
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import networkx as nx
+import pytest
+
+from analytics.components.route_cache import RouteCache
+from analytics.components.route_optimizer import RouteOptimizer
+from analytics.tests.test_route_engines import AIRPORTS, QUERIES, ROUTES
+
+
+def build(engine, cache_hubs=None, routes=ROUTES, **options):
+    optimizer = RouteOptimizer(engine=engine, cache_hubs=cache_hubs, **options)
+    optimizer.build_route_network(routes, AIRPORTS)
+    return optimizer
+
+
+@pytest.mark.parametrize('engine', ['networkx', 'csr'])
+@pytest.mark.parametrize('cache_all_pairs_threshold', [1000, 0])
+@pytest.mark.parametrize('criterion', ['distance', 'cost'])
+def test_cached_routes_match_uncached(engine, cache_all_pairs_threshold, criterion):
+    uncached = build(engine)
+    cached = build(engine, cache_hubs=2, cache_all_pairs_threshold=cache_all_pairs_threshold)
+
+    for origin, destination in QUERIES:
+        assert cached.find_optimal_route(origin, destination, criterion) == \
+            uncached.find_optimal_route(origin, destination, criterion)
+    assert cached.route_cache_stats()['hits'] > 0
+
+
+def test_concurrent_first_queries_build_once(monkeypatch):
+    optimizer = build('csr', cache_hubs=4)
+    builds = []
+    original_build = RouteCache.build
+
+    def counting_build(self, graph):
+        builds.append(threading.get_ident())
+        original_build(self, graph)
+
+    monkeypatch.setattr(RouteCache, 'build', counting_build)
+    with ThreadPoolExecutor(8) as pool:
+        routes = list(pool.map(lambda _: optimizer.find_optimal_route('JFK', 'SYD'), range(32)))
+
+    assert len(builds) == 1
+    assert all(route == routes[0] for route in routes)
+
+
+@pytest.mark.parametrize('engine', ['networkx', 'csr'])
+def test_rebuild_invalidates_cached_trees(engine):
+    optimizer = build(engine, cache_hubs=4)
+    assert optimizer.find_optimal_route('JFK', 'LHR') is not None
+    assert optimizer.route_cache.is_built
+
+    hubs = ['LHR', 'CDG', 'FRA']
+    optimizer.build_route_network(
+        ROUTES[ROUTES['origin'].isin(hubs) & ROUTES['destination'].isin(hubs)], AIRPORTS
+    )
+
+    assert not optimizer.route_cache.is_built
+    with pytest.raises(nx.NodeNotFound):
+        optimizer.find_optimal_route('JFK', 'LHR')
+
+
+def test_queries_during_rebuilds_do_not_fail():
+    optimizer = build('csr', cache_hubs=4)
+    stop = threading.Event()
+
+    def rebuild():
+        while not stop.is_set():
+            optimizer.build_route_network(ROUTES, AIRPORTS)
+
+    rebuilder = threading.Thread(target=rebuild)
+    rebuilder.start()
+    try:
+        expected = build('csr').find_optimal_route('JFK', 'SYD', 'cost')
+        for _ in range(200):
+            assert optimizer.find_optimal_route('JFK', 'SYD', 'cost') == expected
+    finally:
+        stop.set()
+        rebuilder.join()
+
+
+def test_optimizer_with_cache_pickles():
+    optimizer = build('csr', cache_hubs=4)
+    optimizer.find_optimal_route('JFK', 'SYD')
+
+    restored = pickle.loads(pickle.dumps(optimizer))
+
+    assert restored.route_cache.is_built
+    assert restored.find_optimal_route('JFK', 'SYD') == optimizer.find_optimal_route('JFK', 'SYD')
@@ -0,0 +1,147 @@
+# backend/analytics/tests/test_route_engines.py
+#
+# The networkx and CSR engines of RouteOptimizer must answer every query
+# with identical dicts.
+
+import networkx as nx
+import pandas as pd
+import pytest
+
+from analytics.components.route_optimizer import RouteOptimizer
+
+AIRPORTS = pd.DataFrame({
+    'code': ['JFK', 'LHR', 'CDG', 'FRA', 'DXB', 'SIN', 'NRT', 'SYD', 'NBO', 'ADD'],
+    'coordinates': [
+        (40.6413, -73.7781), (51.4700, -0.4543), (49.0097, 2.5479),
+        (50.0379, 8.5622), (25.2532, 55.3657), (1.3644, 103.9915),
+        (35.7720, 140.3929), (-33.9399, 151.1753), (-1.3192, 36.9278),
+        (8.9779, 38.7993)
+    ]
+})
+
+ROUTES = pd.DataFrame(
+    [
+        ('JFK', 'LHR', 612.5), ('JFK', 'CDG', 587.25), ('JFK', 'FRA', 701.0),
+        ('LHR', 'CDG', 143.75), ('LHR', 'FRA', 171.5), ('CDG', 'FRA', 129.0),
+        ('LHR', 'DXB', 498.0), ('FRA', 'DXB', 455.25), ('CDG', 'DXB', 476.5),
+        ('DXB', 'SIN', 389.0), ('DXB', 'SYD', 944.75), ('SIN', 'SYD', 402.5),
+        ('SIN', 'NRT', 366.25), ('NRT', 'SYD', 517.0), ('FRA', 'SIN', 812.5),
+        # Duplicate pair in the opposite direction: the last row wins
+        ('LHR', 'JFK', 598.0),
+        # Self-loop, never part of a route
+        ('DXB', 'DXB', 10.0),
+        # Separate component: unreachable from the rest of the network
+        ('NBO', 'ADD', 233.0)
+    ],
+    columns=['origin', 'destination', 'base_cost']
+)
+
+CRITERIA = ['distance', 'cost']
+
+QUERIES = [
+    ('JFK', 'SYD'), ('SYD', 'JFK'), ('LHR', 'NRT'), ('CDG', 'SIN'),
+    ('FRA', 'FRA'), ('DXB', 'DXB'), ('JFK', 'NBO'), ('ADD', 'NBO')
+]
+
+
+def build(engine, routes=ROUTES):
+    optimizer = RouteOptimizer(engine=engine)
+    optimizer.build_route_network(routes, AIRPORTS)
+    return optimizer
+
+
+@pytest.fixture(scope='module')
+def engines():
+    return build('networkx'), build('csr')
+
+
+@pytest.mark.parametrize('criterion', CRITERIA)
+@pytest.mark.parametrize('origin,destination', QUERIES)
+def test_optimal_route_matches(engines, origin, destination, criterion):
+    networkx_engine, csr_engine = engines
+
+    expected = networkx_engine.find_optimal_route(origin, destination, criterion)
+    assert csr_engine.find_optimal_route(origin, destination, criterion) == expected
+
+
+@pytest.mark.parametrize('criterion', CRITERIA)
+@pytest.mark.parametrize('origin,destination', QUERIES)
+@pytest.mark.parametrize('options', [
+    {},
+    {'max_stops': 1},
+    {'max_detour': 1.5},
+    {'max_stops': 2, 'max_detour': 2.0}
+])
+def test_alternative_routes_match(engines, origin, destination, criterion, options):
+    networkx_engine, csr_engine = engines
+
+    expected = networkx_engine.find_alternative_routes(
+        origin, destination, 5, criterion, **options
+    )
+    actual = csr_engine.find_alternative_routes(
+        origin, destination, 5, criterion, **options
+    )
+    assert actual == expected
+
+
+def test_queries_cover_edge_cases(engines):
+    networkx_engine, _ = engines
+
+    assert networkx_engine.find_optimal_route('JFK', 'NBO') is None
+    assert networkx_engine.find_optimal_route('FRA', 'FRA')['path'] == ['FRA']
+    assert networkx_engine.route_graph['JFK']['LHR']['cost'] == 598.0
+    assert len(networkx_engine.find_alternative_routes('JFK', 'SYD', 5)) == 5
+
+
+@pytest.mark.parametrize('engine', ['networkx', 'csr'])
+def test_unknown_airport_raises_node_not_found(engine):
+    optimizer = build(engine)
+
+    with pytest.raises(nx.NodeNotFound):
+        optimizer.find_optimal_route('JFK', 'XXX')
+    with pytest.raises(nx.NodeNotFound):
+        optimizer.find_alternative_routes('XXX', 'JFK')
+
+
+@pytest.mark.parametrize('engine', ['networkx', 'csr'])
+def test_rebuild_replaces_previous_network(engine):
+    optimizer = build(engine)
+    assert optimizer.find_optimal_route('JFK', 'LHR') is not None
+    hubs = ['LHR', 'CDG', 'FRA']
+    europe = ROUTES[ROUTES['origin'].isin(hubs) & ROUTES['destination'].isin(hubs)]
+
+    optimizer.build_route_network(europe, AIRPORTS)
+
+    with pytest.raises(nx.NodeNotFound):
+        optimizer.find_optimal_route('JFK', 'LHR')
+    other_engine = build('networkx' if engine == 'csr' else 'csr', europe)
+    assert optimizer.find_alternative_routes('LHR', 'FRA', 5, 'cost') == \
+        other_engine.find_alternative_routes('LHR', 'FRA', 5, 'cost')
+    assert optimizer.find_optimal_route('LHR', 'FRA', 'cost')['path'] == ['LHR', 'FRA']
+
+
+def test_stop_limit_bounds_the_search(monkeypatch):
+    # Only ORG-HUB-DST has at most one stop; the 16-airport clique between
+    # ORG and DST holds more simple paths than could ever be enumerated
+    clique = [f'C{i:02d}' for i in range(16)]
+    codes = ['ORG', 'HUB', 'DST'] + clique
+    airports = pd.DataFrame({
+        'code': codes,
+        'coordinates': [(10.0 + i, 20.0 + 2 * i) for i in range(len(codes))]
+    })
+    edges = [('ORG', 'HUB', 100.0), ('HUB', 'DST', 100.0), ('ORG', 'C00', 10.0), ('C15', 'DST', 10.0)]
+    edges += [(a, b, 1.0) for i, a in enumerate(clique) for b in clique[i + 1:]]
+    routes = pd.DataFrame(edges, columns=['origin', 'destination', 'base_cost'])
+
+    def unbounded(*args, **kwargs):
+        raise AssertionError('stop-limited search enumerated unbounded simple paths')
+
+    monkeypatch.setattr(nx, 'shortest_simple_paths', unbounded)
+    for engine in ['networkx', 'csr']:
+        optimizer = RouteOptimizer(engine=engine)
+        optimizer.build_route_network(routes, airports)
+
+        for criterion in CRITERIA:
+            alternatives = optimizer.find_alternative_routes('ORG', 'DST', 5, criterion, max_stops=1)
+            assert [route['path'] for route in alternatives] == [['ORG', 'HUB', 'DST']]
+        assert optimizer.find_alternative_routes('ORG', 'DST', 5, 'cost', max_stops=0) == []
@@ -0,0 +1,133 @@
+# backend/analytics/tests/test_spatial_index.py
+
+import json
+
+import numpy as np
+import pytest
+
+from analytics.utils.airport_index import AirportIndex
+from analytics.utils.geo_utils import haversine_distances
+from analytics.utils.spatial_index import AirportSpatialIndex
+
+AIRPORTS = [
+    {'code': 'JFK', 'lat': 40.6413, 'lon': -73.7781, 'name': 'John F. Kennedy', 'city': 'New York', 'country': 'US'},
+    {'code': 'LGA', 'lat': 40.7769, 'lon': -73.8740, 'name': 'LaGuardia', 'city': 'New York', 'country': 'US'},
+    {'code': 'EWR', 'lat': 40.6895, 'lon': -74.1745, 'name': 'Newark', 'city': 'Newark', 'country': 'US'},
+    {'code': 'PHL', 'lat': 39.8744, 'lon': -75.2424, 'name': 'Philadelphia', 'city': 'Philadelphia', 'country': 'US'},
+    {'code': 'BOS', 'lat': 42.3656, 'lon': -71.0096, 'name': 'Logan', 'city': 'Boston', 'country': 'US'},
+    {'code': 'LHR', 'lat': 51.4700, 'lon': -0.4543, 'name': 'Heathrow', 'city': 'London', 'country': 'GB'},
+    {'code': 'LGW', 'lat': 51.1537, 'lon': -0.1821, 'name': 'Gatwick', 'city': 'London', 'country': 'GB'},
+    {'code': 'SUV', 'lat': -18.0433, 'lon': 178.5592, 'name': 'Nausori', 'city': 'Suva', 'country': 'FJ'},
+    {'code': 'TVU', 'lat': -16.6906, 'lon': -179.8770, 'name': 'Matei', 'city': 'Taveuni', 'country': 'FJ'},
+    {'code': 'LBR', 'lat': 78.2461, 'lon': 15.4656, 'name': 'Svalbard', 'city': 'Longyearbyen', 'country': 'NO'},
+    {'code': 'NYA', 'lat': 78.9275, 'lon': 11.8743, 'name': 'Ny-Alesund', 'city': 'Ny-Alesund', 'country': 'NO'},
+    {'code': 'XXX', 'lat': None, 'lon': 10.0, 'name': 'No coordinates', 'city': '', 'country': ''},
+]
+
+
+@pytest.fixture
+def airports(tmp_path):
+    path = tmp_path / 'airport_data.json'
+    path.write_text(json.dumps(AIRPORTS), encoding='utf-8')
+    return AirportIndex.from_json(path)
+
+
+@pytest.fixture
+def index(airports):
+    return AirportSpatialIndex(airports)
+
+
+def brute_force(airports, lat, lon):
+    """(code, distance_km) of every airport, nearest first"""
+    coordinates = np.column_stack([airports.latitudes, airports.longitudes])
+    distances = haversine_distances(np.repeat([[lat, lon]], len(coordinates), axis=0), coordinates)
+    order = np.argsort(distances, kind='stable')
+    return [(airports.codes[row].decode(), distances[row]) for row in order.tolist()]
+
+
+QUERIES = [
+    (40.70, -73.90),    # New York
+    (51.30, -0.30),     # between Heathrow and Gatwick
+    (-17.50, 179.90),   # just west of the antimeridian
+    (-17.00, -179.95),  # just east of the antimeridian
+    (89.90, 120.0),     # near the North Pole
+]
+
+
+def test_entries_without_coordinates_are_skipped(airports):
+    assert 'XXX' not in airports
+    assert len(airports) == len(AIRPORTS) - 1
+
+
+@pytest.mark.parametrize('lat,lon', QUERIES)
+@pytest.mark.parametrize('k', [1, 3, 20])
+def test_nearest_matches_brute_force(airports, index, lat, lon, k):
+    expected = brute_force(airports, lat, lon)[:k]
+
+    result = index.nearest(lat, lon, k=k)
+
+    assert [airport['code'] for airport in result] == [code for code, _ in expected]
+    np.testing.assert_allclose(
+        [airport['distance_km'] for airport in result], [distance for _, distance in expected], rtol=1e-9
+    )
+
+
+@pytest.mark.parametrize('lat,lon', QUERIES)
+@pytest.mark.parametrize('radius_km', [50, 400, 2000])
+def test_within_radius_matches_brute_force(airports, index, lat, lon, radius_km):
+    expected = [code for code, distance in brute_force(airports, lat, lon) if distance <= radius_km]
+
+    result = index.within_radius(lat, lon, radius_km)
+
+    assert [airport['code'] for airport in result] == expected
+    assert all(airport['distance_km'] <= radius_km for airport in result)
+
+
+def test_antimeridian_neighbours_are_close(index):
+    result = index.nearest(-18.0433, 178.5592, k=2)
+
+    assert [airport['code'] for airport in result] == ['SUV', 'TVU']
+    assert result[0]['distance_km'] == pytest.approx(0, abs=1e-6)
+    assert result[1]['distance_km'] < 300
+
+
+def test_nearest_handles_empty_and_oversized_k(index, airports):
+    assert index.nearest(40.7, -73.9, k=0) == []
+    assert len(index.nearest(40.7, -73.9, k=100)) == len(airports)
+
+
+def test_alternate_airports_exclude_the_airport_itself(index):
+    result = index.alternate_airports('JFK', radius_km=200, k=5)
+
+    codes = [airport['code'] for airport in result]
+    assert 'JFK' not in codes
+    assert codes == ['LGA', 'EWR', 'PHL']
+    assert [airport['code'] for airport in index.alternate_airports('JFK', radius_km=200, k=2)] == ['LGA', 'EWR']
+    assert [airport['code'] for airport in index.alternate_airports('JFK')] == ['LGA', 'EWR']
+    assert [airport['code'] for airport in index.alternate_airports('LHR', radius_km=100)] == ['LGW']
+
+
+def test_alternate_airports_for_unknown_code(index):
+    assert index.alternate_airports('ZZZ') == []
+
+
+def test_near_city_covers_every_airport_of_the_city(index):
+    result = index.near_city('  new york ', radius_km=30)
+
+    assert {airport['code'] for airport in result} == {'JFK', 'LGA', 'EWR'}
+    assert [airport['distance_km'] for airport in result][:2] == [0.0, 0.0]
+    assert index.near_city('Atlantis') == []
+
+
+def test_result_fields(index):
+    [airport] = index.nearest(51.47, -0.4543, k=1)
+
+    assert airport == {
+        'code': 'LHR',
+        'name': 'Heathrow',
+        'city': 'London',
+        'country': 'GB',
+        'latitude': 51.47,
+        'longitude': -0.4543,
+        'distance_km': pytest.approx(0, abs=1e-6)
+    }
@@ -0,0 +1,87 @@
+# backend/analytics/tests/test_timezone_resolver.py
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.utils.airport_index import AirportIndex
+from analytics.utils.timezone_resolver import TimezoneResolver
+
+AIRPORTS = [
+    {'code': 'JFK', 'lat': 40.6413, 'lon': -73.7781, 'tz': 'America/New_York'},
+    {'code': 'LHR', 'lat': 51.4700, 'lon': -0.4543, 'tz': 'Europe/London'},
+    {'code': 'SYD', 'lat': -33.9399, 'lon': 151.1753, 'tz': 'Australia/Sydney'},
+    {'code': 'KTM', 'lat': 27.6966, 'lon': 85.3591, 'tz': 'Asia/Kathmandu'},
+    {'code': 'NOT', 'lat': 10.0, 'lon': 10.0, 'tz': ''},
+]
+
+
+class CountingFinder:
+    """Stands in for TimezoneFinder and records its lookups"""
+
+    def __init__(self):
+        self.calls = []
+
+    def timezone_at(self, lat, lng):
+        self.calls.append((lat, lng))
+        return 'Etc/GMT-1'
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    path = tmp_path / 'airport_data.json'
+    path.write_text(json.dumps(AIRPORTS), encoding='utf-8')
+    resolver = TimezoneResolver(AirportIndex.from_json(path), fallback_cache_size=8)
+    resolver._timezone_finder = CountingFinder()
+    return resolver
+
+
+def test_airport_timezones_come_from_the_index(resolver):
+    assert resolver.timezone_for_airport('LHR') == 'Europe/London'
+    assert resolver.timezone_for_airport('NOT') is None
+    assert resolver.timezone_for_airport('ZZZ') is None
+
+
+def test_airport_coordinates_skip_the_fallback(resolver):
+    assert resolver.timezone_at(40.6413, -73.7781) == 'America/New_York'
+    # Matched after rounding to COORDINATE_PRECISION
+    assert resolver.timezone_at(-33.93991, 151.17529) == 'Australia/Sydney'
+    assert resolver.timezone_finder.calls == []
+
+
+def test_other_coordinates_use_the_memoized_fallback(resolver):
+    assert resolver.timezone_at(48.0, 11.0) == 'Etc/GMT-1'
+    assert resolver.timezone_at(48.00001, 11.00002) == 'Etc/GMT-1'
+    assert resolver.timezone_at(10.0, 10.0) == 'Etc/GMT-1'
+
+    assert resolver.timezone_finder.calls == [(48.0, 11.0), (10.0, 10.0)]
+
+
+def test_local_arrival_times(resolver):
+    result = resolver.local_arrival_times(
+        ['2026-07-01 18:00', '2026-01-15 09:30', '2026-07-01 18:00', '2026-03-08 01:30'],
+        ['JFK', 'LHR', 'ZZZ', 'JFK'],
+        ['LHR', 'KTM', 'SYD', 'JFK'],
+        [7.0, 10.5, 20.0, 2.0]
+    )
+
+    assert result['origin_timezone'].tolist()[:2] == ['America/New_York', 'Europe/London']
+    assert pd.isna(result['origin_timezone'][2])
+    # 18:00 EDT + 7h is 06:00 BST; 09:30 GMT + 10.5h is 01:45 NPT
+    assert result['local_arrival_time'].tolist()[:2] == [
+        pd.Timestamp('2026-07-02 06:00'), pd.Timestamp('2026-01-16 01:45')
+    ]
+    np.testing.assert_allclose(result['timezone_difference'][[0, 1]], [5.0, 5.75])
+    assert pd.isna(result['local_arrival_time'][2]) and np.isnan(result['timezone_difference'][2])
+    # Crosses the spring-forward gap: 01:30 EST + 2h = 04:30 EDT
+    assert result['local_arrival_time'][3] == pd.Timestamp('2026-03-08 04:30')
+    assert result['timezone_difference'][3] == 1.0
+
+
+def test_local_arrival_times_without_durations(resolver):
+    result = resolver.local_arrival_times(['2026-12-01 12:00'], ['LHR'], ['SYD'])
+
+    assert result['local_arrival_time'][0] == pd.Timestamp('2026-12-01 23:00')
+    assert result['timezone_difference'][0] == 11.0
@@ -0,0 +1,51 @@
+# backend/analytics/tests/test_training_orchestrator.py
+
+import numpy as np
+import pytest
+
+from analytics.components.ml_models import MLModels
+from analytics.components.training_orchestrator import TrainingOrchestrator
+from analytics.tests.test_ml_models import make_bookings
+
+MODELS = ['passenger_predictor', 'revenue_predictor', 'anomaly_detector']
+
+
+@pytest.fixture(scope='module')
+def sequential():
+    data = make_bookings(days=120)
+    ml_models = MLModels()
+    ml_models.train_passenger_predictor(data)
+    ml_models.train_revenue_predictor(data)
+    ml_models.train_anomaly_detector(data)
+    return ml_models
+
+
+def assert_same_predictions(ml_models, sequential):
+    queries = make_bookings(days=30, seed=9)
+
+    np.testing.assert_allclose(ml_models.predict_passengers(queries),
+                               sequential.predict_passengers(queries), rtol=1e-12)
+    np.testing.assert_allclose(ml_models.predict_revenue(queries),
+                               sequential.predict_revenue(queries), rtol=1e-12)
+    np.testing.assert_array_equal(ml_models.detect_anomalies(queries),
+                                  sequential.detect_anomalies(queries))
+
+
+def test_thread_backend_matches_sequential_training(sequential):
+    ml_models = MLModels()
+    report = TrainingOrchestrator(ml_models, backend='thread').train_all(make_bookings(days=120), MODELS)
+
+    assert set(report['models']) == set(MODELS)
+    assert_same_predictions(ml_models, sequential)
+
+
+def test_process_backend_matches_sequential_training(sequential):
+    ml_models = MLModels()
+    TrainingOrchestrator(ml_models, max_workers=2).train_all(make_bookings(days=120), MODELS)
+
+    assert_same_predictions(ml_models, sequential)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        TrainingOrchestrator(MLModels(), backend='fork')
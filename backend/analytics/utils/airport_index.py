@@ -0,0 +1,172 @@
+# airport_index.py
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+ANALYTICS_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_AIRPORT_DATA_PATH = ANALYTICS_DIR.parent.parent / 'frontend' / 'public' / 'Chatbot' / 'airport_data.json'
+DEFAULT_CACHE_PATH = ANALYTICS_DIR / '.cache' / 'airport_index.npy'
+
+
+class AirportIndex:
+    """
+    In-process airport lookup table backed by NumPy arrays.
+
+    Rows live in a single structured array (code, lat, lon, tz, name, city,
+    country) sorted by code, with text stored as UTF-8 bytes. The array is
+    persisted as an ``.npy`` file and memory-mapped on later loads, so
+    startup does not re-parse the JSON.
+    """
+
+    def __init__(self, records: np.ndarray):
+        self.records = records
+        self.codes = records['code']
+        self.latitudes = records['lat']
+        self.longitudes = records['lon']
+        self.row_index: Dict[str, int] = {
+            code.decode(): i for i, code in enumerate(self.codes.tolist())
+        }
+
+    @classmethod
+    def from_json(cls, path: Path = DEFAULT_AIRPORT_DATA_PATH) -> 'AirportIndex':
+        """Build the index from the bundled airport_data.json"""
+        with open(path, encoding='utf-8') as f:
+            airports = json.load(f)
+
+        airports = [
+            airport for airport in airports
+            if airport.get('code') and airport.get('lat') and airport.get('lon')
+        ]
+        airports.sort(key=lambda airport: airport['code'])
+
+        def text(airport, field):
+            return (airport.get(field) or '').encode('utf-8')
+
+        def width(field):
+            return max([len(text(airport, field)) for airport in airports] + [1])
+
+        dtype = np.dtype([
+            ('code', f'S{width("code")}'),
+            ('lat', np.float64),
+            ('lon', np.float64),
+            ('tz', f'S{width("tz")}'),
+            ('name', f'S{width("name")}'),
+            ('city', f'S{width("city")}'),
+            ('country', f'S{width("country")}')
+        ])
+        records = np.array(
+            [
+                (
+                    text(airport, 'code'),
+                    float(airport['lat']),
+                    float(airport['lon']),
+                    text(airport, 'tz'),
+                    text(airport, 'name'),
+                    text(airport, 'city'),
+                    text(airport, 'country')
+                )
+                for airport in airports
+            ],
+            dtype=dtype
+        )
+        return cls(records)
+
+    @classmethod
+    def load(
+        cls,
+        data_path: Path = DEFAULT_AIRPORT_DATA_PATH,
+        cache_path: Optional[Path] = DEFAULT_CACHE_PATH
+    ) -> 'AirportIndex':
+        """
+        Load the index from its binary cache, rebuilding it from JSON when
+        the cache is missing or older than the JSON file.
+        """
+        data_path = Path(data_path)
+        if cache_path is not None:
+            cache_path = Path(cache_path)
+            if cache_path.exists() and cache_path.stat().st_mtime >= data_path.stat().st_mtime:
+                return cls(np.load(cache_path, mmap_mode='r'))
+
+        index = cls.from_json(data_path)
+        if cache_path is not None:
+            try:
+                index.save(cache_path)
+            except OSError:
+                # Read-only deployments still work, they just parse the JSON
+                pass
+        return index
+
+    def save(self, path: Path):
+        """Persist the records as an .npy file (written atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(self.records))
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.row_index
+
+    def get_coordinates(self, code: str) -> Optional[Tuple[float, float]]:
+        """(latitude, longitude) of an airport, or None if unknown"""
+        row = self.row_index.get(code)
+        if row is None:
+            return None
+        return float(self.latitudes[row]), float(self.longitudes[row])
+
+    def get_timezone(self, code: str) -> Optional[str]:
+        """IANA timezone name of an airport, or None if unknown"""
+        row = self.row_index.get(code)
+        if row is None or not self.records['tz'][row]:
+            return None
+        return self.records['tz'][row].decode()
+
+    def get_airport(self, code: str) -> Optional[Dict]:
+        """All indexed fields of an airport as a dict"""
+        row = self.row_index.get(code)
+        if row is None:
+            return None
+        record = self.records[row]
+        return {
+            field: value.decode('utf-8') if isinstance(value, bytes) else value
+            for field, value in zip(self.records.dtype.names, record.item())
+        }
+
+    def rows(self, codes: Sequence[str]) -> np.ndarray:
+        """Row numbers for many codes at once (-1 for unknown codes)"""
+        return np.array([self.row_index.get(code, -1) for code in codes], dtype=np.int64)
+
+    def coordinates(self, codes: Sequence[str]) -> np.ndarray:
+        """(n, 2) latitude/longitude array for many codes (NaN for unknown codes)"""
+        rows = self.rows(codes)
+        known = rows >= 0
+        result = np.full((len(rows), 2), np.nan)
+        result[known, 0] = self.latitudes[rows[known]]
+        result[known, 1] = self.longitudes[rows[known]]
+        return result
+
+
+_airport_index: Optional[AirportIndex] = None
+
+
+def get_airport_index() -> AirportIndex:
+    """
+    Process-wide airport index, loaded on first use.
+
+    Paths can be overridden with the AIRPORT_DATA_PATH and
+    AIRPORT_INDEX_CACHE environment variables.
+    """
+    global _airport_index
+    if _airport_index is None:
+        _airport_index = AirportIndex.load(
+            os.environ.get('AIRPORT_DATA_PATH', DEFAULT_AIRPORT_DATA_PATH),
+            os.environ.get('AIRPORT_INDEX_CACHE', DEFAULT_CACHE_PATH)
+        )
+    return _airport_index
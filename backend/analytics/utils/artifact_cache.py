@@ -0,0 +1,227 @@
+# artifact_cache.py
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+ANALYTICS_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_ARTIFACT_DIR = ANALYTICS_DIR / '.cache' / 'artifacts'
+DEFAULT_MAX_BYTES = 1 << 30
+
+Content = Union[str, bytes]
+
+
+class ArtifactCache:
+    """
+    Content-addressed on-disk store for generated artifacts (GeoJSON, HTML).
+
+    Keys are SHA-256 digests over the input data and render options, so an
+    artifact is reused for as long as its inputs are unchanged. Files are
+    written atomically and laid out as ``<root>/<namespace>/<key><suffix>``.
+
+    Stale entries are never looked up again, so the store is bounded: a hit
+    refreshes the file's mtime, and every write evicts the least recently
+    used files once the store exceeds max_bytes, as well as files unused
+    for longer than max_age.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path] = DEFAULT_ARTIFACT_DIR,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        max_age: Optional[float] = None
+    ):
+        """
+        Args:
+            root: Directory holding the artifacts
+            max_bytes: Evict least recently used artifacts above this total
+                size (None for no size bound)
+            max_age: Evict artifacts unused for this many seconds (None for
+                no age bound)
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def fingerprint(*parts: Any) -> str:
+        """
+        Hash data frames, arrays and JSON-serialisable options into a key
+
+        DataFrames are hashed by column names and row contents (not index),
+        so reloading the same data yields the same key.
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, pd.DataFrame):
+                digest.update(json.dumps([str(column) for column in part.columns]).encode())
+                digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+            elif isinstance(part, pd.Series):
+                digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+            elif isinstance(part, np.ndarray):
+                digest.update(str(part.dtype).encode())
+                digest.update(np.ascontiguousarray(part).tobytes())
+            else:
+                digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+            # Separator so ('ab', 'c') and ('a', 'bc') differ
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def path(self, namespace: str, key: str, suffix: str) -> Path:
+        return self.root / namespace / f'{key}{suffix}'
+
+    def get(self, namespace: str, key: str, suffix: str) -> Optional[Path]:
+        """Path of a stored artifact, or None if it has not been generated"""
+        path = self.path(namespace, key, suffix)
+        try:
+            # Mark as recently used for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except OSError:
+            # Read-only stores still serve hits, they just do not track use
+            if not path.exists():
+                self.misses += 1
+                return None
+        self.hits += 1
+        return path
+
+    def put(self, namespace: str, key: str, suffix: str, content: Content) -> Path:
+        """Store an artifact (written atomically) and return its path"""
+        mode = 'wb' if isinstance(content, bytes) else 'w'
+
+        def write(tmp_path: Path):
+            with open(tmp_path, mode, **({} if mode == 'wb' else {'encoding': 'utf-8'})) as f:
+                f.write(content)
+
+        return self.store(namespace, key, suffix, write)
+
+    def store(self, namespace: str, key: str, suffix: str, write: Callable[[Path], None]) -> Path:
+        """
+        Store an artifact written by write(tmp_path) and return its path
+
+        For artifacts produced by a library writer (Feather, Parquet). The
+        file is moved into place atomically and older artifacts are
+        evicted if the store is over its bounds.
+        """
+        path = self.path(namespace, key, suffix)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Delete least recently used artifacts until the store is within
+        max_bytes, along with any artifact unused for longer than max_age
+
+        Args:
+            keep: Artifact that is never evicted (the one just written)
+
+        Returns:
+            Number of artifacts deleted
+        """
+        if self.max_bytes is None and self.max_age is None:
+            return 0
+
+        artifacts = []
+        for path in self._artifact_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            artifacts.append((stat.st_mtime, stat.st_size, path))
+        artifacts.sort()
+
+        total = sum(size for _, size, _ in artifacts)
+        oldest_allowed = time.time() - self.max_age if self.max_age is not None else None
+        evicted = 0
+        for mtime, size, path in artifacts:
+            expired = oldest_allowed is not None and mtime < oldest_allowed
+            if not expired and (self.max_bytes is None or total <= self.max_bytes):
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        self.evictions += evicted
+        return evicted
+
+    def get_or_create(
+        self,
+        namespace: str,
+        key: str,
+        suffix: str,
+        builder: Callable[[], Content]
+    ) -> Path:
+        """Return the stored artifact, generating it with builder on a miss"""
+        path = self.get(namespace, key, suffix)
+        if path is None:
+            path = self.put(namespace, key, suffix, builder())
+        return path
+
+    def get_or_create_json(self, namespace: str, key: str, builder: Callable[[], Any]) -> Any:
+        """JSON variant of get_or_create returning the decoded document"""
+        path = self.get(namespace, key, '.json')
+        if path is not None:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+
+        document = builder()
+        self.put(namespace, key, '.json', json.dumps(document, separators=(',', ':')))
+        return document
+
+    def clear(self, namespace: Optional[str] = None):
+        """Delete stored artifacts, optionally only one namespace"""
+        directories = [self.root / namespace] if namespace else (
+            [path for path in self.root.iterdir() if path.is_dir()] if self.root.exists() else []
+        )
+        for directory in directories:
+            if not directory.exists():
+                continue
+            for path in directory.iterdir():
+                if path.is_file():
+                    path.unlink()
+
+    def stats(self) -> Dict:
+        """Hit/miss/eviction counters and on-disk footprint"""
+        files = self._artifact_files()
+        lookups = self.hits + self.misses
+        return {
+            'artifacts': len(files),
+            'disk_bytes': sum(path.stat().st_size for path in files),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def _artifact_files(self) -> List[Path]:
+        """Stored artifacts, excluding files still being written"""
+        if not self.root.exists():
+            return []
+        return [
+            path for path in self.root.rglob('*')
+            if path.is_file() and not path.name.endswith('.tmp')
+        ]
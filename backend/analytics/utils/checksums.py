@@ -0,0 +1,39 @@
+# checksums.py
+import hashlib
+from pathlib import Path
+from typing import Dict, Union
+
+
+def sha256_file(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checksum_tree(root: Union[str, Path], relative: str) -> Dict[str, str]:
+    """
+    Checksums of a file or of every file under a directory.
+
+    Keys are POSIX paths relative to root, so manifests are portable.
+    """
+    root = Path(root)
+    target = root / relative
+    files = [target] if target.is_file() else sorted(p for p in target.rglob('*') if p.is_file())
+    return {path.relative_to(root).as_posix(): sha256_file(path) for path in files}
+
+
+def verify_checksums(root: Union[str, Path], expected: Dict[str, str], relative: str):
+    """Raise ValueError unless the files under relative match expected"""
+    wanted = {
+        name: digest for name, digest in expected.items()
+        if name == relative or name.startswith(relative.rstrip('/') + '/')
+    }
+    actual = checksum_tree(root, relative) if (Path(root) / relative).exists() else {}
+    if actual != wanted:
+        changed = sorted(set(wanted) ^ set(actual) | {
+            name for name in set(wanted) & set(actual) if wanted[name] != actual[name]
+        })
+        raise ValueError(f"Checksum mismatch under {Path(root) / relative}: {', '.join(changed)}")
@@ -0,0 +1,402 @@
+# csr_graph.py
+import heapq
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+
+class CSRRouteGraph:
+    """
+    Undirected route network stored as NumPy CSR arrays.
+
+    Airport codes are interned to int32 ids. Every route is stored in both
+    directions, so the neighbours of airport ``i`` are
+    ``indices[indptr[i]:indptr[i + 1]]`` (sorted), with the matching edge
+    attributes in ``distance`` and ``cost``.
+    """
+
+    CRITERIA = ('distance', 'cost', 'hops')
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        distance: np.ndarray,
+        cost: np.ndarray
+    ):
+        self.codes = codes
+        self.indptr = indptr
+        self.indices = indices
+        self.distance = distance
+        self.cost = cost
+        self.code_index: Dict[str, int] = {code: i for i, code in enumerate(codes.tolist())}
+        self.twin = self._twin_positions()
+        self._matrices: Dict[str, csr_matrix] = {}
+
+    @classmethod
+    def from_edges(
+        cls,
+        origins: Sequence[str],
+        destinations: Sequence[str],
+        distances: Sequence[float],
+        costs: Sequence[float]
+    ) -> 'CSRRouteGraph':
+        """
+        Build the graph from parallel edge arrays.
+
+        Duplicate airport pairs keep the attributes of their last row, the
+        same as repeated ``nx.Graph.add_edge`` calls. Self-loops are dropped
+        since they never lie on a route.
+        """
+        origins = np.asarray(origins, dtype=object)
+        destinations = np.asarray(destinations, dtype=object)
+        distances = np.asarray(distances, dtype=np.float64)
+        costs = np.asarray(costs, dtype=np.float64)
+
+        n = len(origins)
+        codes, airports = pd.factorize(np.concatenate([origins, destinations]))
+        airports = np.asarray(airports, dtype=object)
+        node_count = len(airports)
+        u = codes[:n].astype(np.int64)
+        v = codes[n:].astype(np.int64)
+
+        keep = u != v
+        u, v, distances, costs = u[keep], v[keep], distances[keep], costs[keep]
+
+        # Last occurrence of each undirected pair wins
+        pair_keys = np.minimum(u, v) * node_count + np.maximum(u, v)
+        _, last_reversed = np.unique(pair_keys[::-1], return_index=True)
+        last = len(pair_keys) - 1 - last_reversed
+        u, v, distances, costs = u[last], v[last], distances[last], costs[last]
+
+        rows = np.concatenate([u, v])
+        cols = np.concatenate([v, u])
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+
+        indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=node_count), out=indptr[1:])
+
+        return cls(
+            codes=airports,
+            indptr=indptr,
+            indices=cols.astype(np.int32),
+            distance=np.concatenate([distances, distances])[order],
+            cost=np.concatenate([costs, costs])[order]
+        )
+
+    @classmethod
+    def from_networkx(cls, graph) -> 'CSRRouteGraph':
+        """Snapshot an undirected networkx route graph with 'weight'/'cost' edge attributes"""
+        edges = list(graph.edges(data=True))
+        return cls.from_edges(
+            [u for u, _, _ in edges],
+            [v for _, v, _ in edges],
+            [data['weight'] for _, _, data in edges],
+            [data['cost'] for _, _, data in edges]
+        )
+
+    @property
+    def node_count(self) -> int:
+        return len(self.codes)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of undirected routes"""
+        return len(self.indices) // 2
+
+    @property
+    def degree(self) -> np.ndarray:
+        """Number of routes served by each airport"""
+        return np.diff(self.indptr)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the CSR arrays (excluding cached matrices)"""
+        return sum(
+            array.nbytes
+            for array in (self.indptr, self.indices, self.distance, self.cost, self.twin)
+        )
+
+    def has_airport(self, code: str) -> bool:
+        return code in self.code_index
+
+    def index_of(self, code: str) -> int:
+        """Return the interned id of an airport code, raising KeyError if unknown"""
+        return self.code_index[code]
+
+    def weights(self, criterion: str) -> np.ndarray:
+        """Per-edge weights for an optimization criterion"""
+        if criterion == 'distance':
+            return self.distance
+        if criterion == 'cost':
+            return self.cost
+        if criterion == 'hops':
+            return np.ones(len(self.indices))
+        raise ValueError(f"Unknown optimization criterion: {criterion}")
+
+    def matrix(self, criterion: str) -> csr_matrix:
+        """Sparse adjacency matrix weighted by ``criterion`` (cached)"""
+        if criterion not in self._matrices:
+            self._matrices[criterion] = self._as_matrix(self.weights(criterion))
+        return self._matrices[criterion]
+
+    def edge_position(self, u: int, v: int) -> int:
+        """Position of the directed edge u -> v in the CSR arrays"""
+        start, end = self.indptr[u], self.indptr[u + 1]
+        pos = start + int(np.searchsorted(self.indices[start:end], v))
+        if pos >= end or self.indices[pos] != v:
+            raise KeyError((self.codes[u], self.codes[v]))
+        return pos
+
+    def path_totals(self, path: List[int]) -> Tuple[float, float]:
+        """Total distance and cost along a path of airport ids"""
+        positions = [self.edge_position(path[i], path[i + 1]) for i in range(len(path) - 1)]
+        return (
+            sum(self.distance[positions].tolist()),
+            sum(self.cost[positions].tolist())
+        )
+
+    def path_codes(self, path: List[int]) -> List[str]:
+        return self.codes[path].tolist()
+
+    def shortest_path_tree(self, source: int, criterion: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Distances and predecessors from ``source`` to every airport"""
+        return dijkstra(
+            self.matrix(criterion),
+            directed=True,
+            indices=source,
+            return_predecessors=True
+        )
+
+    def shortest_path(self, origin: int, destination: int, criterion: str) -> Optional[List[int]]:
+        """Shortest path between two airport ids, or None if unreachable"""
+        if origin == destination:
+            return [origin]
+        dist, predecessors = self.shortest_path_tree(origin, criterion)
+        if not np.isfinite(dist[destination]):
+            return None
+        return self.walk_predecessors(predecessors, destination)
+
+    def k_shortest_paths(
+        self,
+        origin: int,
+        destination: int,
+        criterion: str,
+        max_hops: Optional[int] = None,
+        max_detour: Optional[float] = None
+    ) -> Iterator[List[int]]:
+        """
+        Lazily yield simple paths in order of increasing weight (Yen's algorithm).
+
+        The shortest-path tree towards ``destination`` is computed once and
+        reused by every spur search: when the tree path from the spur node
+        avoids the removed root nodes and edges (and fits the hop budget) it
+        is already the spur's shortest path. Otherwise the spur path is
+        searched on a masked copy of the weights, with a Dijkstra bounded by
+        the detour limit or, under a hop limit, a hop-layered Bellman-Ford.
+
+        Args:
+            max_hops: Only yield paths with at most this many edges
+            max_detour: Stop once paths weigh more than this multiple of the
+                shortest path
+        """
+        weights = self.weights(criterion)
+        if origin == destination:
+            yield [origin]
+            return
+
+        to_target, next_hop = self.shortest_path_tree(destination, criterion)
+        if not np.isfinite(to_target[origin]):
+            return
+
+        max_weight = to_target[origin] * max_detour if max_detour is not None else np.inf
+        working = weights.copy()
+        first = self.walk_predecessors(next_hop, origin)[::-1]
+        if max_hops is not None and len(first) - 1 > max_hops:
+            first_weight, first = self._hop_limited_path(working, origin, destination, max_hops)
+            if first is None or first_weight > max_weight:
+                return
+
+        accepted = [first]
+        candidates: List[Tuple[float, int, Tuple[int, ...]]] = []
+        seen = {tuple(first)}
+        yield first
+
+        previous = first
+        while True:
+            root_weight = 0.0
+            for i in range(len(previous) - 1):
+                if i > 0:
+                    root_weight += weights[self.edge_position(previous[i - 1], previous[i])]
+                if max_hops is not None and i + 1 > max_hops:
+                    break
+
+                spur_node = previous[i]
+                root = previous[:i + 1]
+                if root_weight + to_target[spur_node] > max_weight:
+                    continue
+
+                removed_edges = [
+                    self.edge_position(path[i], path[i + 1])
+                    for path in accepted
+                    if len(path) > i + 1 and path[:i + 1] == root
+                ]
+                hop_budget = max_hops - i if max_hops is not None else None
+                spur = self._tree_spur(next_hop, spur_node, root[:-1], removed_edges)
+                if spur is not None and (hop_budget is None or len(spur) - 1 <= hop_budget):
+                    spur_weight = to_target[spur_node]
+                elif hop_budget is not None:
+                    masked = self._masked_positions(removed_edges, root[:-1])
+                    working[masked] = np.inf
+                    spur_weight, spur = self._hop_limited_path(working, spur_node, destination, hop_budget)
+                    working[masked] = weights[masked]
+
+                    if spur is None or len(set(spur)) < len(spur):
+                        continue
+                else:
+                    masked = self._masked_positions(removed_edges, root[:-1])
+                    working[masked] = np.inf
+                    dist, predecessors = dijkstra(
+                        self._as_matrix(working),
+                        directed=True,
+                        indices=spur_node,
+                        return_predecessors=True,
+                        limit=max_weight - root_weight
+                    )
+                    working[masked] = weights[masked]
+
+                    if not np.isfinite(dist[destination]):
+                        continue
+                    spur = self.walk_predecessors(predecessors, destination)
+                    spur_weight = dist[destination]
+
+                candidate = root[:-1] + spur
+                key = tuple(candidate)
+                if key in seen:
+                    continue
+                seen.add(key)
+                heapq.heappush(candidates, (root_weight + spur_weight, len(candidate), key))
+
+            if not candidates:
+                return
+            weight, _, best = heapq.heappop(candidates)
+            if weight > max_weight:
+                return
+
+            previous = list(best)
+            accepted.append(previous)
+            yield previous
+
+    def _as_matrix(self, data: np.ndarray) -> csr_matrix:
+        return csr_matrix(
+            (data, self.indices, self.indptr),
+            shape=(self.node_count, self.node_count),
+            copy=False
+        )
+
+    def _tree_spur(
+        self,
+        next_hop: np.ndarray,
+        spur_node: int,
+        removed_nodes: List[int],
+        removed_edges: List[int]
+    ) -> Optional[List[int]]:
+        """Tree path from the spur node, or None if it uses a removed node or edge"""
+        blocked_nodes = set(removed_nodes)
+        blocked_edges = set(removed_edges)
+        blocked_edges.update(self.twin[removed_edges].tolist())
+
+        path = [spur_node]
+        node = spur_node
+        while next_hop[node] >= 0:
+            following = int(next_hop[node])
+            if following in blocked_nodes or self.edge_position(node, following) in blocked_edges:
+                return None
+            path.append(following)
+            node = following
+        return path
+
+    def _hop_limited_path(
+        self,
+        data: np.ndarray,
+        source: int,
+        destination: int,
+        max_hops: int
+    ) -> Tuple[float, Optional[List[int]]]:
+        """
+        Shortest path using at most ``max_hops`` edges (hop-layered Bellman-Ford).
+
+        Each layer relaxes every edge at once with NumPy. Ties keep the
+        earlier layer, so the fewest-hop optimum is returned.
+        """
+        node_count = self.node_count
+        rows = np.repeat(np.arange(node_count), np.diff(self.indptr))
+        # Incoming edges of v are the twins of v's outgoing edges, grouped by v
+        incoming = self.twin
+        incoming_sources = rows[incoming]
+        has_edges = np.diff(self.indptr) > 0
+        starts = self.indptr[:-1][has_edges]
+
+        dist = np.full(node_count, np.inf)
+        dist[source] = 0.0
+        layers = []
+        for _ in range(max_hops):
+            arrival = dist[incoming_sources] + data[incoming]
+            best = np.full(node_count, np.inf)
+            best[has_edges] = np.minimum.reduceat(arrival, starts)
+
+            improved = best < dist
+            if not improved.any():
+                break
+
+            # First incoming edge achieving the minimum for each improved node
+            hits = np.flatnonzero((arrival == best[rows]) & improved[rows])
+            targets, first_hit = np.unique(rows[hits], return_index=True)
+            predecessors = np.full(node_count, -1, dtype=np.int64)
+            predecessors[targets] = incoming_sources[hits[first_hit]]
+
+            dist = np.where(improved, best, dist)
+            layers.append(predecessors)
+
+        if not np.isfinite(dist[destination]):
+            return np.inf, None
+
+        path = [destination]
+        node = destination
+        layer = len(layers) - 1
+        while node != source:
+            while layers[layer][node] < 0:
+                layer -= 1
+            node = int(layers[layer][node])
+            path.append(node)
+            layer -= 1
+        return dist[destination], path[::-1]
+
+    def _masked_positions(self, removed_edges: List[int], removed_nodes: List[int]) -> np.ndarray:
+        """Edge positions to disable for removed edges and nodes (both directions)"""
+        positions = [np.asarray(removed_edges, dtype=np.int64)]
+        for node in removed_nodes:
+            positions.append(np.arange(self.indptr[node], self.indptr[node + 1]))
+        positions = np.concatenate(positions)
+        return np.concatenate([positions, self.twin[positions]])
+
+    @staticmethod
+    def walk_predecessors(predecessors: np.ndarray, destination: int) -> List[int]:
+        path = [destination]
+        node = predecessors[destination]
+        while node >= 0:
+            path.append(int(node))
+            node = predecessors[node]
+        return path[::-1]
+
+    def _twin_positions(self) -> np.ndarray:
+        """For each directed edge u -> v, the position of its reverse v -> u"""
+        node_count = self.node_count
+        rows = np.repeat(np.arange(node_count, dtype=np.int64), np.diff(self.indptr))
+        keys = rows * node_count + self.indices
+        return np.searchsorted(keys, self.indices.astype(np.int64) * node_count + rows)
@@ -0,0 +1,232 @@
+# dataset_loader.py
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .artifact_cache import ANALYTICS_DIR, ArtifactCache
+
+try:
+    import pyarrow
+    import pyarrow.feather
+except ImportError:
+    pyarrow = None
+
+# Column types of the source CSVs. 'airport' columns are categoricals that
+# share one set of airport codes, so origin and destination codes compare
+# and join directly. 'integer' columns (counts) become int32. Money columns
+# stay float64: float32 carries about 7 significant digits, which loses
+# cents above roughly 100,000. Unlisted columns keep pandas' inferred types.
+FLIGHT_SCHEMA = {
+    'origin_airport': 'airport',
+    'destination_airport': 'airport',
+    'airline': 'category',
+    'flight_number': 'category',
+    'departure_time': 'datetime',
+    'arrival_time': 'datetime',
+    'distance': 'float32',
+    'base_cost': 'float64',
+}
+BOOKING_SCHEMA = {
+    'origin': 'airport',
+    'destination': 'airport',
+    # Route columns grouped by FlightAnalyticsSystem (ROUTE_COLUMNS)
+    'origin_airport': 'airport',
+    'destination_airport': 'airport',
+    'payment_method': 'category',
+    'hotel_name': 'category',
+    'booking_date': 'datetime',
+    'booking_time': 'datetime',
+    'passenger_count': 'integer',
+    'booking_count': 'integer',
+    'ticket_price': 'float64',
+    # Summed over the whole table by the dashboards; kept at full precision
+    'total_revenue': 'float64',
+    'total_cost': 'float64',
+}
+HOTEL_SCHEMA = {
+    'hotel_name': 'category',
+    'city': 'category',
+    'booking_date': 'datetime',
+    'bookings': 'integer',
+    'booking_count': 'integer',
+    'price': 'float64',
+}
+
+CACHE_FORMATS = ('feather', 'parquet')
+# Columnar copies are kept apart from the rendered map artifacts, under a
+# budget sized for a few multi-million-row tables, so loading datasets
+# never evicts maps and maps never evict datasets
+DEFAULT_DATASET_CACHE_DIR = ANALYTICS_DIR / '.cache' / 'datasets'
+DEFAULT_DATASET_CACHE_MAX_BYTES = 8 << 30
+# Bump when the schemas or the conversion rules change
+SCHEMA_VERSION = 3
+
+
+class DatasetLoader:
+    """
+    Chunked CSV reader producing compact, typed DataFrames.
+
+    Each CSV is read chunksize rows at a time with the schema's dtypes, so
+    strings never materialise as one large object column: airport codes
+    and other repeated labels become categoricals, dates are parsed and
+    measurements other than money are stored as float32. Chunks are
+    folded into per-column lists as they arrive and joined one column at a
+    time, so peak memory is the parsed table plus one column and one
+    chunk rather than two copies of the table.
+
+    The result can be cached as an uncompressed Feather (Arrow IPC) file
+    or as Parquet. Feather entries are written as one record batch and
+    memory-mapped on load: numeric and datetime columns are zero-copy,
+    read-only views of the file's pages, while categoricals and strings
+    are still copied into pandas. Cache entries are keyed by the source
+    file's path, size and modification time, so editing a CSV invalidates
+    its entry.
+    """
+
+    def __init__(
+        self,
+        chunksize: int = 100_000,
+        cache_format: Optional[str] = 'feather',
+        artifact_cache: Optional[ArtifactCache] = None
+    ):
+        """
+        Args:
+            chunksize: CSV rows parsed at a time
+            cache_format: 'feather', 'parquet' or None to disable the cache
+                (also disabled when pyarrow is not installed)
+            artifact_cache: Store for the columnar copies (default: a
+                dataset-only store under DEFAULT_DATASET_CACHE_DIR)
+        """
+        if cache_format is not None and cache_format not in CACHE_FORMATS:
+            raise ValueError(f"Unknown cache format {cache_format!r}; expected one of {CACHE_FORMATS}")
+        self.chunksize = chunksize
+        self.cache_format = cache_format if pyarrow is not None else None
+        self.artifact_cache = artifact_cache or ArtifactCache(
+            DEFAULT_DATASET_CACHE_DIR, max_bytes=DEFAULT_DATASET_CACHE_MAX_BYTES
+        )
+
+    def load(self, path: Union[str, Path], schema: Dict[str, str]) -> pd.DataFrame:
+        """Read a CSV through the columnar cache when it is enabled"""
+        if self.cache_format is None:
+            return self.read_csv(path, schema)
+
+        stat = os.stat(path)
+        key = ArtifactCache.fingerprint(
+            str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns, schema, SCHEMA_VERSION
+        )
+        suffix = f'.{self.cache_format}'
+        cached = self.artifact_cache.get('datasets', key, suffix)
+        if cached is not None:
+            if self.cache_format == 'feather':
+                # One block per column lets single-chunk columns wrap the
+                # mapped buffers instead of being consolidated into copies
+                return pyarrow.feather.read_table(cached, memory_map=True).to_pandas(split_blocks=True)
+            return pd.read_parquet(cached)
+
+        data = self.read_csv(path, schema)
+        if self.cache_format == 'feather':
+            self.artifact_cache.store('datasets', key, suffix, lambda tmp_path: self._write_feather(data, tmp_path))
+        else:
+            self.artifact_cache.store('datasets', key, suffix, lambda tmp_path: data.to_parquet(tmp_path, index=False))
+        return data
+
+    @staticmethod
+    def _write_feather(data: pd.DataFrame, path: Path):
+        """Write data as a single record batch, so every column maps as one buffer"""
+        # Arrow-backed string columns keep their per-chunk pieces; combine
+        # them, or the writer splits every column at those boundaries
+        table = pyarrow.Table.from_pandas(data).combine_chunks()
+        pyarrow.feather.write_feather(table, path, compression='uncompressed', chunksize=max(len(data), 1))
+
+    def read_csv(self, path: Union[str, Path], schema: Dict[str, str]) -> pd.DataFrame:
+        """Parse a CSV chunk by chunk into the schema's types"""
+        columns = pd.read_csv(path, nrows=0).columns
+        present = {column: kind for column, kind in schema.items() if column in columns}
+        dtypes = {
+            column: 'category' if kind in ('airport', 'category') else kind
+            for column, kind in present.items()
+            if kind in ('airport', 'category', 'float32', 'float64')
+        }
+        dates = [column for column, kind in present.items() if kind == 'datetime']
+
+        reader = pd.read_csv(path, dtype=dtypes, parse_dates=dates, chunksize=self.chunksize)
+        # Categorical columns that share one set of labels
+        groups = [[column for column, kind in present.items() if kind == 'airport']]
+        groups += [[column] for column, kind in present.items() if kind == 'category']
+        groups = [group for group in groups if group]
+        categorical = [column for group in groups for column in group]
+        labels = [pd.Index([]) for _ in groups]
+        # Per column, the chunks read so far (codes for categoricals)
+        parts: Dict[str, list] = {column: [] for column in columns}
+        rows = 0
+        for chunk in reader:
+            for i, group in enumerate(groups):
+                labels[i] = self._append_codes(chunk, group, labels[i], parts)
+            for column in columns.difference(categorical, sort=False):
+                parts[column].append(chunk[column].reset_index(drop=True))
+            rows += len(chunk)
+            del chunk
+
+        categories = {column: group_labels for group, group_labels in zip(groups, labels) for column in group}
+        data = pd.DataFrame(index=pd.RangeIndex(rows))
+        for column in columns:
+            # pop frees each column's chunks once it is joined
+            column_parts = parts.pop(column)
+            if column in categories:
+                data[column] = self._categorical(column_parts, categories[column])
+            else:
+                data[column] = pd.concat(column_parts, ignore_index=True)
+            del column_parts
+            if present.get(column) == 'integer':
+                data[column] = self._compact_integer(data[column])
+        return data
+
+    @staticmethod
+    def _append_codes(
+        chunk: pd.DataFrame, columns: List[str], labels: pd.Index, parts: Dict[str, list]
+    ) -> pd.Index:
+        """
+        Record a chunk's categorical columns as codes into the growing labels
+
+        Chunks carry their own categories; new labels are appended, so codes
+        recorded for earlier chunks stay valid. Returns the extended labels.
+        """
+        for column in columns:
+            values = chunk[column].cat
+            new = values.categories.difference(labels)
+            if len(new):
+                labels = labels.append(new)
+            # The trailing -1 keeps missing values (code -1) missing
+            recode = np.append(labels.get_indexer(values.categories), -1).astype(np.int32)
+            parts[column].append(recode[values.codes.to_numpy()])
+        return labels
+
+    @staticmethod
+    def _categorical(codes: List[np.ndarray], labels: pd.Index) -> pd.Categorical:
+        """Join recorded codes into a categorical with sorted categories"""
+        order = labels.argsort()
+        remap = np.empty(len(labels) + 1, dtype=np.int32)
+        remap[order] = np.arange(len(labels), dtype=np.int32)
+        # Index -1 (missing) maps to the last slot
+        remap[-1] = -1
+        return pd.Categorical.from_codes(remap[np.concatenate(codes)], categories=labels[order])
+
+    @staticmethod
+    def _compact_integer(values: pd.Series) -> pd.Series:
+        """
+        int32 when the values fit, float32 when some are missing
+
+        Narrower types are avoided: groupby sums keep the input dtype and
+        would overflow.
+        """
+        if values.isna().any():
+            return values.astype('float32')
+        if not pd.api.types.is_integer_dtype(values):
+            return values
+        info = np.iinfo(np.int32)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            return values
+        return values.astype('int32')
@@ -0,0 +1,83 @@
+# dense_network.py
+from pathlib import Path
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0, out=x),
+    'tanh': lambda x: np.tanh(x, out=x),
+    'sigmoid': lambda x: np.divide(1, 1 + np.exp(-x, out=x), out=x),
+}
+
+
+class DenseNetwork:
+    """
+    NumPy forward pass of a stack of Dense layers.
+
+    Evaluates the exported weights of a trained Keras Sequential model
+    without importing TensorFlow. Weights are kept as float32, matching
+    Keras, and a batch is one matrix product per layer. BLAS and
+    TensorFlow order the float32 sums differently, so outputs agree with
+    Model.predict to float32 rounding rather than bit for bit.
+    """
+
+    def __init__(self, layers: Sequence[Tuple[np.ndarray, np.ndarray, str]]):
+        """
+        Args:
+            layers: (kernel, bias, activation) per layer, kernel shaped
+                (inputs, units)
+        """
+        self.layers: List[Tuple[np.ndarray, np.ndarray, str]] = []
+        for kernel, bias, activation in layers:
+            if activation not in ACTIVATIONS:
+                raise ValueError(f"Unsupported activation {activation!r}")
+            self.layers.append((
+                np.ascontiguousarray(kernel, dtype=np.float32),
+                np.ascontiguousarray(bias, dtype=np.float32),
+                activation
+            ))
+
+    @classmethod
+    def from_keras(cls, model) -> 'DenseNetwork':
+        """Export the Dense layers of a trained Keras Sequential model"""
+        layers = []
+        for layer in model.layers:
+            kernel, bias = layer.get_weights()
+            layers.append((kernel, bias, layer.get_config().get('activation', 'linear')))
+        return cls(layers)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'DenseNetwork':
+        """Read weights written by save"""
+        with np.load(path, allow_pickle=False) as weights:
+            activations = weights['activations'].tolist()
+            return cls([
+                (weights[f'kernel_{i}'], weights[f'bias_{i}'], activation)
+                for i, activation in enumerate(activations)
+            ])
+
+    def save(self, path: Union[str, Path]):
+        """Write the weights as an uncompressed .npz file"""
+        arrays = {'activations': np.array([activation for _, _, activation in self.layers])}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel_{i}'] = kernel
+            arrays[f'bias_{i}'] = bias
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+    @property
+    def input_size(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    def predict(self, X) -> np.ndarray:
+        """(n, outputs) predictions for an (n, inputs) batch, like Model.predict"""
+        output = np.asarray(X, dtype=np.float32)
+        if output.ndim == 1:
+            output = output[None, :]
+        for kernel, bias, activation in self.layers:
+            output = output @ kernel
+            output += bias
+            output = ACTIVATIONS[activation](output)
+        return output
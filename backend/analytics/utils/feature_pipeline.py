@@ -0,0 +1,94 @@
+# feature_pipeline.py
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# Cyclical encodings indexed by day of month (1-31) and month (1-12)
+DAY_ENCODING = np.column_stack([
+    np.sin(2 * np.pi * np.arange(32) / 31),
+    np.cos(2 * np.pi * np.arange(32) / 31)
+])
+MONTH_ENCODING = np.column_stack([
+    np.sin(2 * np.pi * np.arange(13) / 12),
+    np.cos(2 * np.pi * np.arange(13) / 12)
+])
+CYCLICAL_COLUMNS = ['day_sin', 'day_cos', 'month_sin', 'month_cos']
+
+
+class FeaturePipeline:
+    """
+    Feature preparation for the ML models, fitted once at training time.
+
+    A ``date`` column becomes day-of-month and month sine/cosine pairs
+    (looked up from precomputed tables), the numeric input columns seen at
+    fit time are kept in their fitted order, and everything is
+    standardized with the training mean and standard deviation. Inference
+    only transforms, so training and prediction are scaled identically.
+    """
+
+    def __init__(self, exclude: Sequence[str] = ()):
+        """
+        Args:
+            exclude: Columns never used as features (e.g. training targets)
+        """
+        self.exclude = list(exclude)
+        self.input_columns: Optional[List[str]] = None
+        self.uses_date = False
+        self.mean_: Optional[np.ndarray] = None
+        self.scale_: Optional[np.ndarray] = None
+
+    @property
+    def fitted(self) -> bool:
+        return self.mean_ is not None
+
+    @property
+    def feature_names(self) -> List[str]:
+        return self.input_columns + (CYCLICAL_COLUMNS if self.uses_date else [])
+
+    def fit(self, data: pd.DataFrame) -> 'FeaturePipeline':
+        """Learn the input columns and scaling from training data"""
+        self.uses_date = 'date' in data.columns
+        self.input_columns = [
+            column for column in data.select_dtypes(include=['number', 'bool']).columns
+            if column not in self.exclude and column != 'date'
+        ]
+
+        X = self._encode(data)
+        self.mean_ = X.mean(axis=0)
+        scale = X.std(axis=0)
+        # Constant features are centred but not scaled, as in StandardScaler
+        scale[scale == 0] = 1.0
+        self.scale_ = scale
+        return self
+
+    def transform(self, data: Union[pd.DataFrame, Dict]) -> np.ndarray:
+        """
+        Scaled feature matrix for a frame, or a (1, n) row for one record
+
+        A single record (dict) bypasses pandas entirely, which keeps
+        one-off predictions cheap.
+        """
+        if not self.fitted:
+            raise ValueError('FeaturePipeline must be fitted before transform')
+        X = self._encode_record(data) if isinstance(data, dict) else self._encode(data)
+        return (X - self.mean_) / self.scale_
+
+    def fit_transform(self, data: pd.DataFrame) -> np.ndarray:
+        return self.fit(data).transform(data)
+
+    def _encode(self, data: pd.DataFrame) -> np.ndarray:
+        blocks = [data[self.input_columns].to_numpy(dtype=np.float64)]
+        if self.uses_date:
+            dates = pd.DatetimeIndex(pd.to_datetime(data['date']))
+            blocks.append(DAY_ENCODING[dates.day.to_numpy()])
+            blocks.append(MONTH_ENCODING[dates.month.to_numpy()])
+        return np.hstack(blocks)
+
+    def _encode_record(self, record: Dict) -> np.ndarray:
+        row = [float(record[column]) for column in self.input_columns]
+        if self.uses_date:
+            date = pd.Timestamp(record['date'])
+            row.extend(DAY_ENCODING[date.day])
+            row.extend(MONTH_ENCODING[date.month])
+        return np.array([row], dtype=np.float64)
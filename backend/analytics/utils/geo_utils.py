@@ -4,6 +4,183 @@ import numpy as np
 from geopy.distance import geodesic
 from geopy.geocoders import Nominatim
 import folium
+from .airport_index import get_airport_index
+
+EARTH_RADIUS_KM = 6371.0088
+
+def calculate_distance(origin: Tuple[float, float], destination: Tuple[float, float]) -> float:
+    """
+    Calculate the geodesic distance between two points in kilometers.
+    """
+    return geodesic(origin, destination).kilometers
+
+def haversine_distances(
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    dtype: np.dtype = np.float64
+) -> np.ndarray:
+    """
+    Great-circle distances in kilometers between paired points.
+
+    Args:
+        origins: (n, 2) array of (latitude, longitude) in degrees
+        destinations: (n, 2) array of (latitude, longitude) in degrees
+        dtype: np.float64, or np.float32 to halve memory
+
+    Returns:
+        (n,) array of distances
+    """
+    origins = np.radians(np.asarray(origins, dtype=dtype).reshape(-1, 2))
+    destinations = np.radians(np.asarray(destinations, dtype=dtype).reshape(-1, 2))
+    lat1, lon1 = origins[:, 0], origins[:, 1]
+    lat2, lon2 = destinations[:, 0], destinations[:, 1]
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))).astype(dtype, copy=False)
+
+def distance_matrix(
+    coordinates: np.ndarray,
+    dtype: np.dtype = np.float64,
+    chunk_size: int = 1024
+) -> np.ndarray:
+    """
+    Full N x N great-circle distance matrix in kilometers.
+
+    Rows are computed chunk_size at a time so temporaries stay at
+    O(chunk_size * N) on top of the result itself.
+
+    Args:
+        coordinates: (n, 2) array of (latitude, longitude) in degrees
+        dtype: np.float64, or np.float32 to halve memory
+        chunk_size: Number of rows computed per step
+    """
+    coordinates = np.radians(np.asarray(coordinates, dtype=dtype).reshape(-1, 2))
+    lat, lon = coordinates[:, 0], coordinates[:, 1]
+    cos_lat = np.cos(lat)
+
+    n = len(coordinates)
+    result = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, chunk_size):
+        rows = slice(start, min(start + chunk_size, n))
+        a = (
+            np.sin((lat[None, :] - lat[rows, None]) / 2) ** 2
+            + cos_lat[rows, None] * cos_lat[None, :] * np.sin((lon[None, :] - lon[rows, None]) / 2) ** 2
+        )
+        result[rows] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+    return result
+
+def great_circle_paths(
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    points: int = 100
+) -> np.ndarray:
+    """
+    Interpolate great-circle paths for many routes at once.
+
+    Args:
+        origins: (n, 2) array of (latitude, longitude) in degrees
+        destinations: (n, 2) array of (latitude, longitude) in degrees
+        points: Points per path, endpoints included
+
+    Returns:
+        (n, points, 2) array of (latitude, longitude) in degrees
+    """
+    origins = np.radians(np.asarray(origins, dtype=np.float64).reshape(-1, 2))
+    destinations = np.radians(np.asarray(destinations, dtype=np.float64).reshape(-1, 2))
+    lat1, lon1 = origins[:, 0:1], origins[:, 1:2]
+    lat2, lon2 = destinations[:, 0:1], destinations[:, 1:2]
+
+    # Central angle between the endpoints (radians), not the distance in km
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    d = 2 * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    t = np.linspace(0, 1, points)[None, :]
+    sin_d = np.sin(d)
+    coincident = sin_d < 1e-12
+    safe_sin_d = np.where(coincident, 1.0, sin_d)
+    A = np.where(coincident, 1 - t, np.sin((1 - t) * d) / safe_sin_d)
+    B = np.where(coincident, t, np.sin(t * d) / safe_sin_d)
+
+    x = A * np.cos(lat1) * np.cos(lon1) + B * np.cos(lat2) * np.cos(lon2)
+    y = A * np.cos(lat1) * np.sin(lon1) + B * np.cos(lat2) * np.sin(lon2)
+    z = A * np.sin(lat1) + B * np.sin(lat2)
+
+    lat = np.arctan2(z, np.sqrt(x ** 2 + y ** 2))
+    lon = np.arctan2(y, x)
+    return np.degrees(np.stack([lat, lon], axis=-1))
+
+def adaptive_point_counts(
+    distances_km: np.ndarray,
+    km_per_point: float = 100,
+    min_points: int = 2,
+    max_points: int = 100
+) -> np.ndarray:
+    """
+    Number of path points per route, proportional to its length.
+    """
+    counts = np.ceil(np.asarray(distances_km, dtype=np.float64) / km_per_point).astype(np.int64) + 1
+    return np.clip(counts, min_points, max_points)
+
+def great_circle_path_list(
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    km_per_point: float = 100,
+    min_points: int = 2,
+    max_points: int = 100
+) -> List[np.ndarray]:
+    """
+    Great-circle paths with adaptive point counts.
+
+    Routes sharing a point count are interpolated together in one
+    vectorized call.
+
+    Returns:
+        List of (points_i, 2) arrays in the order of the input routes
+    """
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+    destinations = np.asarray(destinations, dtype=np.float64).reshape(-1, 2)
+    counts = adaptive_point_counts(
+        haversine_distances(origins, destinations), km_per_point, min_points, max_points
+    )
+
+    paths: List[np.ndarray] = [None] * len(origins)
+    for count in np.unique(counts):
+        rows = np.flatnonzero(counts == count)
+        batch = great_circle_paths(origins[rows], destinations[rows], int(count))
+        for row, path in zip(rows.tolist(), batch):
+            paths[row] = path
+    return paths
+
+def split_antimeridian(path: np.ndarray) -> List[np.ndarray]:
+    """
+    Split a (points, 2) lat/lon path where it crosses the antimeridian.
+
+    Each crossing ends one segment at longitude +/-180 and starts the next
+    on the opposite edge, so maps do not draw a line across the globe.
+    """
+    path = np.asarray(path, dtype=np.float64)
+    jumps = np.flatnonzero(np.abs(np.diff(path[:, 1])) > 180)
+    if not len(jumps):
+        return [path]
+
+    segments = []
+    start = 0
+    opening = np.empty((0, 2))
+    for i in jumps.tolist():
+        (lat1, lon1), (lat2, lon2) = path[i], path[i + 1]
+        edge = 180.0 if lon1 > 0 else -180.0
+        unwrapped_lon2 = lon2 + 360.0 if lon1 > 0 else lon2 - 360.0
+        crossing_lat = lat1 + (edge - lon1) / (unwrapped_lon2 - lon1) * (lat2 - lat1)
+
+        segments.append(np.vstack([opening, path[start:i + 1], [[crossing_lat, edge]]]))
+        opening = np.array([[crossing_lat, -edge]])
+        start = i + 1
+
+    segments.append(np.vstack([opening, path[start:]]))
+    return segments
 
 class GeoUtils:
     def __init__(self):
@@ -13,12 +190,41 @@ class GeoUtils:
         """
         Calculate the great-circle distance between two points in kilometers.
         """
-        return geodesic(origin, destination).kilometers
+        return calculate_distance(origin, destination)
+
+    def calculate_distances(
+        self,
+        origins: np.ndarray,
+        destinations: np.ndarray,
+        dtype: np.dtype = np.float64
+    ) -> np.ndarray:
+        """
+        Calculate great-circle distances in kilometers for arrays of coordinate pairs.
+        """
+        return haversine_distances(origins, destinations, dtype)
+
+    def calculate_distance_matrix(
+        self,
+        coordinates: np.ndarray,
+        dtype: np.dtype = np.float64,
+        chunk_size: int = 1024
+    ) -> np.ndarray:
+        """
+        Calculate the N x N great-circle distance matrix for a set of coordinates.
+        """
+        return distance_matrix(coordinates, dtype, chunk_size)
     
     def get_coordinates(self, airport_code: str) -> Tuple[float, float]:
         """
         Get the coordinates (latitude, longitude) for an airport using its code.
+
+        Looks the code up in the bundled airport index first and only falls
+        back to the geocoder for airports it does not know.
         """
+        coordinates = get_airport_index().get_coordinates(airport_code)
+        if coordinates is not None:
+            return coordinates
+
         try:
             location = self.geocoder.geocode(f"{airport_code} airport")
             return (location.latitude, location.longitude)
@@ -30,48 +236,31 @@ class GeoUtils:
         """
         Calculate a great circle path between two points.
         """
-        # Convert to radians
-        lat1, lon1 = np.radians(origin)
-        lat2, lon2 = np.radians(destination)
-        
-        d = geodesic(origin, destination).kilometers
-        
-        # Generate points along the path
-        f = np.linspace(0, 1, points)
-        path = []
-        
-        for t in f:
-            # Great circle formulas
-            A = np.sin((1 - t) * d) / np.sin(d)
-            B = np.sin(t * d) / np.sin(d)
-            x = A * np.cos(lat1) * np.cos(lon1) + B * np.cos(lat2) * np.cos(lon2)
-            y = A * np.cos(lat1) * np.sin(lon1) + B * np.cos(lat2) * np.sin(lon2)
-            z = A * np.sin(lat1) + B * np.sin(lat2)
-            
-            lat = np.arctan2(z, np.sqrt(x**2 + y**2))
-            lon = np.arctan2(y, x)
-            
-            path.append((np.degrees(lat), np.degrees(lon)))
-            
-        return path
+        path = great_circle_paths([origin], [destination], points)[0]
+        return [tuple(point) for point in path.tolist()]
     
-    def create_route_map(self, routes: List[Tuple[Tuple[float, float], Tuple[float, float]]]) -> folium.Map:
+    def create_route_map(self, routes: List[Tuple[Tuple[float, float], Tuple[float, float]]],
+                         km_per_point: float = 100, max_points: int = 100) -> folium.Map:
         """
         Create an interactive map showing flight routes.
+
+        All paths are interpolated in batch, with point counts proportional
+        to route length, and split where they cross the antimeridian.
         """
+        origins = np.array([origin for origin, _ in routes], dtype=np.float64).reshape(-1, 2)
+        destinations = np.array([destination for _, destination in routes], dtype=np.float64).reshape(-1, 2)
+
         # Calculate center point of all coordinates
-        all_coords = [coord for route in routes for coord in route]
-        center_lat = np.mean([coord[0] for coord in all_coords])
-        center_lon = np.mean([coord[1] for coord in all_coords])
+        center_lat, center_lon = np.vstack([origins, destinations]).mean(axis=0)
         
         # Create base map
         m = folium.Map(location=[center_lat, center_lon], zoom_start=4)
         
         # Add routes
-        for origin, destination in routes:
-            path = self.calculate_flight_path(origin, destination)
+        paths = great_circle_path_list(origins, destinations, km_per_point, max_points=max_points)
+        for origin, destination, path in zip(origins.tolist(), destinations.tolist(), paths):
             folium.PolyLine(
-                path,
+                [segment.tolist() for segment in split_antimeridian(path)],
                 weight=2,
                 color='red',
                 opacity=0.8
@@ -94,20 +283,31 @@ class GeoUtils:
             
         return m
     
+    def calculate_local_arrival_times(self, departure_times, origins, destinations,
+                                      flight_hours=None):
+        """
+        Convert columns of local departure times into local arrival times.
+        """
+        from .timezone_resolver import get_timezone_resolver
+
+        return get_timezone_resolver().local_arrival_times(
+            departure_times, origins, destinations, flight_hours
+        )
+
     def calculate_timezone_impact(self, origin: Tuple[float, float], destination: Tuple[float, float],
                                 departure_time: str) -> Dict[str, float]:
         """
         Calculate the impact of timezone changes on flight scheduling.
         """
-        from timezonefinder import TimezoneFinder
         from datetime import datetime
         import pytz
+        from .timezone_resolver import get_timezone_resolver
         
-        tf = TimezoneFinder()
+        resolver = get_timezone_resolver()
         
         # Get timezones
-        origin_tz = pytz.timezone(tf.timezone_at(lat=origin[0], lng=origin[1]))
-        dest_tz = pytz.timezone(tf.timezone_at(lat=destination[0], lng=destination[1]))
+        origin_tz = pytz.timezone(resolver.timezone_at(origin[0], origin[1]))
+        dest_tz = pytz.timezone(resolver.timezone_at(destination[0], destination[1]))
         
         # Convert departure time to datetime
         departure_dt = datetime.strptime(departure_time, "%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,42 @@
+# json_encoding.py
+import json
+from typing import Any
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_MEDIA_TYPE = 'application/json'
+
+
+def _default(value: Any) -> Any:
+    """Fallback conversions for the standard library encoder"""
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f':
+            # NaN is not valid JSON; emit null like orjson does
+            return np.where(np.isnan(value), None, value).tolist()
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Serialize a payload to JSON bytes in one pass.
+
+    NumPy arrays and scalars are encoded directly. orjson is used when it is
+    installed; otherwise the standard library encoder with NumPy support.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            payload,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(payload, default=_default, separators=(',', ':')).encode('utf-8')
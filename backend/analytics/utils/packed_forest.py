@@ -0,0 +1,119 @@
+# packed_forest.py
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+# One record per tree node; leaves have left == right == -1
+NODE_DTYPE = np.dtype([
+    ('feature', np.int32),
+    ('left', np.int32),
+    ('right', np.int32),
+    ('threshold', np.float64),
+    ('value', np.float64),
+])
+
+
+class PackedForest:
+    """
+    Array-packed regression forest.
+
+    The nodes of every tree are concatenated into one structured array
+    with global child indices, saved as a plain .npy file. Loading it with
+    mmap_mode='r' maps the file instead of reading it, so processes that
+    serve the same model share one copy in the page cache.
+
+    Prediction walks all trees over a batch of rows together, one tree
+    level per step, and averages the leaf values. The leaf values are
+    summed in tree order, as single-threaded RandomForestRegressor.predict
+    does; with n_jobs > 1 sklearn sums in thread completion order, so the
+    two agree only to floating-point rounding.
+    """
+
+    def __init__(self, nodes: np.ndarray, roots: Optional[np.ndarray] = None):
+        """
+        Args:
+            nodes: NODE_DTYPE records of all trees, tree after tree
+            roots: Index of each tree's root (derived from nodes if omitted)
+        """
+        self.nodes = nodes
+        self.feature = nodes['feature']
+        self.left = nodes['left']
+        self.right = nodes['right']
+        self.threshold = nodes['threshold']
+        self.value = nodes['value']
+        if roots is None:
+            # A root is the only node of its tree that is nobody's child
+            is_child = np.zeros(len(nodes), dtype=bool)
+            is_child[self.left[self.left >= 0]] = True
+            is_child[self.right[self.right >= 0]] = True
+            roots = np.flatnonzero(~is_child)
+        self.roots = roots.astype(np.int64)
+
+    @classmethod
+    def from_sklearn(cls, model) -> 'PackedForest':
+        """Pack a fitted single-output RandomForestRegressor (or ExtraTreesRegressor)"""
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("Only single-output forests can be packed")
+
+        nodes = np.empty(sum(tree.node_count for tree in trees), dtype=NODE_DTYPE)
+        roots = np.empty(len(trees), dtype=np.int64)
+        offset = 0
+        for i, tree in enumerate(trees):
+            end = offset + tree.node_count
+            is_leaf = tree.children_left < 0
+            block = nodes[offset:end]
+            block['feature'] = np.where(is_leaf, 0, tree.feature)
+            block['left'] = np.where(is_leaf, -1, tree.children_left + offset)
+            block['right'] = np.where(is_leaf, -1, tree.children_right + offset)
+            block['threshold'] = tree.threshold
+            block['value'] = tree.value[:, 0, 0]
+            roots[i] = offset
+            offset = end
+        return cls(nodes, roots)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'PackedForest':
+        """Open nodes written by save, memory-mapped read-only by default"""
+        return cls(np.load(path, mmap_mode='r' if mmap else None, allow_pickle=False))
+
+    def save(self, path: Union[str, Path]):
+        """Write the nodes as a single .npy file"""
+        with open(path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.nodes), allow_pickle=False)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict(self, X, batch_size: int = 4096) -> np.ndarray:
+        """
+        Mean prediction of all trees for an (n, features) batch
+
+        Rows are processed batch_size at a time to bound the
+        (trees x rows) working arrays.
+        """
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        predictions = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), batch_size):
+            predictions[start:start + batch_size] = self._predict_batch(X[start:start + batch_size])
+        return predictions
+
+    def _predict_batch(self, X: np.ndarray) -> np.ndarray:
+        n_rows = len(X)
+        # Current node of every (tree, row) pair, tree-major
+        node = np.repeat(self.roots, n_rows)
+        rows = np.tile(np.arange(n_rows), self.n_trees)
+        active = np.arange(len(node))
+        while len(active):
+            current = node[active]
+            left = self.left[current]
+            internal = left >= 0
+            active, current, left = active[internal], current[internal], left[internal]
+            go_left = X[rows[active], self.feature[current]] <= self.threshold[current]
+            node[active] = np.where(go_left, left, self.right[current])
+        return self.value[node].reshape(self.n_trees, n_rows).mean(axis=0)
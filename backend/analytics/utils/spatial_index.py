@@ -0,0 +1,111 @@
+# spatial_index.py
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .airport_index import AirportIndex, get_airport_index
+from .geo_utils import EARTH_RADIUS_KM
+
+
+def to_unit_vectors(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """(n, 3) unit-sphere vectors for latitude/longitude arrays in degrees"""
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    return np.column_stack([
+        np.cos(lat) * np.cos(lon),
+        np.cos(lat) * np.sin(lon),
+        np.sin(lat)
+    ])
+
+
+class AirportSpatialIndex:
+    """
+    Nearest-airport and radius queries over the airport index.
+
+    Airports are stored as 3-D unit vectors in a KD-tree. Straight-line
+    (chord) distance between unit vectors increases monotonically with
+    great-circle distance, so Euclidean tree queries give exact spherical
+    answers without any antimeridian or pole special cases.
+    """
+
+    def __init__(self, airports: AirportIndex):
+        self.airports = airports
+        self.tree = cKDTree(to_unit_vectors(airports.latitudes, airports.longitudes))
+        self._city_keys = np.char.lower(np.char.strip(np.asarray(airports.records['city'])))
+
+    def nearest(self, lat: float, lon: float, k: int = 5) -> List[Dict]:
+        """The k airports closest to a coordinate, nearest first"""
+        k = min(k, len(self.airports))
+        if k <= 0:
+            return []
+        chords, rows = self.tree.query(to_unit_vectors([lat], [lon])[0], k=k)
+        return self._results(np.atleast_1d(rows), np.atleast_1d(chords))
+
+    def within_radius(self, lat: float, lon: float, radius_km: float) -> List[Dict]:
+        """All airports within radius_km of a coordinate, nearest first"""
+        point = to_unit_vectors([lat], [lon])[0]
+        angle = min(radius_km / EARTH_RADIUS_KM, np.pi)
+        rows = np.asarray(self.tree.query_ball_point(point, 2 * np.sin(angle / 2)), dtype=np.int64)
+        if not len(rows):
+            return []
+
+        chords = np.linalg.norm(self.tree.data[rows] - point, axis=1)
+        order = np.argsort(chords, kind='stable')
+        return self._results(rows[order], chords[order])
+
+    def near_city(self, city: str, radius_km: float = 100) -> List[Dict]:
+        """Airports within radius_km of any airport listed under a city name"""
+        matches = np.flatnonzero(self._city_keys == city.strip().lower().encode('utf-8'))
+        if not len(matches):
+            return []
+
+        rows = set()
+        for row in matches.tolist():
+            point = self.tree.data[row]
+            angle = min(radius_km / EARTH_RADIUS_KM, np.pi)
+            rows.update(self.tree.query_ball_point(point, 2 * np.sin(angle / 2)))
+        rows = np.array(sorted(rows), dtype=np.int64)
+
+        # Distance to the closest airport of the city
+        chords = np.min(
+            np.linalg.norm(self.tree.data[rows][:, None, :] - self.tree.data[matches][None, :, :], axis=2),
+            axis=1
+        )
+        order = np.argsort(chords, kind='stable')
+        return self._results(rows[order], chords[order])
+
+    def alternate_airports(self, code: str, radius_km: float = 150, k: int = 5) -> List[Dict]:
+        """Other airports near a given airport, e.g. as diversion or alternate origins"""
+        coordinates = self.airports.get_coordinates(code)
+        if coordinates is None:
+            return []
+        nearby = self.within_radius(coordinates[0], coordinates[1], radius_km)
+        return [airport for airport in nearby if airport['code'] != code][:k]
+
+    def _results(self, rows: np.ndarray, chords: np.ndarray) -> List[Dict]:
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chords / 2, 0, 1))
+        records = self.airports.records
+        return [
+            {
+                'code': records['code'][row].decode(),
+                'name': records['name'][row].decode('utf-8'),
+                'city': records['city'][row].decode('utf-8'),
+                'country': records['country'][row].decode('utf-8'),
+                'latitude': float(records['lat'][row]),
+                'longitude': float(records['lon'][row]),
+                'distance_km': distance
+            }
+            for row, distance in zip(rows.tolist(), distances.tolist())
+        ]
+
+
+_spatial_index: Optional[AirportSpatialIndex] = None
+
+
+def get_spatial_index() -> AirportSpatialIndex:
+    """Process-wide spatial index over the shared airport index"""
+    global _spatial_index
+    if _spatial_index is None:
+        _spatial_index = AirportSpatialIndex(get_airport_index())
+    return _spatial_index
@@ -0,0 +1,135 @@
+# timezone_resolver.py
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .airport_index import AirportIndex, get_airport_index
+
+
+class TimezoneResolver:
+    """
+    Resolve IANA timezones for airports and coordinates.
+
+    Airport codes and airport coordinates are answered from the ``tz``
+    field of the airport index. Other coordinates fall back to a single
+    lazily created TimezoneFinder, whose results are memoized.
+    """
+
+    # Coordinates are matched to airports after rounding to this many decimals (~11 m)
+    COORDINATE_PRECISION = 4
+
+    def __init__(self, airports: AirportIndex, fallback_cache_size: int = 65536):
+        self.airports = airports
+        self.airport_timezones: Dict[str, str] = {}
+        self.coordinate_timezones: Dict[Tuple[float, float], str] = {}
+
+        records = airports.records
+        for code, lat, lon, tz in zip(
+            records['code'].tolist(),
+            np.round(records['lat'], self.COORDINATE_PRECISION).tolist(),
+            np.round(records['lon'], self.COORDINATE_PRECISION).tolist(),
+            records['tz'].tolist()
+        ):
+            if tz:
+                self.airport_timezones[code.decode()] = tz.decode()
+                self.coordinate_timezones[(lat, lon)] = tz.decode()
+
+        self._timezone_finder = None
+        self._find_timezone = lru_cache(maxsize=fallback_cache_size)(self._find_timezone_uncached)
+
+    def timezone_for_airport(self, code: str) -> Optional[str]:
+        """Timezone of an airport code, or None if unknown"""
+        return self.airport_timezones.get(code)
+
+    def timezone_at(self, lat: float, lon: float) -> Optional[str]:
+        """Timezone at a coordinate"""
+        key = (round(lat, self.COORDINATE_PRECISION), round(lon, self.COORDINATE_PRECISION))
+        timezone = self.coordinate_timezones.get(key)
+        if timezone is not None:
+            return timezone
+        return self._find_timezone(key)
+
+    def local_arrival_times(
+        self,
+        departure_times: Sequence,
+        origins: Sequence[str],
+        destinations: Sequence[str],
+        flight_hours: Optional[Sequence[float]] = None
+    ) -> pd.DataFrame:
+        """
+        Convert columns of local departure times into local arrival times.
+
+        Args:
+            departure_times: Naive departure times, local to each origin
+            origins: Origin airport codes
+            destinations: Destination airport codes
+            flight_hours: Flight durations; when omitted the departure
+                instant itself is converted to the destination timezone
+
+        Returns:
+            DataFrame with origin_timezone, destination_timezone,
+            local_arrival_time (naive, destination local) and
+            timezone_difference (hours), aligned with the inputs. Rows
+            with an unknown airport get NaT/NaN.
+        """
+        departures = pd.Series(pd.to_datetime(np.asarray(departure_times)))
+        origin_tz = pd.Series(np.asarray(origins, dtype=object)).map(self.airport_timezones)
+        destination_tz = pd.Series(np.asarray(destinations, dtype=object)).map(self.airport_timezones)
+        durations = (
+            pd.to_timedelta(np.asarray(flight_hours, dtype=np.float64), unit='h')
+            if flight_hours is not None else pd.to_timedelta(np.zeros(len(departures)), unit='h')
+        )
+        durations = pd.Series(durations)
+
+        arrivals = pd.Series(pd.NaT, index=departures.index, dtype='datetime64[ns]')
+        differences = pd.Series(np.nan, index=departures.index)
+
+        known = origin_tz.notna() & destination_tz.notna()
+        frame = pd.DataFrame({'origin': origin_tz[known], 'destination': destination_tz[known]})
+
+        # One localize/convert per timezone pair instead of per row
+        for (origin, destination), rows in frame.groupby(['origin', 'destination']).groups.items():
+            local_departures = departures[rows].dt.tz_localize(
+                origin, ambiguous='NaT', nonexistent='shift_forward'
+            )
+            local_arrivals = (local_departures + durations[rows]).dt.tz_convert(destination)
+
+            arrivals[rows] = local_arrivals.dt.tz_localize(None).to_numpy()
+            differences[rows] = (
+                self._utc_offsets(local_arrivals) - self._utc_offsets(local_departures)
+            ).dt.total_seconds().to_numpy() / 3600
+
+        return pd.DataFrame({
+            'origin_timezone': origin_tz,
+            'destination_timezone': destination_tz,
+            'local_arrival_time': arrivals,
+            'timezone_difference': differences
+        })
+
+    @staticmethod
+    def _utc_offsets(times: pd.Series) -> pd.Series:
+        """UTC offsets of tz-aware times, computed column-wise"""
+        return times.dt.tz_localize(None) - times.dt.tz_convert('UTC').dt.tz_localize(None)
+
+    @property
+    def timezone_finder(self):
+        if self._timezone_finder is None:
+            from timezonefinder import TimezoneFinder
+            self._timezone_finder = TimezoneFinder()
+        return self._timezone_finder
+
+    def _find_timezone_uncached(self, key: Tuple[float, float]) -> Optional[str]:
+        return self.timezone_finder.timezone_at(lat=key[0], lng=key[1])
+
+
+_timezone_resolver: Optional[TimezoneResolver] = None
+
+
+def get_timezone_resolver() -> TimezoneResolver:
+    """Process-wide timezone resolver over the shared airport index"""
+    global _timezone_resolver
+    if _timezone_resolver is None:
+        _timezone_resolver = TimezoneResolver(get_airport_index())
+    return _timezone_resolver